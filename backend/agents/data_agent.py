@@ -1,14 +1,66 @@
 # backend/agents/data_agent.py
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 import csv
+import threading
+
+from backend.storage.candidate_store import CandidateStore, CANDIDATE_FIELDS
+from backend.storage.search_index import SearchIndex
+from backend.storage.vector_index import VectorIndex
+
+# serializes read-modify-write of the duplicates counter
+_link_lock = threading.Lock()
+
 
 class DataAgent:
-    """Stores candidate results (e.g., CSV)."""
+    """Stores candidate results in the candidate store, or appends them to a CSV.
+
+    With a search_index / vector_index, the extracted resume text (and found skills)
+    of stored results are indexed too.
+    """
 
-    def __init__(self, output_path: Path) -> None:
+    def __init__(
+        self,
+        output_path: Path,
+        store: Optional[CandidateStore] = None,
+        search_index: Optional[SearchIndex] = None,
+        vector_index: Optional[VectorIndex] = None,
+    ) -> None:
         self.output_path = output_path
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.store = store
+        self.search_index = search_index
+        self.vector_index = vector_index
+        self.last_id: Optional[int] = None
+
+    @staticmethod
+    def _row(
+        job_id: str,
+        contact: Dict[str, str],
+        score: Dict[str, Any],
+        questions: List[str],
+        saved_filename: str = "",
+        sha256: str = "",
+        profile_version: str = "",
+    ) -> Dict[str, Any]:
+        return {
+            "job_id": job_id,
+            "name": contact.get("name", ""),
+            "email": contact.get("email", ""),
+            "phone": contact.get("phone", ""),
+            "total_score": score.get("total_score", 0),
+            "base_score": score.get("base_score", 0),
+            "skill_score": score.get("skill_score", 0),
+            "penalty": score.get("penalty", 0),
+            "questions": " | ".join(questions),
+            "status": "",
+            "notes": "",
+            "saved_filename": saved_filename,
+            "sha256": sha256,
+            "found_skills": " | ".join(score.get("found_skills", [])),
+            "missing_skills": " | ".join(score.get("missing_skills", [])),
+            "profile_version": profile_version,
+        }
 
     def append_result(
         self,
@@ -18,40 +70,61 @@ class DataAgent:
         questions: List[str],
         saved_filename: str = "",
     ) -> None:
-        header = [
-            "job_id",
-            "name",
-            "email",
-            "phone",
-            "total_score",
-            "base_score",
-            "skill_score",
-            "penalty",
-            "questions",
-            "status",
-            "notes",
-            "saved_filename",
+        self._append_rows([self._row(job_id, contact, score, questions, saved_filename)])
+
+    def append_results(self, results: List[Dict[str, Any]]) -> List[int]:
+        """
+        Persist many processing results (job_id/contact/score/questions/saved_filename
+        dicts) with a single write. Returns the new store ids (empty when writing CSV).
+        """
+        rows = [
+            self._row(
+                r["job_id"],
+                r.get("contact", {}),
+                r["score"],
+                r["questions"],
+                r.get("saved_filename", ""),
+                r.get("sha256", ""),
+                r.get("profile_version", ""),
+            )
+            for r in results
         ]
+        ids = self._append_rows(rows)
+        if self.search_index is not None and ids:
+            self.search_index.add_many((cid, r.get("text", "")) for cid, r in zip(ids, results))
+        if self.vector_index is not None and ids:
+            self.vector_index.add_many(
+                (cid, r.get("text", ""), r["score"].get("found_skills", [])) for cid, r in zip(ids, results)
+            )
+        return ids
+
+    def link_duplicates(self, counts: Dict[int, int]) -> None:
+        """Add counts[id] to the `duplicates` field of existing store records (no-op when writing CSV)."""
+        if self.store is None or not counts:
+            return
+        with _link_lock:
+            changes = {}
+            for row in self.store.get_many(counts):
+                try:
+                    seen = int(row.get("duplicates") or 0)
+                except ValueError:
+                    seen = 0
+                changes[row["_id"]] = {"duplicates": seen + counts[row["_id"]]}
+            self.store.update_many(changes)
+
+    def _append_rows(self, rows: List[Dict[str, Any]]) -> List[int]:
+        if not rows:
+            return []
+        if self.store is not None:
+            ids = self.store.append_many(rows)
+            self.last_id = ids[-1]
+            return ids
 
         file_exists = self.output_path.exists()
 
         with self.output_path.open("a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
+            writer = csv.DictWriter(f, fieldnames=CANDIDATE_FIELDS)
             if not file_exists:
-                writer.writerow(header)
-            writer.writerow(
-                [
-                    job_id,
-                    contact.get("name", ""),
-                    contact.get("email", ""),
-                    contact.get("phone", ""),
-                    score.get("total_score", 0),
-                    score.get("base_score", 0),
-                    score.get("skill_score", 0),
-                    score.get("penalty", 0),
-                    " | ".join(questions),
-                    "",  # status
-                    "",  # notes
-                    saved_filename,
-                ]
-            )
\ No newline at end of file
+                writer.writeheader()
+            writer.writerows(rows)
+        return []
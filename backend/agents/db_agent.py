@@ -8,21 +8,31 @@ class DBAgent:
         self.engine = get_engine()
 
     def add_candidate(self, job_id: str, file: str, contact: Dict[str,str], score: Dict[str,Any], questions: List[str]) -> int:
-        stmt = insert(candidates).values(
-            job_id=job_id,
-            file=file,
-            name=contact.get("name",""),
-            email=contact.get("email",""),
-            phone=contact.get("phone",""),
-            score=score,
-            questions=questions,
-            status="applied",
-            notes=""
-        )
-        with self.engine.connect() as conn:
-            res = conn.execute(stmt)
-            conn.commit()
-            return res.inserted_primary_key[0]
+        return self.add_candidates([
+            {"job_id": job_id, "file": file, "contact": contact, "score": score, "questions": questions}
+        ])[0]
+
+    def add_candidates(self, items: List[Dict[str, Any]]) -> List[int]:
+        """Insert many candidates ({job_id, file, contact, score, questions}) with one executemany + commit."""
+        if not items:
+            return []
+        params = [
+            {
+                "job_id": it["job_id"],
+                "file": it.get("file", ""),
+                "name": it.get("contact", {}).get("name", ""),
+                "email": it.get("contact", {}).get("email", ""),
+                "phone": it.get("contact", {}).get("phone", ""),
+                "score": it.get("score", {}),
+                "questions": it.get("questions", []),
+                "status": "applied",
+                "notes": "",
+            }
+            for it in items
+        ]
+        stmt = insert(candidates).returning(candidates.c.id, sort_by_parameter_order=True)
+        with self.engine.begin() as conn:
+            return list(conn.execute(stmt, params).scalars())
 
     def update_status(self, candidate_id: int, status: str):
         stmt = update(candidates).where(candidates.c.id==candidate_id).values(status=status)
@@ -36,12 +46,15 @@ class DBAgent:
             conn.execute(stmt)
             conn.commit()
 
-    def list_candidates(self, job_id=None, status=None, limit=50, offset=0):
+    def list_candidates(self, job_id=None, status=None, limit=50, offset=0, by_score=False):
+        """Filtered page of candidates; by_score orders by total_score (highest first) using its index."""
         stmt = select(candidates)
         if job_id:
             stmt = stmt.where(candidates.c.job_id==job_id)
         if status:
-            stmt = stmt.where(candidates.c.status==status)
+            stmt = stmt.where(candidates.c.status.collate("NOCASE")==status)
+        if by_score:
+            stmt = stmt.order_by(candidates.c.total_score.desc(), candidates.c.id)
         stmt = stmt.limit(limit).offset(offset)
         with self.engine.connect() as conn:
             rows = conn.execute(stmt).mappings().all()
@@ -51,4 +64,4 @@ class DBAgent:
         stmt = select(candidates).where(candidates.c.id==candidate_id)
         with self.engine.connect() as conn:
             row = conn.execute(stmt).mappings().first()
-            return dict(row) if row else None
\ No newline at end of file
+            return dict(row) if row else None
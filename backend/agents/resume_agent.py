@@ -1,7 +1,11 @@
 # backend/agents/resume_agent.py
+import hashlib
+import io
+import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import BinaryIO, Dict, Any, Optional, Union
 
+from backend.services.disk_cache import DiskCache
 from backend.utils import extract_contact_info
 
 # External libs for .docx and .pdf parsing
@@ -16,7 +20,27 @@ except Exception:
     pdfplumber = None
 
 
-def _extract_text_from_docx(path: Path) -> str:
+# Bump when extraction or normalization changes so cached text is not reused.
+EXTRACTOR_VERSION = "1"
+
+EXTRACTION_CACHE_PATH = Path(__file__).resolve().parent.parent / "assets" / "cache" / "extraction.sqlite"
+EXTRACTION_CACHE_MB = int(os.getenv("RECRUITGENIE_EXTRACTION_CACHE_MB", "256"))
+
+_extraction_cache: Optional[DiskCache] = None
+
+
+def get_extraction_cache() -> Optional[DiskCache]:
+    """Shared extraction cache for this process, or None when disabled (budget 0)."""
+    global _extraction_cache
+    if _extraction_cache is None and EXTRACTION_CACHE_MB > 0:
+        _extraction_cache = DiskCache(EXTRACTION_CACHE_PATH, max_bytes=EXTRACTION_CACHE_MB * 1024 * 1024)
+    return _extraction_cache
+
+
+Source = Union[Path, BinaryIO]
+
+
+def _extract_text_from_docx(path: Source) -> str:
     if Document is None:
         return ""
     try:
@@ -26,7 +50,7 @@ def _extract_text_from_docx(path: Path) -> str:
         return ""
 
 
-def _extract_text_from_pdf(path: Path) -> str:
+def _extract_text_from_pdf(path: Source) -> str:
     if pdfplumber is None:
         return ""
     try:
@@ -66,17 +90,94 @@ def extract_resume_text_from_path(path: Path) -> str:
     return _extract_text_from_txt(p)
 
 
+def extract_resume_text_from_bytes(data: bytes, suffix: str) -> str:
+    """Same as extract_resume_text_from_path for a file already in memory (suffix picks the parser)."""
+    suffix = suffix.lower()
+    if suffix == ".docx":
+        return _extract_text_from_docx(io.BytesIO(data))
+    if suffix == ".pdf":
+        return _extract_text_from_pdf(io.BytesIO(data))
+    return data.decode("utf-8", errors="ignore")
+
+
+def normalize_text(text: str) -> str:
+    """Unify line endings, drop NULs and trailing whitespace so equal resumes give equal text."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\x00", "")
+    return "\n".join(line.rstrip() for line in text.split("\n")).strip("\n")
+
+
+def extraction_cache_key(data: bytes, suffix: str) -> str:
+    """Cache key: SHA-256 of the file bytes + extractor (suffix) + EXTRACTOR_VERSION."""
+    return extraction_cache_key_for(hashlib.sha256(data).hexdigest(), suffix)
+
+
+def extraction_cache_key_for(sha256: str, suffix: str) -> str:
+    """extraction_cache_key for a file whose SHA-256 (hex) is already known."""
+    return f"{sha256}:{suffix.lower()}:{EXTRACTOR_VERSION}"
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 (hex) of a file, read in chunks so large files are never held whole in memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 class ResumeAgent:
-    """Loads resumes and extracts raw text + basic contact info."""
+    """Loads resumes and extracts normalized text + basic contact info.
+
+    Results are cached by content hash, so re-uploads and re-screens of the
+    same file skip pdfplumber / python-docx entirely. Pass data (the file's
+    bytes, e.g. a small upload still in memory) to skip reading resume_path,
+    and sha256 (e.g. computed while the upload was spooled) to skip hashing
+    it: on a cache hit the file is then not read at all.
+    """
 
-    def __init__(self, resume_path: Path) -> None:
+    def __init__(
+        self,
+        resume_path: Path,
+        use_cache: bool = True,
+        data: Optional[bytes] = None,
+        sha256: Optional[str] = None,
+    ) -> None:
         self.resume_path = Path(resume_path)
+        self.use_cache = use_cache
+        self.data = data
+        self.sha256 = sha256
+
+    def _content_sha256(self) -> str:
+        if self.sha256:
+            return self.sha256
+        if self.data is not None:
+            return hashlib.sha256(self.data).hexdigest()
+        try:
+            return file_sha256(self.resume_path)
+        except OSError:
+            return ""
 
     def run(self) -> Dict[str, Any]:
-        text = extract_resume_text_from_path(self.resume_path)
+        cache = get_extraction_cache() if self.use_cache else None
+        sha256 = self._content_sha256()
+        key = extraction_cache_key_for(sha256, self.resume_path.suffix)
+
+        cached = cache.get(key) if cache is not None and sha256 else None
+        if cached is not None:
+            return {"path": str(self.resume_path), "sha256": sha256, "cached": True, **cached}
+
+        if self.data is not None:
+            text = extract_resume_text_from_bytes(self.data, self.resume_path.suffix)
+        else:
+            text = extract_resume_text_from_path(self.resume_path)
+        text = normalize_text(text)
         contact = extract_contact_info(text)
+        if cache is not None and sha256 and text:
+            cache.set(key, {"text": text, "contact": contact})
         return {
             "path": str(self.resume_path),
+            "sha256": sha256,
+            "cached": False,
             "text": text,
             "contact": contact,
-        }
\ No newline at end of file
+        }
@@ -1,63 +1,68 @@
 # backend/agents/scoring_agent.py
 import os
-from typing import Dict, Any, List
-import re
-from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from backend.config.skills_config import SKILL_WEIGHTS, MUST_HAVE_SKILLS, DEFAULT_SKILL_WEIGHT, MUST_HAVE_PENALTY
+from backend.services.llm_client import get_llm_client
+from backend.services.skill_matcher import SkillMatcher, get_skill_matcher
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 USE_AI = bool(OPENAI_API_KEY)
 
-if USE_AI:
-    import openai
-    openai.api_key = OPENAI_API_KEY
+
+def ai_scoring_enabled() -> bool:
+    """True when ScoringAgent scores with the LLM by default (OPENAI_API_KEY is set)."""
+    return USE_AI
+
 
 class ScoringAgent:
-    def __init__(self, job_desc: str):
+    def __init__(
+        self,
+        job_desc: str,
+        matcher: Optional[SkillMatcher] = None,
+        weights: Optional[Dict[str, int]] = None,
+        must_have: Optional[List[str]] = None,
+    ):
         self.job_desc = job_desc.lower()
 
-        # baseline skill list - you can load from JSON config
-        self.skill_list = ["python","sql","rest api","api","docker","aws","kubernetes","django","flask","graphql"]
+        # skill taxonomy from backend/config/skills_config.py, compiled once per process
+        self.matcher = matcher or get_skill_matcher()
+        self.skill_list = self.matcher.skills
+        self.weights = SKILL_WEIGHTS if weights is None else weights
+        self.must_have = MUST_HAVE_SKILLS if must_have is None else must_have
+        # only skills the job weights or requires are reported as missing, not the whole taxonomy
+        self.job_skills = [s for s in self.skill_list if s in self.weights or s in self.must_have]
 
     def _rule_score(self, text: str) -> Dict[str,Any]:
-        text_l = text.lower()
-        found = [s for s in self.skill_list if s in text_l]
-        missing = [s for s in self.skill_list if s not in text_l]
+        hits = self.matcher.find(text)
+        found = [s for s in self.skill_list if s in hits]
+        missing = [s for s in self.job_skills if s not in hits]
         base = 5
-        skill_score = len(found) * 2
-        penalty = 0
+        skill_score = sum(self.weights.get(s, DEFAULT_SKILL_WEIGHT) for s in found)
+        penalty = MUST_HAVE_PENALTY * sum(1 for s in self.must_have if s not in hits)
         total = base + skill_score - penalty
         return {"base_score": base, "skill_score": skill_score, "penalty": penalty, "total_score": total, "missing_skills": missing, "found_skills": found}
 
-    async def _ai_score(self, text: str) -> Dict[str,Any]:
-        # Simple prompt (tailor to your provider)
-        prompt = f"""
-You are an assistant that reads a resume text and a job description and returns a JSON object:
-{{"base_score":int,"skill_score":int,"penalty":int,"total_score":int,"missing_skills":[...],"found_skills":[...]}}
-
-Job description:
-{self.job_desc}
-
-Resume text:
-{text}
-"""
-        resp = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
-            messages=[{"role":"system","content":"You are an expert recruiter scorer."},{"role":"user","content":prompt}],
-            max_tokens=300
-        )
-        content = resp["choices"][0]["message"]["content"]
-        # parse JSON from content (be defensive) - use regex or json.loads if well-formed
-        import json, re
+    def _ai_score_many(self, resume_texts: List[str]) -> List[Dict[str,Any]]:
+        """Blocking AI scores (requests run concurrently); unscored resumes fall back to _rule_score."""
         try:
-            j = json.loads(re.search(r"\{.*\}", content, re.S).group(0))
-            return j
-        except Exception:
-            # fallback to rule scoring
-            return self._rule_score(text)
-
-    def run(self, resume_text: str) -> Dict[str,Any]:
-        if USE_AI:
-            import asyncio
-            return asyncio.get_event_loop().run_until_complete(self._ai_score(resume_text))
-        else:
-            return self._rule_score(resume_text)
\ No newline at end of file
+            results = get_llm_client().score_many(self.job_desc, resume_texts)
+        except Exception as e:
+            print(f"[WARN] LLM scoring unavailable: {e}")
+            results = [None] * len(resume_texts)
+        return [r or self._rule_score(t) for r, t in zip(results, resume_texts)]
+
+    def run(self, resume_text: str, use_ai: Optional[bool] = None) -> Dict[str,Any]:
+        return self.run_many([resume_text], use_ai)[0]
+
+    def run_many(self, resume_texts: List[str], use_ai: Optional[bool] = None) -> List[Dict[str,Any]]:
+        """
+        Score resumes in order. With AI (use_ai, default USE_AI) they go to the
+        process-wide LLM client in one call, so they share its concurrency limit
+        and prompt batching; otherwise each is rule-scored.
+        """
+        if use_ai is None:
+            use_ai = USE_AI
+        if use_ai:
+            return self._ai_score_many(resume_texts)
+        return [self._rule_score(t) for t in resume_texts]
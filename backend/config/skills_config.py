@@ -1,4 +1,7 @@
 # backend/config/skills_config.py
+import json
+import os
+from typing import Dict, List
 
 SKILL_WEIGHTS = {
     "python": 3,
@@ -14,4 +17,43 @@ SKILL_WEIGHTS = {
     "ci/cd": 2,
 }
 
-MUST_HAVE_SKILLS = ["python", "rest", "sql"]
\ No newline at end of file
+MUST_HAVE_SKILLS = ["python", "rest", "sql"]
+
+# Weight of a found skill that has no SKILL_WEIGHTS entry.
+DEFAULT_SKILL_WEIGHT = 1
+
+# Subtracted from the score for every missing must-have skill.
+MUST_HAVE_PENALTY = 2
+
+# Canonical skill -> phrases that count as that skill (matched on token boundaries,
+# case-insensitive). Order here is the order found/missing skills are reported in.
+SKILL_TAXONOMY: Dict[str, List[str]] = {
+    "python": ["python", "python3"],
+    "sql": ["sql", "postgresql", "postgres", "mysql", "sqlite", "t-sql"],
+    "rest": ["rest api", "rest apis", "restful", "restful api"],
+    "api": ["api", "apis"],
+    "docker": ["docker", "dockerfile", "docker-compose"],
+    "aws": ["aws", "amazon web services"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "django": ["django"],
+    "flask": ["flask"],
+    "graphql": ["graphql"],
+    "fastapi": ["fastapi", "fast api"],
+    "nosql": ["nosql", "mongodb", "dynamodb", "cassandra"],
+    "gcp": ["gcp", "google cloud", "google cloud platform"],
+    "ci/cd": ["ci/cd", "ci cd", "cicd", "continuous integration", "github actions", "jenkins"],
+}
+
+# Optional JSON file ({"skill": ["phrase", ...], ...}) merged into the taxonomy,
+# for large skill lists that do not belong in code.
+SKILL_TAXONOMY_PATH = os.getenv("RECRUITGENIE_SKILLS_JSON")
+
+
+def load_skill_taxonomy() -> Dict[str, List[str]]:
+    """SKILL_TAXONOMY plus any skills from SKILL_TAXONOMY_PATH."""
+    taxonomy = {k: list(v) for k, v in SKILL_TAXONOMY.items()}
+    if SKILL_TAXONOMY_PATH:
+        with open(SKILL_TAXONOMY_PATH, encoding="utf-8") as f:
+            for skill, phrases in json.load(f).items():
+                taxonomy.setdefault(skill.lower(), []).extend(p.lower() for p in phrases or [skill])
+    return taxonomy
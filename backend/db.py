@@ -1,12 +1,47 @@
 # backend/db.py
+import os
 from pathlib import Path
-from sqlalchemy import create_engine, MetaData, Table, Column, Integer, String, JSON, Text
+from sqlalchemy import (
+    create_engine, event, inspect, text, MetaData, Table, Column, Computed, Index, Integer, String, JSON, Text, Float,
+)
 from sqlalchemy.sql import select
 from sqlalchemy.engine import Engine
 
 BASE = Path(__file__).resolve().parent
-DB_PATH = BASE / "recruitgenie.sqlite"
-ENGINE = create_engine(f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False})
+DB_PATH = Path(os.getenv("RECRUITGENIE_DB_PATH", str(BASE / "recruitgenie.sqlite")))
+
+# Connections kept open in the pool; WAL lets readers run alongside the one writer
+DB_POOL_SIZE = int(os.getenv("RECRUITGENIE_DB_POOL_SIZE", "8"))
+
+# Applied to every new connection. WAL + synchronous=NORMAL survives an app crash;
+# only a power loss can drop the last commits.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,         # ms to wait for the write lock instead of failing
+    "cache_size": -64000,         # KiB of page cache per connection
+    "temp_store": "MEMORY",
+    "mmap_size": 256 * 1024 * 1024,
+    "foreign_keys": "ON",
+}
+
+ENGINE = create_engine(
+    f"sqlite:///{DB_PATH}",
+    connect_args={"check_same_thread": False},
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_POOL_SIZE,
+    pool_pre_ping=False,
+)
+
+
+@event.listens_for(ENGINE, "connect")
+def _set_pragmas(dbapi_conn, _record) -> None:
+    cur = dbapi_conn.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cur.execute(f"PRAGMA {name}={value}")
+    cur.close()
+
+
 metadata = MetaData()
 
 candidates = Table(
@@ -22,10 +57,79 @@ candidates = Table(
     Column("questions", JSON),
     Column("status", String, default="applied"),  # applied/review/shortlisted/rejected
     Column("notes", Text, default=""),
+    # scoring inputs and ingest dedup links (see storage/candidate_store.py CANDIDATE_FIELDS)
+    Column("sha256", String),
+    Column("profile_version", String),
+    Column("duplicates", Integer),
+    # score.total_score as a real column so filters and ORDER BY can use an index
+    Column("total_score", Integer, Computed("CAST(json_extract(score, '$.total_score') AS INTEGER)", persisted=False)),
 )
 
+Index("ix_candidates_status", candidates.c.status.collate("NOCASE"))
+Index("ix_candidates_total_score", candidates.c.total_score)
+Index("ix_candidates_job_score", candidates.c.job_id, candidates.c.total_score)
+
+# Store-wide counters (e.g. the update log floor used by storage/sqlite_store.py)
+store_meta = Table(
+    "store_meta",
+    metadata,
+    Column("key", String, primary_key=True),
+    Column("value", Integer, nullable=False, default=0),
+)
+
+# Field-level log of candidate updates (before/after values of the changed fields),
+# replayed by storage/sqlite_store.py changes_since; pruned at checkpoints
+candidate_changes = Table(
+    "candidate_changes",
+    metadata,
+    Column("seq", Integer, primary_key=True, autoincrement=True),
+    Column("candidate_id", Integer, nullable=False),
+    Column("before", JSON, nullable=False),
+    Column("after", JSON, nullable=False),
+    sqlite_autoincrement=True,
+)
+
+# Job registry: one row per job_id, each compiled into a scoring profile (see services/job_registry.py)
+jobs = Table(
+    "jobs",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("job_id", String, unique=True, index=True),   # external key used by uploads, e.g. JOB-001
+    Column("title", String, nullable=False),
+    Column("description", Text, default=""),
+    Column("requirements", Text, default=""),
+    Column("location", String, default=""),
+    Column("salary_min", Integer, default=0),
+    Column("salary_max", Integer, default=0),
+    Column("status", String, default="active"),
+    Column("skill_weights", JSON),      # {skill: weight}; NULL -> skills_config.SKILL_WEIGHTS
+    Column("must_have_skills", JSON),   # [skill, ...]; NULL -> skills_config.MUST_HAVE_SKILLS
+    Column("version", Integer, default=1),
+    Column("updated_at", Float),
+)
+
+
+def _upgrade_candidates(conn) -> None:
+    """Add columns and indexes introduced after a candidates table was created."""
+    have = {r[1] for r in conn.execute(text("PRAGMA table_xinfo(candidates)"))}
+    for name, ddl in (
+        ("sha256", "VARCHAR"),
+        ("profile_version", "VARCHAR"),
+        ("duplicates", "INTEGER"),
+        ("total_score", "INTEGER GENERATED ALWAYS AS (CAST(json_extract(score, '$.total_score') AS INTEGER)) VIRTUAL"),
+    ):
+        if name not in have:
+            conn.execute(text(f"ALTER TABLE candidates ADD COLUMN {name} {ddl}"))
+    for index in candidates.indexes:
+        index.create(conn, checkfirst=True)
+
+
 def init_db():
-    metadata.create_all(ENGINE)
+    with ENGINE.begin() as conn:
+        existed = inspect(conn).has_table("candidates")
+        metadata.create_all(conn)
+        if existed:
+            _upgrade_candidates(conn)
 
 def get_engine() -> Engine:
-    return ENGINE
\ No newline at end of file
+    return ENGINE
@@ -1,76 +1,114 @@
 # backend/main.py
-from fastapi import FastAPI, UploadFile, File, Query, HTTPException, Path as FastAPIPath
-from fastapi.responses import FileResponse, JSONResponse
-from backend.recruitgenie_app import process_candidate, load_job_description
+from fastapi import FastAPI, UploadFile, File, Form, Query, HTTPException, Request, Response, Path as FastAPIPath
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from backend.recruitgenie_app import ai_score_results, analyze_candidate, persist_candidate, persist_candidates
 from backend.agents.data_agent import DataAgent
+from backend.agents.resume_agent import ResumeAgent, file_sha256, get_extraction_cache
+from backend.services.llm_client import get_llm_cache, get_llm_client
+from backend.services.job_registry import JobProfile, get_job_registry
+from backend.services.batch_scoring import BatchScorer
+from backend.services.rescoring import rescore_job, RESCORE_CHUNK
+from backend.services.dedup import get_dedup_index
+from backend.services.response_cache import ResponseCache
+from backend.services.csv_transfer import CSV_HEADER, import_csv, stream_export
+from backend.models.job import Job
+from backend.services.worker_pool import UploadWorkerPool, QueueFull
+from backend.storage.candidate_store import CandidateStore, CANDIDATE_FIELDS
+from backend.storage.sqlite_store import SQLiteCandidateStore
+from backend.storage.candidate_columns import CandidateColumns, SCORE_FIELDS
+from backend.storage.candidate_aggregates import CandidateAggregates
+from backend.storage.fields import to_int
+from backend.storage.bitmaps import RoaringBitmap
+from backend.storage.skill_index import SkillIndex
+from backend.storage.sorted_index import SortedIndex, SORT_FIELDS, encode_cursor, decode_cursor
+from backend.storage.search_index import SearchIndex
+from backend.storage.vector_index import VectorIndex
 from pathlib import Path
-import shutil
+import asyncio
 import csv
-from typing import Optional, List, Dict, Any
+import hashlib
+import os
+import re
+import tempfile
+import time
+import zipfile
+import numpy as np
+from typing import Optional, List, Dict, Any, Tuple
 from pydantic import BaseModel
 from collections import Counter
+from functools import partial
+from email.utils import formatdate, parsedate_to_datetime
 
 app = FastAPI(title="RecruitGenie API")
 
 # Where uploaded resumes are stored (same as used elsewhere)
 UPLOAD_DIR = Path("backend/assets/resumes")
 OUTPUT_PATH = Path("backend/assets/candidate_data.csv")
+STORE_DIR = Path("backend/assets/candidate_store")
+SEARCH_DIR = Path("backend/assets/search_index")
+VECTOR_DIR = Path("backend/assets/vector_index")
+ANALYTICS_DIR = Path("backend/assets/analytics")
 
-# Columns expected in CSV (DataAgent writes these). Keep consistent with DataAgent.
-CSV_HEADER = [
-    "job_id",
-    "name",
-    "email",
-    "phone",
-    "total_score",
-    "base_score",
-    "skill_score",
-    "penalty",
-    "questions",
-    "status",
-    "notes",
-]
+# Candidate store backend: "jsonl" (files under STORE_DIR) or "sqlite" (backend/db.py)
+STORE_BACKEND = os.getenv("RECRUITGENIE_STORE", "jsonl").lower()
+
+# Resume formats the extractor understands (anything else in a batch is skipped)
+RESUME_SUFFIXES = {".pdf", ".docx", ".txt"}
+
+# Largest resume accepted, per file (0 = no limit)
+MAX_UPLOAD_BYTES = int(os.getenv("RECRUITGENIE_MAX_UPLOAD_MB", "10")) * 1024 * 1024
+
+# Uploads up to this size stay in memory too and go to the extractor as bytes
+INLINE_UPLOAD_BYTES = 1024 * 1024
+SPOOL_CHUNK = 64 * 1024
 
 # -------------------------
-# Utility CSV helpers
+# Candidate store
 # -------------------------
-def _read_csv(path: Path) -> List[Dict[str, str]]:
-    """Read CSV into list of dicts. Always returns rows in file order."""
-    if not path.exists():
-        return []
-    with path.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        rows = []
-        for r in reader:
-            # ensure all expected keys exist
-            row = {k: (v if v is not None else "") for k, v in r.items()}
-            for h in CSV_HEADER:
-                if h not in row:
-                    row[h] = ""
-            rows.append(row)
-    return rows
-
-
-def _write_csv(path: Path, rows: List[Dict[str, str]]) -> None:
-    """Write rows to CSV (overwrites). Ensure header order."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_HEADER)
-        writer.writeheader()
-        for r in rows:
-            # ensure keys
-            out = {k: (str(r.get(k, "")) if r.get(k, "") is not None else "") for k in CSV_HEADER}
-            writer.writerow(out)
-
-
-def _safe_int(val: str, default: int = 0) -> int:
-    try:
-        return int(val)
-    except Exception:
-        try:
-            return int(float(val))
-        except Exception:
-            return default
+def _open_store(root: Path, legacy_csv: Path) -> CandidateStore:
+    """
+    Open the candidate store, seeding it from the legacy CSV on first run.
+    RECRUITGENIE_STORE=sqlite keeps candidates in the SQLite database (backend/db.py)
+    instead of the JSONL files under root.
+    """
+    store = SQLiteCandidateStore() if STORE_BACKEND == "sqlite" else CandidateStore(root)
+    if len(store) == 0 and legacy_csv.exists():
+        import_csv(store, legacy_csv)
+    # fold status/notes deltas back into the record file in the background
+    store.start_compactor()
+    return store
+
+
+STORE = _open_store(STORE_DIR, OUTPUT_PATH)
+
+# Columnar copy of scores/job/status/skills for analytics (built on first query)
+COLUMNS = CandidateColumns(STORE)
+
+# Running per-job counts, sums and sketches behind /analytics/summary
+AGGREGATES = CandidateAggregates(STORE, ANALYTICS_DIR)
+
+# Per-skill candidate bitmaps behind the /candidates/ skill filter (built on first query)
+SKILLS = SkillIndex(STORE)
+
+# Sort orders behind ranked /candidates/ listings with keyset cursors (built on first query)
+SORTED = SortedIndex(STORE)
+
+# BM25 index over resume text, fed by DataAgent as candidates are stored
+SEARCH = SearchIndex(SEARCH_DIR)
+
+# Hashed resume vectors + LSH for "similar candidates", fed the same way
+VECTORS = VectorIndex(VECTOR_DIR)
+
+# Resume parsing/scoring runs here, off the event loop
+WORKERS = UploadWorkerPool()
+
+# Per-job scoring profiles, compiled once and swapped in on every job update
+JOBS = get_job_registry()
+
+# Content hash / contact / MinHash keys of stored candidates, per job (backfilled from the store)
+DEDUP = get_dedup_index()
+DEDUP.sync(STORE)
 
 
 # -------------------------
@@ -79,42 +117,422 @@ def _safe_int(val: str, default: int = 0) -> int:
 @app.get("/")
 def root() -> Dict[str, Any]:
     """Simple health / root endpoint: shows available endpoints."""
-    return {"status": "ok", "service": "RecruitGenie API", "endpoints": ["/docs", "/upload_resume/", "/candidates/"]}
+    return {"status": "ok", "service": "RecruitGenie API", "endpoints": ["/docs", "/upload_resume/", "/jobs/{task_id}", "/job_profiles/", "/candidates/"]}
+
+
+# -------------------------
+# Conditional GET / response cache
+# -------------------------
+# Reads answered from the candidate store alone (and the views kept in step with it)
+CACHED_READS = re.compile(r"^/(candidates/(\d+)?|analytics/(summary|groups|histogram))$")
+
+# Rendered bodies of those reads, keyed on (path, query, store version); emptied on every write
+RESPONSE_CACHE = ResponseCache()
+STORE.subscribe(lambda items: RESPONSE_CACHE.clear())
+
+# Store versions restart at 0 with the process; the boot time keeps ETags from repeating
+_BOOT = format(time.time_ns(), "x")
+
+
+def _not_modified(request: Request, etag: str, modified: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags or etag[2:] in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+@app.middleware("http")
+async def conditional_reads(request: Request, call_next):
+    """
+    ETag / Last-Modified on candidate and analytics reads, derived from the store version.
+    A matching If-None-Match (or If-Modified-Since) gets 304; repeat reads of an unchanged
+    store are served from RESPONSE_CACHE without running the endpoint.
+    """
+    match = CACHED_READS.match(request.url.path) if request.method == "GET" else None
+    if match is None:
+        return await call_next(request)
+    if match.group(2) and not STORE.exists(int(match.group(2))):
+        # no such candidate: let the endpoint answer 404, whatever the client's validators
+        return await call_next(request)
+    version, modified = STORE.version, STORE.last_modified
+    etag = f'W/"{_BOOT}-{version}"'
+    headers = {"ETag": etag, "Last-Modified": formatdate(modified, usegmt=True), "Cache-Control": "no-cache"}
+    if _not_modified(request, etag, modified):
+        return Response(status_code=304, headers=headers)
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())), version)
+    body = RESPONSE_CACHE.get(key)
+    if body is None:
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        RESPONSE_CACHE.put(key, body)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 # -------------------------
 # Upload & process resume
 # -------------------------
-@app.post("/upload_resume/")
+class UploadTooLarge(Exception):
+    pass
+
+
+def _spool(src, dest_dir: Path, max_bytes: int = 0, keep_bytes: int = 0) -> Tuple[Path, str, Optional[bytes]]:
+    """
+    Stream src into a temp file in dest_dir in SPOOL_CHUNK pieces, hashing on the way.
+    Returns (temp path, sha256, content): content is the whole file if it is at most
+    keep_bytes long, else None. Past max_bytes (0 = no limit) the temp file is removed
+    and UploadTooLarge raised.
+    """
+    digest = hashlib.sha256()
+    kept: Optional[bytearray] = bytearray() if keep_bytes > 0 else None
+    size = 0
+    fd, name = tempfile.mkstemp(dir=dest_dir, prefix=".upload-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: src.read(SPOOL_CHUNK), b""):
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise UploadTooLarge(f"exceeds the {max_bytes >> 20} MB upload limit")
+                digest.update(chunk)
+                out.write(chunk)
+                if kept is not None:
+                    if size <= keep_bytes:
+                        kept += chunk
+                    else:
+                        kept = None
+    except BaseException:
+        os.unlink(name)
+        raise
+    return Path(name), digest.hexdigest(), bytes(kept) if kept is not None else None
+
+
+def _place(tmp: Path, dest_dir: Path, name: str, sha256: str) -> Path:
+    """
+    Move a spooled upload to dest_dir/name. A different file already saved under
+    that name is kept: the upload is stored as <stem>-<sha256[:8]><suffix> instead.
+    """
+    dest = dest_dir / name
+    if dest.exists() and file_sha256(dest) != sha256:
+        dest = dest_dir / f"{dest.stem}-{sha256[:8]}{dest.suffix}"
+    os.replace(tmp, dest)
+    return dest
+
+
+def _store_result(profile: JobProfile, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker completion hook: LLM-score (if enabled) and persist the analyzed candidate in the store."""
+    result = ai_score_results([result], profile)[0]
+    return persist_candidate(
+        result, DataAgent(OUTPUT_PATH, store=STORE, search_index=SEARCH, vector_index=VECTORS), DEDUP
+    )
+
+
+@app.post("/upload_resume/", status_code=202)
 async def upload_resume(job_id: str = Query(..., description="Job ID"), file: UploadFile = File(...)):
     """
-    Upload a resume file (multipart/form-data) and process it for the given job_id.
-    Returns the processing result (score, generated questions, status, etc.)
+    Upload a resume file (multipart/form-data) and queue it for processing for the given job_id.
+    Only the file is saved here; parsing and scoring run on the worker pool.
+    Poll GET /jobs/{task_id} for the processing result (score, generated questions, status, etc.).
     The response also returns the stored filename so the frontend can call the resume download endpoint.
+
+    A file whose exact content is already stored for this job is not queued: the response
+    (200) has status "duplicate" and duplicate_of, the existing candidate's id. Resumes that
+    only match on email, phone or near-identical text are caught during processing and
+    finish with the same status.
     """
-    # Save the uploaded file
+    # Stream the upload to a temp file (hash + size cap), small files are also kept in memory
+    if MAX_UPLOAD_BYTES and file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"File exceeds the {MAX_UPLOAD_BYTES >> 20} MB upload limit")
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-    resume_path = UPLOAD_DIR / file.filename
+    name = Path(file.filename).name
+    try:
+        tmp, sha256, data = await run_in_threadpool(
+            _spool, file.file, UPLOAD_DIR, MAX_UPLOAD_BYTES, INLINE_UPLOAD_BYTES
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=f"File {e}")
+
+    match = DEDUP.find(job_id, {"sha256": sha256})
+    if match is not None:
+        tmp.unlink(missing_ok=True)
+        DataAgent(OUTPUT_PATH, store=STORE).link_duplicates({match["candidate_id"]: 1})
+        return JSONResponse(
+            status_code=200,
+            content={
+                "message": "Resume already uploaded for this job",
+                "file": name,
+                "status": "duplicate",
+                "duplicate_of": match["candidate_id"],
+                "duplicate_reason": match["reason"],
+            },
+        )
+    resume_path = _place(tmp, UPLOAD_DIR, name, sha256)
+
+    profile = JOBS.get(job_id)
+    try:
+        task_id = WORKERS.submit(
+            analyze_candidate,
+            job_id,
+            profile,
+            resume_path,
+            data,
+            sha256,
+            False,  # rule-score in the worker; _store_result hands the text to this process's LLM client
+            on_done=partial(_store_result, profile),
+            meta={"job_id": job_id, "file": resume_path.name},
+        )
+    except QueueFull:
+        raise HTTPException(status_code=503, detail="Processing queue is full, retry later")
 
-    # Write the incoming file to disk (overwrites if same name)
-    with open(resume_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    return {
+        "message": "Resume queued for processing",
+        "file": resume_path.name,
+        "saved_filename": resume_path.name,
+        "task_id": task_id,
+        "status_url": f"/jobs/{task_id}",
+    }
 
-    # Load job description (may raise FileNotFoundError handled by caller)
-    job_desc = load_job_description()
 
-    # Use DataAgent to append CSV row (DataAgent handles header creation)
-    data_agent = DataAgent(OUTPUT_PATH)
-    result = process_candidate(job_id, job_desc, resume_path, data_agent)
+def _save_batch(files: List[UploadFile], dest_dir: Path, job_id: str) -> List[Dict[str, Any]]:
+    """
+    Stream uploaded files to dest_dir, expanding .zip archives member by member.
+    Returns one entry per resume; entries with a "path" are ready to process
+    (plus "data", the content, for files small enough to keep in memory).
+    Files whose content is already stored for job_id, or appears earlier in the
+    batch, are not saved and come back as duplicates; files over MAX_UPLOAD_BYTES
+    come back as errors.
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    entries: List[Dict[str, Any]] = []
+    first: Dict[str, Dict[str, Any]] = {}  # sha256 -> first entry with that content
+
+    def _add(name: str, src, archive: Optional[str] = None) -> None:
+        entry: Dict[str, Any] = {"file": name}
+        if archive:
+            entry["archive"] = archive
+        if Path(name).suffix.lower() not in RESUME_SUFFIXES:
+            entry.update(status="skipped", error="unsupported file type")
+            entries.append(entry)
+            return
+        try:
+            tmp, sha256, data = _spool(src, dest_dir, MAX_UPLOAD_BYTES, INLINE_UPLOAD_BYTES)
+        except UploadTooLarge as e:
+            entry.update(status="error", error=str(e))
+            entries.append(entry)
+            return
+        match = DEDUP.find(job_id, {"sha256": sha256})
+        if match is not None:
+            tmp.unlink(missing_ok=True)
+            entry.update(status="duplicate", duplicate_of=match["candidate_id"], duplicate_reason="content", _link=True)
+        elif sha256 in first:
+            tmp.unlink(missing_ok=True)
+            entry.update(status="duplicate", duplicate_reason="content", _link=True, _first=first[sha256])
+        else:
+            entry["path"] = _place(tmp, dest_dir, name, sha256)
+            entry["data"] = data
+            entry["sha256"] = sha256
+            first[sha256] = entry
+        entries.append(entry)
+
+    for upload in files:
+        name = Path(upload.filename or "").name
+        if name.lower().endswith(".zip"):
+            try:
+                with zipfile.ZipFile(upload.file) as zf:
+                    for info in zf.infolist():
+                        member = Path(info.filename).name
+                        if info.is_dir() or info.filename.startswith("__MACOSX/") or member.startswith("."):
+                            continue
+                        with zf.open(info) as src:
+                            _add(member, src, archive=name)
+            except zipfile.BadZipFile:
+                entries.append({"file": name, "status": "error", "error": "not a valid zip archive"})
+        else:
+            _add(name, upload.file)
+    return entries
+
+
+@app.post("/upload_resumes/batch")
+async def upload_resumes_batch(
+    job_id: str = Query(..., description="Job ID"), files: List[UploadFile] = File(...)
+) -> Dict[str, Any]:
+    """
+    Upload many resumes at once (individual files and/or .zip archives) for one job_id.
+    Files are streamed to disk, parsed and scored in parallel on the worker pool and
+    stored with a single batched write. Returns a per-file outcome with timings.
+    Resumes already stored for the job (or repeated within the batch) are reported
+    with status "duplicate" and the id of the candidate they duplicate.
+    """
+    started = time.perf_counter()
+    entries = await run_in_threadpool(_save_batch, files, UPLOAD_DIR, job_id)
+    todo = [e for e in entries if "path" in e]
 
-    # Attach the saved filename so frontend can call download endpoint
-    result_with_file = dict(result)
-    result_with_file["saved_filename"] = resume_path.name
+    profile = JOBS.get(job_id)
+    try:
+        # rule-score in the workers; the whole batch then goes to this process's LLM client at once
+        args = [(job_id, profile, e["path"], e["data"], e["sha256"], False) for e in todo]
+        futures = WORKERS.submit_many(analyze_candidate, args)
+    except QueueFull:
+        raise HTTPException(status_code=503, detail="Processing queue is full, retry later")
+    outcomes = await asyncio.gather(*(asyncio.wrap_future(f) for f in futures), return_exceptions=True)
+
+    results = []
+    for entry, outcome in zip(todo, outcomes):
+        if isinstance(outcome, BaseException):
+            outcome = {"status": "error", "error": str(outcome), "job_id": job_id, "score": {}, "questions": []}
+        results.append(outcome)
+    results = await run_in_threadpool(ai_score_results, results, profile)
+    data_agent = DataAgent(OUTPUT_PATH, store=STORE, search_index=SEARCH, vector_index=VECTORS)
+    stored = await run_in_threadpool(persist_candidates, results, data_agent, DEDUP)
+
+    for entry, result in zip(todo, stored):
+        entry.pop("path")
+        entry.pop("data")
+        entry.pop("sha256")
+        entry["elapsed_ms"] = result.get("elapsed_ms")
+        if result.get("status") == "error":
+            entry.update(status="error", error=result.get("error", ""))
+        elif result.get("status") == "duplicate":
+            entry.update(
+                status="duplicate",
+                duplicate_of=result.get("duplicate_of"),
+                duplicate_reason=result.get("duplicate_reason"),
+                similarity=result.get("similarity"),
+            )
+        else:
+            entry.update(status="processed", _id=result.get("_id"), total_score=result["score"].get("total_score"))
+
+    # link in-batch and pre-queue content duplicates to the stored candidate
+    links: Counter = Counter()
+    for entry in entries:
+        if not entry.pop("_link", False):
+            continue
+        original = entry.pop("_first", None)
+        if original is not None:
+            entry["duplicate_of"] = original.get("_id") or original.get("duplicate_of")
+        if entry.get("duplicate_of"):
+            links[entry["duplicate_of"]] += 1
+    await run_in_threadpool(data_agent.link_duplicates, links)
 
     return {
-        "message": "Resume processed successfully!",
-        "file": resume_path.name,
-        "result": result_with_file,
+        "job_id": job_id,
+        "files": entries,
+        "processed": sum(1 for e in entries if e.get("status") == "processed"),
+        "duplicates": sum(1 for e in entries if e.get("status") == "duplicate"),
+        "failed": sum(1 for e in entries if e.get("status") == "error"),
+        "skipped": sum(1 for e in entries if e.get("status") == "skipped"),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+@app.get("/jobs/{task_id}")
+def get_job(task_id: str) -> Dict[str, Any]:
+    """Return the state of a processing task (queued/running/done/error) and its result when done."""
+    task = WORKERS.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+# -------------------------
+# Job registry (scoring profiles)
+# -------------------------
+@app.get("/job_profiles/")
+def list_job_profiles() -> Dict[str, Any]:
+    """Registered jobs; uploads for any other job_id are scored with the default profile."""
+    items = JOBS.list_jobs()
+    return {"total": len(items), "items": items}
+
+
+@app.get("/job_profiles/{job_id}")
+def get_job_profile(job_id: str) -> Dict[str, Any]:
+    job = JOBS.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.put("/job_profiles/{job_id}")
+def put_job_profile(job_id: str, job: Job) -> Dict[str, Any]:
+    """Create or replace a job. Its scoring profile is recompiled and used by the next upload."""
+    return JOBS.upsert(job.model_copy(update={"job_id": job_id}))
+
+
+@app.delete("/job_profiles/{job_id}")
+def delete_job_profile(job_id: str) -> Dict[str, Any]:
+    if not JOBS.delete(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"ok": True, "job_id": job_id}
+
+
+@app.get("/job_profiles/{job_id}/ranking")
+def rank_job_candidates(
+    job_id: str,
+    k: int = Query(50, ge=1, le=1000, description="Candidates to return"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+) -> Dict[str, Any]:
+    """
+    Top-k of a job's stored candidates under its current profile (weights and must-haves),
+    computed in one vectorized pass over the found_skills column; nothing is re-read or
+    written. Skills added to the taxonomy since a candidate was scored are not seen here:
+    POST /candidates/rescore re-matches those.
+    """
+    started = time.perf_counter()
+    ids = np.asarray(STORE.ids(job_id=job_id, status=status), dtype=np.int64)
+    profile = JOBS.get(job_id)
+    scorer = BatchScorer(profile.matcher, profile.weights, profile.must_have)
+    indptr, indices = scorer.remap_csr(*COLUMNS.skill_csr("found_skills", ids))
+    ranked = scorer.rank_features(indptr, indices, ids.tolist(), k)
+    rows = STORE.get_many(r["id"] for r in ranked)
+    return {
+        "job_id": job_id,
+        "profile_version": profile.fingerprint,
+        "total": int(len(ids)),
+        "candidates": [dict(r, name=row.get("name", ""), status=row.get("status", "")) for r, row in zip(ranked, rows)],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def _extract_upload(file: UploadFile) -> str:
+    """Extract text from an uploaded resume (small files in memory, larger via a temp file; nothing is kept)."""
+    suffix = Path(file.filename or "").suffix.lower()
+    with tempfile.TemporaryDirectory() as tmp:
+        spooled, sha256, data = _spool(file.file, Path(tmp), MAX_UPLOAD_BYTES, INLINE_UPLOAD_BYTES)
+        path = spooled.rename(Path(tmp) / f"resume{suffix}")
+        return ResumeAgent(path, data=data, sha256=sha256).run().get("text", "")
+
+
+@app.post("/match")
+async def match_jobs(
+    file: Optional[UploadFile] = File(None),
+    text: Optional[str] = Form(None),
+    k: int = Query(10, ge=1, le=100),
+) -> Dict[str, Any]:
+    """
+    Best-fitting open jobs for one resume (a file upload or plain `text`), with the
+    same score breakdown as an upload for that job. Uses the registry's inverted
+    skill index, so only jobs sharing a weighted or required skill are scored.
+    """
+    if file is None and not text:
+        raise HTTPException(status_code=400, detail="send a resume file or text")
+    started = time.perf_counter()
+    if file is not None:
+        try:
+            text = await run_in_threadpool(_extract_upload, file)
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=f"File {e}")
+    matches = JOBS.match(text or "", k)
+    return {
+        "open_jobs": len(JOBS.index),
+        "matches": matches,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
     }
 
 
@@ -142,35 +560,177 @@ def download_resume_file(filename: str):
 # -------------------------
 # Candidate listing (CSV)
 # -------------------------
+def _filtered_ids(
+    job_id: Optional[str],
+    status: Optional[str],
+    skills: Optional[str],
+    min_score: Optional[int],
+    max_score: Optional[int],
+) -> Optional[np.ndarray]:
+    """Ascending ids matching the listing filters, or None when there are none."""
+    if skills is None and min_score is None and max_score is None:
+        return np.asarray(STORE.ids(job_id=job_id, status=status), dtype=np.int64) if job_id or status else None
+    try:
+        matched = SKILLS.evaluate(skills) if skills is not None else SKILLS.universe()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid skill filter: {e}")
+    if job_id or status:
+        matched = matched & RoaringBitmap.from_ids(STORE.ids(job_id=job_id, status=status))
+    ids = matched.to_array().astype(np.int64)
+    if min_score is not None or max_score is not None:
+        scores = COLUMNS.scores("total_score", ids)
+        keep = np.ones(len(ids), dtype=bool)
+        if min_score is not None:
+            keep &= scores >= min_score
+        if max_score is not None:
+            keep &= scores <= max_score
+        ids = ids[keep]
+    return ids
+
+
 @app.get("/candidates/")
 def list_candidates(
     job_id: Optional[str] = Query(None, description="Filter by job_id"),
     status: Optional[str] = Query(None, description="Filter by status (shortlisted/review/reject)"),
+    skills: Optional[str] = Query(
+        None, description='Skill filter, e.g. python AND docker AND NOT kubernetes, (django OR flask) "machine learning"'
+    ),
+    min_score: Optional[int] = Query(None, description="Minimum total_score"),
+    max_score: Optional[int] = Query(None, description="Maximum total_score"),
+    sort: Optional[str] = Query(None, pattern=f"^({'|'.join(SORT_FIELDS)})$", description="Sort by this field"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="Sort direction"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous sorted page"),
     limit: int = Query(50, ge=1, le=500, description="Max rows to return"),
     offset: int = Query(0, ge=0, description="Rows to skip"),
 ) -> Dict[str, Any]:
     """
-    Return candidate rows from the CSV as JSON with optional filters and pagination.
-    If CSV doesn't exist yet, returns empty list.
-    Each candidate will get a stable `id` equal to its 1-based row index in the CSV.
+    Return candidate rows as JSON with optional filters and pagination.
+    Filters are answered from the store's job_id/status indexes, so only the
+    requested page is read. Each candidate has a stable `_id` (1-based row number).
+    A `skills` expression is evaluated on per-skill bitmaps and score bounds on the
+    total_score column before paginating.
+
+    With `sort`, rows come from a maintained sort order (ties broken by `_id`) and the
+    response carries `next_cursor`: pass it back as `cursor` (with the same filters)
+    for the next page, however deep, instead of a growing offset.
     """
-    rows = _read_csv(OUTPUT_PATH)
+    if sort is None and cursor is None:
+        if skills is None and min_score is None and max_score is None:
+            total, page = STORE.query(job_id=job_id, status=status, limit=limit, offset=offset)
+            return {"total": total, "limit": limit, "offset": offset, "candidates": page}
+        ids = _filtered_ids(job_id, status, skills, min_score, max_score)
+        page = STORE.get_many(ids[offset : offset + limit].tolist())
+        return {"total": int(len(ids)), "limit": limit, "offset": offset, "candidates": page}
+
+    descending = order == "desc"
+    after = None
+    if cursor is not None:
+        try:
+            field, descending, after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+        if sort is not None and sort != field:
+            raise HTTPException(status_code=400, detail="cursor was issued for a different sort")
+        sort = field
+    ids = _filtered_ids(job_id, status, skills, min_score, max_score)
+    keys, more = SORTED.page(sort, descending, ids=ids, after=after, limit=offset + limit)
+    keys = keys[offset:]
+    return {
+        "total": len(STORE) if ids is None else int(len(ids)),
+        "limit": limit,
+        "sort": sort,
+        "order": "desc" if descending else "asc",
+        "next_cursor": encode_cursor(sort, descending, keys[-1]) if more and keys else None,
+        "candidates": STORE.get_many(cid for _, cid in keys),
+    }
 
-    filtered = []
-    for idx, r in enumerate(rows, start=1):
-        # apply filters
-        if job_id and (r.get("job_id", "") != job_id):
-            continue
-        if status and (r.get("status", "").lower() != status.lower()):
-            continue
-        # annotate with id
-        rr = dict(r)
-        rr["_id"] = idx
-        filtered.append(rr)
 
-    total = len(filtered)
-    sliced = filtered[offset: offset + limit]
-    return {"total": total, "limit": limit, "offset": offset, "candidates": sliced}
+@app.get("/candidates/search")
+def search_candidates(
+    q: str = Query(..., min_length=1, description="Words to look for in resume text"),
+    job_id: Optional[str] = Query(None, description="Filter by job_id"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    mode: str = Query("all", pattern="^(all|any)$", description="Match all words or any word"),
+    limit: int = Query(20, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+) -> Dict[str, Any]:
+    """
+    Full-text search over resume contents, BM25-ranked. Each candidate carries its
+    relevance as `_score`. Only resumes uploaded since search was added are indexed.
+    """
+    started = time.perf_counter()
+    ids = STORE.ids(job_id=job_id, status=status) if job_id or status else None
+    total, hits = SEARCH.search(q, ids=ids, mode=mode, limit=limit, offset=offset)
+    scores = dict(hits)
+    rows = STORE.get_many(scores)
+    for row in rows:
+        row["_score"] = scores[row["_id"]]
+    return {
+        "q": q,
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "candidates": rows,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+@app.get("/candidates/export.csv")
+def export_candidates_csv():
+    """Download every candidate as a CSV file (the legacy candidate_data.csv format)."""
+    return StreamingResponse(
+        stream_export(STORE, fields=CSV_HEADER),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="candidate_data.csv"'},
+    )
+
+
+@app.get("/candidates/export")
+def export_candidates(
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="csv or ndjson (one JSON object per line)"),
+    job_id: Optional[str] = Query(None, description="Filter by job_id"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    skills: Optional[str] = Query(None, description="Skill filter expression, as for /candidates/"),
+    min_score: Optional[int] = Query(None, description="Minimum total_score"),
+    max_score: Optional[int] = Query(None, description="Maximum total_score"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns (default: _id and every field)"),
+    gzip: bool = Query(False, description="gzip the file (.csv.gz / .ndjson.gz)"),
+):
+    """
+    Stream every matching candidate, in id order, as CSV or NDJSON. Records are read
+    and written a chunk at a time, so memory stays flat and the first bytes go out
+    before the rest of the store is read.
+    """
+    columns = ["_id"] + CANDIDATE_FIELDS
+    if fields:
+        columns = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in columns if f != "_id" and f not in CANDIDATE_FIELDS]
+        if unknown or not columns:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown) or '(none given)'}")
+    ids = _filtered_ids(job_id, status, skills, min_score, max_score)
+    name = f"candidates{'-' + job_id if job_id else ''}.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream_export(STORE, ids=ids, fields=columns, fmt=format, gzip=gzip),
+        media_type="application/gzip" if gzip else ("text/csv" if format == "csv" else "application/x-ndjson"),
+        headers={"Content-Disposition": f'attachment; filename="{name}"'},
+    )
+
+
+@app.post("/candidates/import.csv")
+async def import_candidates_csv(file: UploadFile = File(...)) -> Dict[str, Any]:
+    """
+    Bulk-append the candidates of an uploaded CSV (export format, DataAgent's CSV, or the
+    headerless legacy layout). The upload is spooled to disk and loaded in chunks;
+    returns rows imported and rows/sec.
+    """
+    tmp, _, _ = await run_in_threadpool(_spool, file.file, Path(tempfile.gettempdir()))
+    try:
+        stats = await run_in_threadpool(import_csv, STORE, tmp)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Unreadable CSV: {e}")
+    finally:
+        tmp.unlink(missing_ok=True)
+    return dict(stats, total=len(STORE))
 
 
 # -------------------------
@@ -178,16 +738,15 @@ def list_candidates(
 # -------------------------
 @app.get("/candidates/{candidate_id}")
 def get_candidate(candidate_id: int = FastAPIPath(..., ge=1)):
-    """Return a single candidate by its CSV row index (1-based)."""
-    rows = _read_csv(OUTPUT_PATH)
-    if candidate_id < 1 or candidate_id > len(rows):
+    """Return a single candidate by its id (1-based row number)."""
+    row = STORE.get(candidate_id)
+    if row is None:
         raise HTTPException(status_code=404, detail="Candidate not found")
-    row = dict(rows[candidate_id - 1])
     # parse some numeric fields into ints for convenience
-    row["total_score"] = _safe_int(row.get("total_score", "0"))
-    row["base_score"] = _safe_int(row.get("base_score", "0"))
-    row["skill_score"] = _safe_int(row.get("skill_score", "0"))
-    row["penalty"] = _safe_int(row.get("penalty", "0"))
+    row["total_score"] = to_int(row.get("total_score", "0"))
+    row["base_score"] = to_int(row.get("base_score", "0"))
+    row["skill_score"] = to_int(row.get("skill_score", "0"))
+    row["penalty"] = to_int(row.get("penalty", "0"))
     row["_id"] = candidate_id
     # Questions stored as joined string -> split
     questions_raw = row.get("questions", "")
@@ -195,6 +754,29 @@ def get_candidate(candidate_id: int = FastAPIPath(..., ge=1)):
     return row
 
 
+@app.get("/candidates/{candidate_id}/similar")
+def similar_candidates(
+    candidate_id: int = FastAPIPath(..., ge=1),
+    k: int = Query(10, ge=1, le=100),
+    job_id: Optional[str] = Query(None, description="Only return neighbours for this job"),
+) -> Dict[str, Any]:
+    """
+    "More like this": the k candidates whose resumes (text + found skills) are closest to
+    this one, by cosine similarity of hashed feature vectors, via the LSH index.
+    """
+    if not STORE.exists(candidate_id):
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    # over-fetch when filtering so a job filter still fills k
+    hits = VECTORS.similar(candidate_id, k * 5 if job_id else k)
+    if hits is None:
+        raise HTTPException(status_code=404, detail="Candidate has no indexed resume")
+    sims = dict(hits)
+    rows = [r for r in STORE.get_many(sims) if job_id is None or r.get("job_id") == job_id][:k]
+    for row in rows:
+        row["_similarity"] = sims[row["_id"]]
+    return {"id": candidate_id, "k": k, "candidates": rows}
+
+
 class StatusPayload(BaseModel):
     status: str
 
@@ -205,26 +787,108 @@ class NotesPayload(BaseModel):
 
 @app.patch("/candidates/{candidate_id}/status")
 def update_status(candidate_id: int, payload: StatusPayload):
-    """Update the 'status' field (shortlisted/reject/review)."""
-    rows = _read_csv(OUTPUT_PATH)
-    if candidate_id < 1 or candidate_id > len(rows):
+    """Update the 'status' field (shortlisted/reject/review). Appends one delta to the update log."""
+    try:
+        STORE.update(candidate_id, {"status": payload.status})
+    except KeyError:
         raise HTTPException(status_code=404, detail="Candidate not found")
-    rows[candidate_id - 1]["status"] = payload.status
-    _write_csv(OUTPUT_PATH, rows)
     return {"ok": True, "id": candidate_id, "status": payload.status}
 
 
 @app.patch("/candidates/{candidate_id}/notes")
 def update_notes(candidate_id: int, payload: NotesPayload):
-    """Update free-form notes for a candidate."""
-    rows = _read_csv(OUTPUT_PATH)
-    if candidate_id < 1 or candidate_id > len(rows):
+    """Update free-form notes for a candidate. Appends one delta to the update log."""
+    try:
+        STORE.update(candidate_id, {"notes": payload.notes})
+    except KeyError:
         raise HTTPException(status_code=404, detail="Candidate not found")
-    rows[candidate_id - 1]["notes"] = payload.notes
-    _write_csv(OUTPUT_PATH, rows)
     return {"ok": True, "id": candidate_id}
 
 
+class CandidateChange(BaseModel):
+    id: int
+    status: Optional[str] = None
+    notes: Optional[str] = None
+
+
+class BulkFilter(BaseModel):
+    job_id: Optional[str] = None
+    status: Optional[str] = None
+    total_score_lt: Optional[int] = None
+    total_score_gte: Optional[int] = None
+
+
+class BulkUpdate(BaseModel):
+    status: Optional[str] = None
+    notes: Optional[str] = None
+
+
+class BulkPayload(BaseModel):
+    changes: List[CandidateChange] = []
+    filter: Optional[BulkFilter] = None
+    update: Optional[BulkUpdate] = None
+
+
+def _change_fields(change: BaseModel) -> Dict[str, str]:
+    return {k: v for k, v in change.model_dump(include={"status", "notes"}).items() if v is not None}
+
+
+@app.post("/candidates/bulk")
+def bulk_update_candidates(payload: BulkPayload) -> Dict[str, Any]:
+    """
+    Apply many status/notes changes in one pass and one durable commit.
+    Send either explicit `changes` ([{id, status?, notes?}, ...]) or a `filter`
+    over job_id/status/total_score plus an `update`, e.g.
+    {"filter": {"job_id": "JOB-001", "total_score_lt": 8}, "update": {"status": "reject"}}.
+    """
+    changes: Dict[int, Dict[str, str]] = {}
+    for c in payload.changes:
+        fields = _change_fields(c)
+        if fields:
+            changes.setdefault(c.id, {}).update(fields)
+
+    if payload.filter is not None:
+        update = _change_fields(payload.update) if payload.update else {}
+        if not update:
+            raise HTTPException(status_code=400, detail="filter requires an update with status or notes")
+        flt = payload.filter
+        for cid, row in STORE.scan(STORE.ids(job_id=flt.job_id, status=flt.status)):
+            score = to_int(row.get("total_score", "0"))
+            if flt.total_score_lt is not None and score >= flt.total_score_lt:
+                continue
+            if flt.total_score_gte is not None and score < flt.total_score_gte:
+                continue
+            changes.setdefault(cid, {}).update(update)
+
+    if not changes and payload.filter is None:
+        raise HTTPException(status_code=400, detail="provide changes or a filter + update")
+
+    updated = STORE.update_many(changes)
+    results = []
+    for cid, row in updated.items():
+        if row is None:
+            results.append({"id": cid, "ok": False, "error": "Candidate not found"})
+        else:
+            results.append({"id": cid, "ok": True, "status": row.get("status", ""), "notes": row.get("notes", "")})
+    return {"ok": True, "updated": sum(1 for r in results if r["ok"]), "results": results}
+
+
+@app.post("/candidates/rescore")
+async def rescore_candidates(
+    job_id: str = Query(..., description="Job ID"),
+    force: bool = Query(False, description="Re-score every candidate, not only stale ones"),
+) -> Dict[str, Any]:
+    """
+    Re-score a job's candidates with its current profile (weights, must-haves, skills)
+    from stored skill features or cached resume text -- nothing is re-uploaded. Only
+    candidates scored with an older profile are recomputed unless force is set.
+    """
+    try:
+        return await run_in_threadpool(rescore_job, STORE, JOBS.get(job_id), job_id, WORKERS, force, RESCORE_CHUNK, UPLOAD_DIR)
+    except QueueFull:
+        raise HTTPException(status_code=503, detail="Processing queue is full, retry later")
+
+
 # -------------------------
 # Analytics endpoints
 # -------------------------
@@ -233,43 +897,64 @@ def analytics_summary(job_id: Optional[str] = Query(None, description="Optional
     """
     Return quick analytics summary:
      - total candidates
-     - average score
+     - average and p50/p90 score
      - counts by status
-     - top missing skills (aggregated)
-    """
-    rows = _read_csv(OUTPUT_PATH)
-    if job_id:
-        rows = [r for r in rows if r.get("job_id", "") == job_id]
-
-    total = len(rows)
-    if total == 0:
-        return {"total": 0, "avg_score": 0.0, "status_counts": {}, "top_missing_skills": []}
-
-    scores = [_safe_int(r.get("total_score", "0")) for r in rows]
-    avg_score = sum(scores) / total if total else 0.0
-    status_counts = Counter(r.get("status", "").lower() or "unknown" for r in rows)
-
-    missing = Counter()
-    for r in rows:
-        ms_raw = r.get("missing_skills", "")
-        # DataAgent used " | " join; accept comma/pipe/semicolon splits
-        parts = [p.strip() for delim in ["|", ";", ","] for p in ms_raw.split(delim)]
-        for p in parts:
-            if not p:
-                continue
-            missing[p.lower()] += 1
+     - top missing and found skills (aggregated)
+    Served from running aggregates kept current on every write, so it does not scan candidates.
+    """
+    return AGGREGATES.summary(job_id=job_id)
 
-    top_missing = missing.most_common(20)
 
-    # return convenient JSON
+@app.get("/analytics/groups")
+def analytics_groups(
+    by: str = Query("job_id", pattern="^(job_id|status|job_id,status|status,job_id)$", description="Group keys"),
+    field: str = Query("total_score", description="Score field to aggregate"),
+    job_id: Optional[str] = Query(None, description="Optional job filter"),
+    status: Optional[str] = Query(None, description="Optional status filter"),
+) -> Dict[str, Any]:
+    """count / sum / avg / min / max of a score field per job_id and/or status, largest groups first."""
+    if field not in SCORE_FIELDS:
+        raise HTTPException(status_code=400, detail=f"field must be one of {', '.join(SCORE_FIELDS)}")
+    return {"by": by.split(","), "field": field, "groups": COLUMNS.group_by(by.split(","), field, job_id, status)}
+
+
+@app.get("/analytics/histogram")
+def analytics_histogram(
+    field: str = Query("total_score", description="Score field"),
+    bins: int = Query(20, ge=1, le=200),
+    job_id: Optional[str] = Query(None, description="Optional job filter"),
+    status: Optional[str] = Query(None, description="Optional status filter"),
+) -> Dict[str, Any]:
+    """Score distribution: counts[i] candidates have edges[i] <= score < edges[i + 1]."""
+    if field not in SCORE_FIELDS:
+        raise HTTPException(status_code=400, detail=f"field must be one of {', '.join(SCORE_FIELDS)}")
+    return COLUMNS.histogram(field, bins, job_id, status)
+
+
+# -------------------------
+# Cache statistics
+# -------------------------
+@app.get("/cache/stats")
+def cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters and size of the persistent caches and the in-process response cache."""
+    extraction = get_extraction_cache()
+    llm = get_llm_cache()
     return {
-        "total": total,
-        "avg_score": round(avg_score, 2),
-        "status_counts": dict(status_counts),
-        "top_missing_skills": [{"skill": k, "count": v} for k, v in top_missing],
+        "extraction": extraction.stats() if extraction is not None else None,
+        "llm": llm.stats() if llm is not None else None,
+        "responses": RESPONSE_CACHE.stats(),
     }
 
 
+@app.delete("/cache/llm")
+def invalidate_llm_cache(prompt_version: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Invalidate memoized LLM scores: those of one prompt_version, or by default every
+    score not produced by the current model and prompt version.
+    """
+    return {"removed": get_llm_client().invalidate_cache(prompt_version)}
+
+
 # Allow frontend dev server to call API
 from fastapi.middleware.cors import CORSMiddleware
 
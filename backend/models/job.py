@@ -1,10 +1,16 @@
+from typing import Dict, List, Optional
+
 from pydantic import BaseModel
 
 class Job(BaseModel):
     title: str
     description: str
-    requirements: str
-    location: str
+    requirements: str = ""
+    location: str = ""
     salary_min: int = 0
     salary_max: int = 0
-
+    job_id: str = ""
+    status: str = "active"
+    # scoring overrides; None falls back to backend/config/skills_config.py
+    skill_weights: Optional[Dict[str, int]] = None
+    must_have_skills: Optional[List[str]] = None
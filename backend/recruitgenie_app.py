@@ -1,11 +1,15 @@
 # backend/recruitgenie_app.py
 
 from backend.agents.resume_agent import ResumeAgent
-from backend.agents.scoring_agent import ScoringAgent
 from backend.agents.interview_agent import InterviewAgent
 from backend.agents.data_agent import DataAgent
+from backend.agents.scoring_agent import ai_scoring_enabled
+from backend.services.job_registry import JobProfile, get_job_registry
+from backend.services.dedup import DedupIndex, fingerprint, get_dedup_index
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+import time
 import traceback
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -16,7 +20,10 @@ OUTPUT_PATH = ASSETS_DIR / "candidate_data.csv"
 
 
 def load_job_description() -> str:
-    """Read and return the job description text. Raises FileNotFoundError if missing."""
+    """Read and return the default job description text. Raises FileNotFoundError if missing.
+
+    Scoring uses the job registry's in-memory profiles instead (see get_job_registry).
+    """
     if not JOB_DESC_PATH.exists():
         raise FileNotFoundError(f"Job description not found at {JOB_DESC_PATH}")
     return JOB_DESC_PATH.read_text(encoding="utf-8")
@@ -29,53 +36,66 @@ def find_resume_files() -> List[Path]:
     return files
 
 
-def process_candidate(
-    job_id: str, job_desc: str, resume_path: Path, data_agent: DataAgent
+def analyze_candidate(
+    job_id: str,
+    profile: JobProfile,
+    resume_path: Path,
+    data: Optional[bytes] = None,
+    sha256: Optional[str] = None,
+    use_ai: Optional[bool] = None,
 ) -> Dict[str, Any]:
-    """Process a single resume using the agents and return a result dict.
-
-    This function is defensive: it validates agent outputs and builds fallbacks
-    so a single bad resume or bug does not crash the whole batch run.
+    """Extract, score and generate questions for one resume without persisting anything.
+
+    profile is the job's precompiled scoring profile (JobRegistry.get(job_id)).
+    data, if given, is the file's content (a small upload kept in memory), so
+    the saved file at resume_path is not read back. sha256, if given, is the
+    file's content hash (computed while the upload was spooled); a resume whose
+    extraction is cached is then not read at all. use_ai=False rule-scores the
+    resume even when LLM scoring is enabled: the API does that in workers and
+    then hands the texts to its own LLM client via ai_score_results.
+
+    This is the CPU-bound part of processing and is safe to run in a worker
+    process. It is defensive: a bad resume or bug yields a result with
+    status "error" instead of raising. elapsed_ms is the wall time spent here.
+
+    A resume that duplicates a stored candidate of the same job (see
+    backend/services/dedup.py) is not scored: the result has status
+    "duplicate" and duplicate_of set to the existing candidate's id.
     """
+    started = time.perf_counter()
     try:
         # Extract resume text and contact info
-        resume_agent = ResumeAgent(resume_path)
+        resume_agent = ResumeAgent(resume_path, data=data, sha256=sha256)
         resume_data = resume_agent.run()
 
         if not isinstance(resume_data, dict) or "text" not in resume_data:
             raise ValueError(f"resume_agent.run() returned unexpected value: {resume_data!r}")
 
-        # Score the resume
-        scoring_agent = ScoringAgent(job_desc)
-        score = scoring_agent.run(resume_data.get("text", ""))
-
-        # Normalize score to expected keys
-        if not isinstance(score, dict):
-            raise ValueError(f"ScoringAgent.run() should return dict, got: {type(score)}")
-
-        expected_keys = {"base_score", "skill_score", "penalty", "total_score", "missing_skills", "found_skills"}
-        missing = expected_keys - set(score.keys())
-        if missing:
-            print(f"[WARN] ScoringAgent result missing keys: {missing}. Full score: {score}")
-            base_score = score.get("base_score") or score.get("total_score") or 0
-            score = {
-                "base_score": base_score,
-                "skill_score": score.get("skill_score", 0),
-                "penalty": score.get("penalty", 0),
-                "total_score": score.get("total_score", base_score),
-                "missing_skills": score.get("missing_skills", []),
-                "found_skills": score.get("found_skills", []),
+        # Skip scoring for a resume we already have for this job
+        fp = fingerprint(resume_data.get("sha256", ""), resume_data.get("contact", {}), resume_data.get("text", ""))
+        try:
+            match = get_dedup_index().find(job_id, fp)
+        except Exception as e:
+            print(f"[WARN] dedup lookup failed for {resume_path}: {e}")
+            match = None
+        if match is not None:
+            return {
+                "job_id": job_id,
+                "file": str(resume_path.name),
+                "contact": resume_data.get("contact", {}),
+                "score": {},
+                "questions": [],
+                "status": "duplicate",
+                "duplicate_of": match["candidate_id"],
+                "duplicate_reason": match["reason"],
+                "similarity": match.get("similarity"),
+                "saved_filename": resume_path.name,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
             }
 
-        # Generate interview questions
-        interview_agent = InterviewAgent(job_title="Backend Engineer")
-        questions = interview_agent.run(
-            missing_skills=score.get("missing_skills", []), found_skills=score.get("found_skills", [])
-        )
-
-        # Persist results and capture derived status (shortlisted/review/reject)
-        saved_filename = resume_path.name
-        status = data_agent.append_result(job_id, resume_data.get("contact", {}), score, questions, saved_filename)
+        # Score the resume and generate interview questions
+        score = profile.scoring_agent().run(resume_data.get("text", ""), use_ai)
+        score, questions = _score_and_questions(profile, score)
 
         return {
             "job_id": job_id,
@@ -83,8 +103,13 @@ def process_candidate(
             "contact": resume_data.get("contact", {}),
             "score": score,
             "questions": questions,
-            "status": status,
-            "saved_filename": saved_filename,
+            "status": "",
+            "saved_filename": resume_path.name,
+            "sha256": resume_data.get("sha256", ""),
+            "text": resume_data.get("text", ""),
+            "profile_version": profile.fingerprint,
+            "fingerprint": fp,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
         }
 
     except Exception as e:
@@ -99,4 +124,126 @@ def process_candidate(
             "status": "error",
             "error": str(e),
             "saved_filename": str(resume_path.name),
-        }
\ No newline at end of file
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+
+def _score_and_questions(profile: JobProfile, score: Any) -> Tuple[Dict[str, Any], List[str]]:
+    """Normalize a ScoringAgent result to the expected keys and generate interview questions for it."""
+    if not isinstance(score, dict):
+        raise ValueError(f"ScoringAgent.run() should return dict, got: {type(score)}")
+
+    expected_keys = {"base_score", "skill_score", "penalty", "total_score", "missing_skills", "found_skills"}
+    missing = expected_keys - set(score.keys())
+    if missing:
+        print(f"[WARN] ScoringAgent result missing keys: {missing}. Full score: {score}")
+        base_score = score.get("base_score") or score.get("total_score") or 0
+        score = {
+            "base_score": base_score,
+            "skill_score": score.get("skill_score", 0),
+            "penalty": score.get("penalty", 0),
+            "total_score": score.get("total_score", base_score),
+            "missing_skills": score.get("missing_skills", []),
+            "found_skills": score.get("found_skills", []),
+        }
+
+    interview_agent = InterviewAgent(job_title=profile.title or "Backend Engineer")
+    questions = interview_agent.run(
+        missing_skills=score.get("missing_skills", []), found_skills=score.get("found_skills", [])
+    )
+    return score, questions
+
+
+def ai_score_results(results: List[Dict[str, Any]], profile: JobProfile) -> List[Dict[str, Any]]:
+    """Re-score rule-scored analyze_candidate results with the LLM, all texts in one client call.
+
+    A no-op unless LLM scoring is enabled (OPENAI_API_KEY). Run in the API
+    process, so every upload shares its one client: a single concurrency limit
+    and prompt batching across a whole batch. Resumes the model cannot score
+    keep their rule score. Errors and duplicates are returned unchanged.
+    """
+    if not ai_scoring_enabled():
+        return results
+    todo = [i for i, r in enumerate(results) if r.get("status") not in ("error", "duplicate") and "text" in r]
+    if not todo:
+        return results
+    scores = profile.scoring_agent().run_many([results[i]["text"] for i in todo], use_ai=True)
+    results = list(results)
+    for i, score in zip(todo, scores):
+        try:
+            score, questions = _score_and_questions(profile, score)
+        except Exception as e:
+            print(f"[WARN] keeping rule score for {results[i].get('file')}: {e}")
+            continue
+        results[i] = dict(results[i], score=score, questions=questions)
+    return results
+
+
+def persist_candidate(
+    result: Dict[str, Any], data_agent: DataAgent, dedup: Optional[DedupIndex] = None
+) -> Dict[str, Any]:
+    """Store an analyze_candidate result (errors and duplicates are not stored) and return it."""
+    return persist_candidates([result], data_agent, dedup)[0]
+
+
+def persist_candidates(
+    results: List[Dict[str, Any]], data_agent: DataAgent, dedup: Optional[DedupIndex] = None
+) -> List[Dict[str, Any]]:
+    """Store many analyze_candidate results with one batched write; errors are skipped.
+
+    With a dedup index, results are checked against it once more before storing
+    (the worker's check can race with a concurrent upload, and does not see the
+    rest of the batch). Duplicates are not stored: they get status "duplicate"
+    and bump the `duplicates` count of the candidate they match. Fingerprints of
+    stored candidates are registered in the index.
+
+    The resume text and fingerprint are only needed here and are dropped from the returned dicts.
+    """
+    results = [dict(r) for r in results]
+    if dedup is not None:
+        checked = [
+            i for i, r in enumerate(results) if r.get("status") not in ("error", "duplicate") and r.get("fingerprint")
+        ]
+        matches = dedup.find_many([(results[i]["job_id"], results[i]["fingerprint"]) for i in checked])
+        for i, match in zip(checked, matches):
+            if match is not None:
+                results[i].update(
+                    status="duplicate",
+                    duplicate_of=match.get("candidate_id"),
+                    duplicate_batch_index=checked[match["batch_index"]] if "batch_index" in match else None,
+                    duplicate_reason=match["reason"],
+                    similarity=match.get("similarity"),
+                )
+
+    ok = [i for i, r in enumerate(results) if r.get("status") not in ("error", "duplicate")]
+    ids = data_agent.append_results([results[i] for i in ok])
+    out = [{k: v for k, v in r.items() if k not in ("text", "fingerprint")} for r in results]
+    for i, cid in zip(ok, ids):
+        out[i]["_id"] = cid
+    if dedup is not None and ids:
+        dedup.add_many(
+            (cid, results[i]["job_id"], results[i]["fingerprint"]) for i, cid in zip(ok, ids) if results[i].get("fingerprint")
+        )
+
+    links: Counter = Counter()
+    for r in out:
+        if r.get("status") != "duplicate":
+            continue
+        j = r.pop("duplicate_batch_index", None)
+        if j is not None:
+            r["duplicate_of"] = out[j].get("_id")
+        if r.get("duplicate_of"):
+            links[r["duplicate_of"]] += 1
+    data_agent.link_duplicates(links)
+    return out
+
+
+def process_candidate(job_id: str, resume_path: Path, data_agent: DataAgent) -> Dict[str, Any]:
+    """Process a single resume using the agents and return a result dict.
+
+    Looks up the job's scoring profile in the in-memory registry, runs
+    analyze_candidate and persists the result with data_agent, so a single
+    bad resume does not crash the whole batch run.
+    """
+    profile = get_job_registry().get(job_id)
+    return persist_candidate(analyze_candidate(job_id, profile, resume_path), data_agent, get_dedup_index())
@@ -0,0 +1,164 @@
+# backend/services/batch_scoring.py
+"""
+Vectorized rule scoring for many resumes against one job.
+
+Resumes become a sparse resume x skill matrix in CSR form (indptr, indices);
+base/skill/penalty/total scores for every row are then a few NumPy bincounts.
+Results are identical to ScoringAgent._rule_score for the same matcher,
+weights and must-have list.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.config.skills_config import SKILL_WEIGHTS, MUST_HAVE_SKILLS, DEFAULT_SKILL_WEIGHT, MUST_HAVE_PENALTY
+from backend.services.skill_matcher import SkillMatcher, get_skill_matcher
+
+BASE_SCORE = 5
+
+
+class BatchScorer:
+    """Scores and ranks many resumes for one set of weights / must-have skills."""
+
+    def __init__(
+        self,
+        matcher: Optional[SkillMatcher] = None,
+        weights: Optional[Dict[str, int]] = None,
+        must_have: Optional[List[str]] = None,
+        base: int = BASE_SCORE,
+    ) -> None:
+        self.matcher = matcher or get_skill_matcher()
+        self.skills = self.matcher.skills
+        self.skill_index = {s: i for i, s in enumerate(self.skills)}
+        weights = SKILL_WEIGHTS if weights is None else weights
+        must_have = MUST_HAVE_SKILLS if must_have is None else must_have
+        self.base = base
+        self.weight_vec = np.array([weights.get(s, DEFAULT_SKILL_WEIGHT) for s in self.skills], dtype=np.int64)
+        # how many times each skill appears in must_have (a must-have outside the
+        # taxonomy can never be found, so it always costs a penalty)
+        self.must_vec = np.zeros(len(self.skills), dtype=np.int64)
+        for s in must_have:
+            if s in self.skill_index:
+                self.must_vec[self.skill_index[s]] += 1
+        self.n_must = len(must_have)
+        # taxonomy indices reported as missing: the skills the job weights or requires
+        self.job_skills = [i for i, s in enumerate(self.skills) if s in weights or self.must_vec[i]]
+
+    # -------------------------
+    # Feature matrix
+    # -------------------------
+    def skill_matrix(self, texts: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Match every text once and return the CSR (indptr, indices) resume x skill matrix."""
+        return self.features_to_csr(sorted(self.matcher.find_indices(t)) for t in texts)
+
+    @staticmethod
+    def features_to_csr(rows: Iterable[Sequence[int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Build CSR arrays from per-resume lists of found skill indices."""
+        indptr = [0]
+        indices: List[int] = []
+        for r in rows:
+            indices.extend(r)
+            indptr.append(len(indices))
+        return np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64)
+
+    def skills_to_indices(self, names: Iterable[str]) -> List[int]:
+        """Map stored skill names back to taxonomy indices (unknown names are dropped)."""
+        return sorted(self.skill_index[n] for n in names if n in self.skill_index)
+
+    def remap_csr(
+        self, indptr: np.ndarray, codes: np.ndarray, vocabulary: Sequence[str]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Turn a CSR matrix over another skill vocabulary (e.g. CandidateColumns.skill_csr)
+        into one over this taxonomy, dropping skills the taxonomy does not have.
+        """
+        lookup = np.array([self.skill_index.get(s, -1) for s in vocabulary] + [-1], dtype=np.int64)
+        mapped = lookup[codes]
+        keep = mapped >= 0
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        counts = np.bincount(rows[keep], minlength=len(indptr) - 1)
+        out = np.zeros(len(indptr), dtype=np.int64)
+        np.cumsum(counts, out=out[1:])
+        return out, mapped[keep]
+
+    def missing_skills(self, hit: Iterable[int]) -> List[str]:
+        """Job skills (weighted or must-have) not among the found skill indices hit."""
+        hit = set(hit)
+        return [self.skills[j] for j in self.job_skills if j not in hit]
+
+    # -------------------------
+    # Scoring
+    # -------------------------
+    def score_csr(self, indptr: np.ndarray, indices: np.ndarray) -> Dict[str, np.ndarray]:
+        """base/skill/penalty/total score arrays (one entry per row) for a CSR skill matrix."""
+        n = len(indptr) - 1
+        rows = np.repeat(np.arange(n), np.diff(indptr))
+        skill = np.bincount(rows, weights=self.weight_vec[indices], minlength=n).astype(np.int64)
+        must_found = np.bincount(rows, weights=self.must_vec[indices], minlength=n).astype(np.int64)
+        penalty = MUST_HAVE_PENALTY * (self.n_must - must_found)
+        base = np.full(n, self.base, dtype=np.int64)
+        return {"base_score": base, "skill_score": skill, "penalty": penalty, "total_score": base + skill - penalty}
+
+    def score(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """Score dicts in the same shape and order as ScoringAgent._rule_score."""
+        indptr, indices = self.skill_matrix(texts)
+        arrays = self.score_csr(indptr, indices)
+        out = []
+        for i in range(len(texts)):
+            hit = set(indices[indptr[i]: indptr[i + 1]].tolist())
+            out.append(
+                {
+                    "base_score": int(arrays["base_score"][i]),
+                    "skill_score": int(arrays["skill_score"][i]),
+                    "penalty": int(arrays["penalty"][i]),
+                    "total_score": int(arrays["total_score"][i]),
+                    "missing_skills": self.missing_skills(hit),
+                    "found_skills": [s for j, s in enumerate(self.skills) if j in hit],
+                }
+            )
+        return out
+
+    # -------------------------
+    # Ranking
+    # -------------------------
+    @staticmethod
+    def top_k(total: np.ndarray, ids: Sequence[int], k: int) -> List[Tuple[int, int]]:
+        """(id, total_score) for the k best rows, highest score first, ties by lower id."""
+        ids_arr = np.asarray(ids, dtype=np.int64)
+        n = len(total)
+        if n == 0 or k <= 0:
+            return []
+        if k < n:
+            cut = np.argpartition(-total, k - 1)[:k]
+            # keep every row tied with the k-th score so the tie-break is by id, not partition order
+            kth = total[cut].min()
+            cut = np.flatnonzero(total >= kth)
+        else:
+            cut = np.arange(n)
+        order = np.lexsort((ids_arr[cut], -total[cut]))[:k]
+        picked = cut[order]
+        return [(int(ids_arr[i]), int(total[i])) for i in picked]
+
+    def rank_features(
+        self, indptr: np.ndarray, indices: np.ndarray, ids: Sequence[int], k: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Top-k of a CSR matrix of found-skill indices (one row per id) as
+        [{id, total_score, ...breakdown}], so stored candidates are re-ranked
+        without re-matching any text.
+        """
+        arrays = self.score_csr(indptr, indices)
+        pos = {cid: i for i, cid in enumerate(ids)}
+        out = []
+        for cid, total in self.top_k(arrays["total_score"], ids, k):
+            i = pos[cid]
+            out.append(
+                {
+                    "id": cid,
+                    "total_score": total,
+                    "base_score": int(arrays["base_score"][i]),
+                    "skill_score": int(arrays["skill_score"][i]),
+                    "penalty": int(arrays["penalty"][i]),
+                }
+            )
+        return out
@@ -0,0 +1,306 @@
+# backend/services/csv_transfer.py
+"""
+Bulk CSV import into / export out of a candidate store (JSONL or SQLite).
+
+Rows stream through in fixed-size chunks, so memory stays flat whatever the
+file size: an import reads CHUNK_ROWS rows and writes them with one
+append_many (one executemany transaction on SQLite), an export reads
+CHUNK_ROWS records and writes them out.
+
+Both record their progress in a checkpoint file next to the CSV after every
+chunk and pick up from it when re-run. An import also compares the store's
+size with the one in the checkpoint, so a chunk that was committed right
+before an interruption is not imported twice.
+
+stream_export() yields the same records as CSV or NDJSON bytes, chunk by
+chunk, for streamed HTTP responses.
+
+Header handling:
+ - a header row is matched by name (case/space-insensitive, with aliases such
+   as file -> saved_filename); unknown columns are ignored and missing ones
+   left empty, so both the export format (CSV_HEADER) and DataAgent's CSV
+   (CANDIDATE_FIELDS) load.
+ - a file without a header row is read positionally in CANDIDATE_FIELDS order.
+
+Command line (stop the API first: the store has a single writer):
+
+    python -m backend.services.csv_transfer import backend/assets/candidate_data.csv --backend sqlite
+    python -m backend.services.csv_transfer export report.csv --backend sqlite
+"""
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import time
+import zlib
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from backend.storage.candidate_store import CANDIDATE_FIELDS
+
+CHUNK_ROWS = 5000
+
+# Records per chunk of a streamed HTTP export
+STREAM_CHUNK = 1000
+
+# Columns of the CSV export (the legacy candidate_data.csv layout). DataAgent's
+# CSV mode writes these first too, followed by its scoring inputs.
+CSV_HEADER = CANDIDATE_FIELDS[: CANDIDATE_FIELDS.index("saved_filename") + 1]
+
+# Other names the same columns go by in hand-made or older CSVs
+FIELD_ALIASES = {
+    "file": "saved_filename",
+    "filename": "saved_filename",
+    "resume": "saved_filename",
+    "score": "total_score",
+    "job": "job_id",
+    "mobile": "phone",
+}
+
+Progress = Callable[[Dict[str, Any]], None]
+
+
+def _canonical(name: str) -> str:
+    key = (name or "").strip().lower().replace(" ", "_").replace("-", "_")
+    return FIELD_ALIASES.get(key, key)
+
+
+def resolve_header(first_row: List[str]) -> Optional[List[Optional[str]]]:
+    """Field name per column if first_row is a header (>= 2 known names), else None."""
+    names = [_canonical(c) for c in first_row]
+    known = [n if n in CANDIDATE_FIELDS else None for n in names]
+    return known if sum(n is not None for n in known) >= 2 else None
+
+
+def _rows(f: TextIO) -> Iterator[Dict[str, str]]:
+    reader = csv.reader(f)
+    first = next(reader, None)
+    if first is None:
+        return
+    header = resolve_header(first)
+    if header is None:
+        header = list(CANDIDATE_FIELDS)
+        reader_rows: Iterator[List[str]] = itertools.chain([first], reader)
+    else:
+        reader_rows = reader
+    for values in reader_rows:
+        if not any(v.strip() for v in values):
+            continue
+        yield {name: v for name, v in zip(header, values) if name is not None}
+
+
+# -------------------------
+# Checkpoints
+# -------------------------
+def _load_checkpoint(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        print(f"[WARN] ignoring unreadable checkpoint {path}: {e}")
+        return None
+
+
+def _save_checkpoint(path: Path, state: Dict[str, Any]) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _stats(rows: int, resumed_from: int, started: float) -> Dict[str, Any]:
+    seconds = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "resumed_from": resumed_from,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+    }
+
+
+# -------------------------
+# Import / export
+# -------------------------
+def import_csv(
+    store: Any,
+    path: Path,
+    chunk_rows: int = CHUNK_ROWS,
+    checkpoint: Optional[Path] = None,
+    progress: Optional[Progress] = None,
+) -> Dict[str, Any]:
+    """
+    Append the rows of a candidate CSV to store in chunks. With a checkpoint path,
+    rows imported by an earlier interrupted run of the same file are skipped.
+    Returns rows imported by this run, the row it resumed from, and rows/sec.
+    """
+    path = Path(path)
+    stat = path.stat()
+    source = {"source": str(path.resolve()), "size": stat.st_size, "mtime": stat.st_mtime}
+    done = 0
+    if checkpoint is not None:
+        state = _load_checkpoint(checkpoint)
+        if state is not None and all(state.get(k) == v for k, v in source.items()):
+            # a chunk may have been committed after the checkpoint was last written
+            done = state["rows"] + max(0, len(store) - state["store_count"])
+        elif state is not None:
+            print(f"[WARN] {checkpoint} is for another version of the file; importing from the start")
+    resumed_from = done
+    started = time.perf_counter()
+    imported = 0
+    with path.open("r", encoding="utf-8", newline="") as f:
+        rows = _rows(f)
+        for _ in range(done):
+            if next(rows, None) is None:
+                break
+        while True:
+            chunk = [r for _, r in zip(range(chunk_rows), rows)]
+            if not chunk:
+                break
+            store.append_many(chunk)
+            imported += len(chunk)
+            if checkpoint is not None:
+                _save_checkpoint(checkpoint, dict(source, rows=done + imported, store_count=len(store)))
+            if progress is not None:
+                progress(_stats(imported, resumed_from, started))
+    if checkpoint is not None:
+        checkpoint.unlink(missing_ok=True)
+    return _stats(imported, resumed_from, started)
+
+
+def export_csv(
+    store: Any,
+    path: Path,
+    fields: Optional[List[str]] = None,
+    chunk_rows: int = CHUNK_ROWS,
+    checkpoint: Optional[Path] = None,
+    progress: Optional[Progress] = None,
+) -> Dict[str, Any]:
+    """
+    Write every store record to a CSV in chunks (fields default to CSV_HEADER). With a
+    checkpoint path, an interrupted export is continued: the file is cut back to the
+    last completed chunk and the remaining records appended.
+    """
+    fields = fields or CSV_HEADER
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    done, size = 0, 0
+    if checkpoint is not None:
+        state = _load_checkpoint(checkpoint)
+        if state is not None and state.get("fields") == fields and path.exists() and path.stat().st_size >= state["bytes"]:
+            done, size = state["rows"], state["bytes"]
+    resumed_from = done
+    started = time.perf_counter()
+    exported = 0
+    if done:
+        os.truncate(path, size)
+    with path.open("a" if done else "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        if not done:
+            writer.writeheader()
+        all_ids = store.ids()
+        remaining = all_ids[bisect_right(all_ids, done):]
+        for start in range(0, len(remaining), chunk_rows):
+            ids = remaining[start: start + chunk_rows]
+            batch = store.get_many(ids)
+            writer.writerows(batch)
+            exported += len(batch)
+            if checkpoint is not None:
+                f.flush()
+                _save_checkpoint(checkpoint, {"fields": fields, "rows": ids[-1], "bytes": os.fstat(f.fileno()).st_size})
+            if progress is not None:
+                progress(_stats(exported, resumed_from, started))
+    if checkpoint is not None:
+        checkpoint.unlink(missing_ok=True)
+    return _stats(exported, resumed_from, started)
+
+
+def stream_export(
+    store: Any,
+    ids: Optional[Iterable[int]] = None,
+    fields: Optional[List[str]] = None,
+    fmt: str = "csv",
+    gzip: bool = False,
+    chunk_rows: int = STREAM_CHUNK,
+) -> Iterator[bytes]:
+    """
+    Yield the records of ids (default: every candidate) as CSV or NDJSON bytes, a chunk
+    of records at a time, optionally gzip-compressed. The CSV header (or, with gzip,
+    the stream header) is yielded before any record is read.
+    """
+    fields = fields or CSV_HEADER
+    ids = ids if ids is not None else store.ids()
+    deflate = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None  # wbits 31: gzip container
+
+    def out(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return deflate.compress(data) + deflate.flush(zlib.Z_SYNC_FLUSH) if deflate else data
+
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=fields, extrasaction="ignore")
+    if fmt == "csv":
+        writer.writeheader()
+    yield out(buf.getvalue())
+    it = iter(ids)
+    while True:
+        batch = [int(cid) for cid in itertools.islice(it, chunk_rows)]
+        if not batch:
+            break
+        buf.seek(0)
+        buf.truncate()
+        rows = store.get_many(batch)
+        if fmt == "csv":
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                buf.write(json.dumps({f: row.get(f, "") for f in fields}, ensure_ascii=False))
+                buf.write("\n")
+        yield out(buf.getvalue())
+    if deflate:
+        yield deflate.flush()
+
+
+def _open_store(backend: str, root: Path) -> Any:
+    if backend == "sqlite":
+        from backend.storage.sqlite_store import SQLiteCandidateStore
+
+        return SQLiteCandidateStore()
+    from backend.storage.candidate_store import CandidateStore
+
+    return CandidateStore(root)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import/export of candidates between CSV and the candidate store.")
+    parser.add_argument("direction", choices=("import", "export"))
+    parser.add_argument("csv", help="CSV file to read (import) or write (export)")
+    parser.add_argument("--backend", choices=("jsonl", "sqlite"), default=os.getenv("RECRUITGENIE_STORE", "jsonl").lower())
+    parser.add_argument("--store", default=str(Path(__file__).resolve().parent.parent / "assets" / "candidate_store"))
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--checkpoint", help="progress file (default: <csv>.<direction>.checkpoint)")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    csv_path = Path(args.csv)
+    checkpoint = Path(args.checkpoint or f"{csv_path}.{args.direction}.checkpoint")
+    if args.restart:
+        checkpoint.unlink(missing_ok=True)
+
+    def report(stats: Dict[str, Any]) -> None:
+        print(f"{args.direction}: {stats['rows']} rows, {stats['rows_per_sec']} rows/s", flush=True)
+
+    store = _open_store(args.backend, Path(args.store))
+    try:
+        if args.direction == "import":
+            stats = import_csv(store, csv_path, args.chunk_size, checkpoint, report)
+        else:
+            stats = export_csv(store, csv_path, None, args.chunk_size, checkpoint, report)
+        print(stats)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
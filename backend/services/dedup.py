@@ -0,0 +1,290 @@
+# backend/services/dedup.py
+"""
+Ingest-time duplicate detection, per job_id.
+
+A resume is a duplicate of an existing candidate for the same job when any of
+these match, checked in this order:
+ - content:        SHA-256 of the uploaded file bytes
+ - email / phone:  normalized contact details from extract_contact_info
+ - near_duplicate: MinHash signatures of word 5-shingles agree on at least
+                   NEAR_DUP_THRESHOLD of their slots (estimated Jaccard)
+
+Exact keys are primary-key lookups. Near duplicates are found by LSH banding
+(BANDS bands of ROWS slots): only candidates sharing a band hash are compared,
+so every check costs O(1) expected lookups whatever the pool size.
+
+The index is SQLite in WAL mode with one connection per thread, so worker
+processes can check for duplicates before scoring while the API process
+registers new candidates.
+
+The API process also ties the index to its candidate store (sync): the store
+position it covers is saved at every store checkpoint, and on open the
+records appended after it are backfilled. When that is not possible (a new
+or reset store, another backend, or an index from before this) the index is
+rebuilt from a full store scan. Backfilled candidates get their exact keys;
+their MinHash only if the extraction cache still has their text.
+"""
+import json
+import re
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from backend.agents.resume_agent import extraction_cache_key_for, get_extraction_cache
+from backend.storage.candidate_store import CandidateStore
+from backend.storage.search_index import tokenize
+
+DEDUP_PATH = Path(__file__).resolve().parent.parent / "assets" / "dedup" / "dedup.sqlite"
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 5
+NEAR_DUP_THRESHOLD = 0.85
+BACKFILL_CHUNK = 2000
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240611)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS keys (
+    job_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    candidate_id INTEGER NOT NULL,
+    PRIMARY KEY (job_id, kind, value)
+);
+CREATE TABLE IF NOT EXISTS bands (
+    job_id TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    hash INTEGER NOT NULL,
+    candidate_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_bands ON bands(job_id, band, hash);
+CREATE TABLE IF NOT EXISTS signatures (
+    candidate_id INTEGER PRIMARY KEY,
+    sig BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def normalize_email(email: str) -> str:
+    email = (email or "").strip().lower().rstrip(".")
+    return email if re.fullmatch(r"[^@\s]+@[^@\s]+\.[a-z]{2,}", email) else ""
+
+
+def normalize_phone(phone: str) -> str:
+    """Last 10 digits (drops country code and formatting); partial numbers are ignored."""
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-10:] if len(digits) >= 10 else ""
+
+
+def minhash(text: str) -> np.ndarray:
+    """NUM_PERM-slot MinHash signature of the text's word 5-shingles (uint32)."""
+    tokens = tokenize(text or "")
+    if len(tokens) >= SHINGLE:
+        shingles = {" ".join(tokens[i: i + SHINGLE]) for i in range(len(tokens) - SHINGLE + 1)}
+    else:
+        shingles = set(tokens)
+    if not shingles:
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint32)
+    x = np.fromiter((zlib.crc32(s.encode("utf-8")) % _PRIME for s in shingles), dtype=np.uint64)
+    return ((np.outer(_A, x) + _B[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def band_hashes(sig: np.ndarray) -> List[int]:
+    return [zlib.crc32(sig[b * ROWS: (b + 1) * ROWS].tobytes()) for b in range(BANDS)]
+
+
+def fingerprint(sha256: str, contact: Dict[str, str], text: str) -> Dict[str, Any]:
+    """Everything dedup needs about one resume (plain types, so it can cross process boundaries)."""
+    sig = minhash(text)
+    empty = bool((sig == _PRIME).all())
+    return {
+        "sha256": sha256 or "",
+        "email": normalize_email(contact.get("email", "")),
+        "phone": normalize_phone(contact.get("phone", "")),
+        "minhash": [] if empty else sig.tolist(),
+    }
+
+
+def stored_fingerprint(row: Dict[str, str]) -> Dict[str, Any]:
+    """fingerprint of a stored candidate record (MinHash only if its extracted text is still cached)."""
+    text = ""
+    cache = get_extraction_cache()
+    if cache is not None and row.get("sha256") and row.get("saved_filename"):
+        cached = cache.get(extraction_cache_key_for(row["sha256"], Path(row["saved_filename"]).suffix))
+        if cached is not None:
+            text = cached.get("text", "")
+    return fingerprint(row.get("sha256", ""), {"email": row.get("email", ""), "phone": row.get("phone", "")}, text)
+
+
+def _exact_keys(fp: Dict[str, Any]) -> List[Tuple[str, str]]:
+    return [(kind, fp[kind]) for kind in ("sha256", "email", "phone") if fp.get(kind)]
+
+
+class DedupIndex:
+    """job_id-scoped exact keys + MinHash LSH bands, mapping to candidate ids."""
+
+    def __init__(self, path: Path = DEDUP_PATH, threshold: float = NEAR_DUP_THRESHOLD) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def find(self, job_id: str, fp: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The existing candidate fp duplicates, as {candidate_id, reason[, similarity]}, or None."""
+        conn = self._conn()
+        for kind, value in _exact_keys(fp):
+            row = conn.execute(
+                "SELECT candidate_id FROM keys WHERE job_id = ? AND kind = ? AND value = ?", (job_id, kind, value)
+            ).fetchone()
+            if row is not None:
+                return {"candidate_id": row[0], "reason": "content" if kind == "sha256" else kind}
+        if not fp.get("minhash"):
+            return None
+        sig = np.asarray(fp["minhash"], dtype=np.uint32)
+        seen = set()
+        for band, h in enumerate(band_hashes(sig)):
+            for (cid,) in conn.execute(
+                "SELECT candidate_id FROM bands WHERE job_id = ? AND band = ? AND hash = ?", (job_id, band, h)
+            ):
+                if cid in seen:
+                    continue
+                seen.add(cid)
+                row = conn.execute("SELECT sig FROM signatures WHERE candidate_id = ?", (cid,)).fetchone()
+                if row is None:
+                    continue
+                similarity = float((np.frombuffer(row[0], dtype=np.uint32) == sig).mean())
+                if similarity >= self.threshold:
+                    return {"candidate_id": cid, "reason": "near_duplicate", "similarity": round(similarity, 3)}
+        return None
+
+    def find_many(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        find() for a batch of (job_id, fp), also catching duplicates inside the batch:
+        a later item matching an earlier one gets {"batch_index": i, "reason": ...}.
+        """
+        out: List[Optional[Dict[str, Any]]] = []
+        local: Dict[Tuple[str, str, str], int] = {}
+        local_sigs: List[Tuple[str, np.ndarray, int]] = []
+        for i, (job_id, fp) in enumerate(items):
+            match = self.find(job_id, fp)
+            if match is None:
+                for kind, value in _exact_keys(fp):
+                    j = local.get((job_id, kind, value))
+                    if j is not None:
+                        match = {"batch_index": j, "reason": "content" if kind == "sha256" else kind}
+                        break
+            if match is None and fp.get("minhash"):
+                sig = np.asarray(fp["minhash"], dtype=np.uint32)
+                for other_job, other, j in local_sigs:
+                    similarity = float((other == sig).mean())
+                    if other_job == job_id and similarity >= self.threshold:
+                        match = {"batch_index": j, "reason": "near_duplicate", "similarity": round(similarity, 3)}
+                        break
+            out.append(match)
+            if match is None:
+                for kind, value in _exact_keys(fp):
+                    local.setdefault((job_id, kind, value), i)
+                if fp.get("minhash"):
+                    local_sigs.append((job_id, np.asarray(fp["minhash"], dtype=np.uint32), i))
+        return out
+
+    def add_many(self, items: Iterable[Tuple[int, str, Dict[str, Any]]]) -> None:
+        """Register (candidate_id, job_id, fp) triples; the first candidate to claim a key keeps it."""
+        keys = []
+        bands = []
+        sigs = []
+        for cid, job_id, fp in items:
+            keys.extend((job_id, kind, value, cid) for kind, value in _exact_keys(fp))
+            if fp.get("minhash"):
+                sig = np.asarray(fp["minhash"], dtype=np.uint32)
+                bands.extend((job_id, b, h, cid) for b, h in enumerate(band_hashes(sig)))
+                sigs.append((cid, sig.tobytes()))
+        with self._conn() as conn:
+            conn.executemany("INSERT OR IGNORE INTO keys (job_id, kind, value, candidate_id) VALUES (?, ?, ?, ?)", keys)
+            conn.executemany("INSERT INTO bands (job_id, band, hash, candidate_id) VALUES (?, ?, ?, ?)", bands)
+            conn.executemany("INSERT OR REPLACE INTO signatures (candidate_id, sig) VALUES (?, ?)", sigs)
+
+    # -------------------------
+    # Store sync
+    # -------------------------
+    def sync(self, store: CandidateStore) -> int:
+        """
+        Catch up with store (see the module docstring) and save the position it
+        covers at every store checkpoint. Returns the candidates backfilled.
+        """
+        with store.locked():
+            conn = self._conn()
+            row = conn.execute("SELECT value FROM meta WHERE key = 'position'").fetchone()
+            changes = store.changes_since(json.loads(row[0])) if row is not None else None
+            if changes is None:
+                with conn:
+                    conn.execute("DELETE FROM keys")
+                    conn.execute("DELETE FROM bands")
+                    conn.execute("DELETE FROM signatures")
+                ids = store.ids()
+            else:
+                # appended after the last checkpoint, and not registered at ingest
+                appended = [cid for cid, old, _ in changes if old is None]
+                known = {
+                    cid
+                    for (cid,) in conn.execute(
+                        "SELECT candidate_id FROM keys WHERE candidate_id >= ?"
+                        " UNION SELECT candidate_id FROM signatures WHERE candidate_id >= ?",
+                        (min(appended, default=0), min(appended, default=0)),
+                    )
+                }
+                ids = [cid for cid in appended if cid not in known]
+            for start in range(0, len(ids), BACKFILL_CHUNK):
+                rows = store.scan(ids[start: start + BACKFILL_CHUNK])
+                self.add_many((cid, r.get("job_id", ""), stored_fingerprint(r)) for cid, r in rows)
+            self._save_position(store)
+            store.on_checkpoint(lambda: self._save_position(store))
+        return len(ids)
+
+    def _save_position(self, store: CandidateStore) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('position', ?)", (json.dumps(store.position()),)
+            )
+
+    def stats(self) -> Dict[str, int]:
+        conn = self._conn()
+        return {
+            "keys": conn.execute("SELECT COUNT(*) FROM keys").fetchone()[0],
+            "signatures": conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0],
+        }
+
+
+_dedup_index: Optional[DedupIndex] = None
+
+
+def get_dedup_index() -> DedupIndex:
+    """Shared dedup index for this process (opened on first use)."""
+    global _dedup_index
+    if _dedup_index is None:
+        _dedup_index = DedupIndex()
+    return _dedup_index
@@ -0,0 +1,174 @@
+# backend/services/disk_cache.py
+"""
+Small persistent key -> JSON cache on SQLite with LRU eviction under a byte budget.
+
+Entries may carry a TTL (expired entries count as misses and are dropped on
+read) and a tag, so a whole family of entries -- e.g. everything produced by
+one prompt version -- can be invalidated at once.
+
+Safe to share between the API process and worker processes: each thread opens
+its own connection and the database runs in WAL mode. Hit/miss counters are
+stored in the database too, so they add up across processes.
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL,
+    expires_at REAL,
+    tag TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO counters (name, value) VALUES ('hits', 0), ('misses', 0), ('bytes', 0), ('expired', 0);
+"""
+
+# columns added after the first release; older cache files are upgraded in place
+_MIGRATIONS = {"expires_at": "ALTER TABLE entries ADD COLUMN expires_at REAL", "tag": "ALTER TABLE entries ADD COLUMN tag TEXT"}
+
+
+class DiskCache:
+    """JSON values keyed by string, evicted least-recently-used once max_bytes is exceeded."""
+
+    def __init__(self, path: Path, max_bytes: int = 256 * 1024 * 1024, ttl: Optional[float] = None) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {r[1] for r in conn.execute("PRAGMA table_info(entries)")}
+            for name, ddl in _MIGRATIONS.items():
+                if name not in columns:
+                    conn.execute(ddl)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_tag ON entries(tag)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value (refreshing its LRU position) or None on a miss or expiry."""
+        now = time.time()
+        with self._conn() as conn:
+            row = conn.execute("SELECT value, size, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[2] is not None and row[2] <= now:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                conn.execute("UPDATE counters SET value = value - ? WHERE name = 'bytes'", (row[1],))
+                conn.execute("UPDATE counters SET value = value + 1 WHERE name = 'expired'")
+                row = None
+            if row is None:
+                conn.execute("UPDATE counters SET value = value + 1 WHERE name = 'misses'")
+                return None
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.execute("UPDATE counters SET value = value + 1 WHERE name = 'hits'")
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, tag: Optional[str] = None) -> None:
+        """
+        Store value under key, then evict old entries until the cache fits max_bytes.
+        ttl (seconds) defaults to the cache-wide ttl; None means the entry never expires.
+        """
+        raw = json.dumps(value, ensure_ascii=False)
+        size = len(raw.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        with self._conn() as conn:
+            old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed_at, expires_at, tag) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, raw, size, now, now + ttl if ttl else None, tag),
+            )
+            conn.execute(
+                "UPDATE counters SET value = value + ? WHERE name = 'bytes'", (size - (old[0] if old else 0),)
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT value FROM counters WHERE name = 'bytes'").fetchone()[0]
+        while total > self.max_bytes:
+            victims = conn.execute("SELECT key, size FROM entries ORDER BY accessed_at LIMIT 64").fetchall()
+            if not victims:
+                break
+            for key, size in victims:
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+            conn.execute("UPDATE counters SET value = ? WHERE name = 'bytes'", (total,))
+
+    def delete(self, key: str) -> bool:
+        with self._conn() as conn:
+            row = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            conn.execute("UPDATE counters SET value = value - ? WHERE name = 'bytes'", (row[0],))
+        return True
+
+    def invalidate(self, tag: Optional[str] = None, keep_tag: Optional[str] = None) -> int:
+        """
+        Drop every entry with the given tag, or (keep_tag) every entry whose tag differs
+        from it. Returns the number of entries removed.
+        """
+        if tag is None and keep_tag is None:
+            raise ValueError("invalidate needs tag or keep_tag")
+        where, arg = ("tag = ?", tag) if tag is not None else ("tag IS NOT ?", keep_tag)
+        with self._conn() as conn:
+            removed, size = conn.execute(f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE {where}", (arg,)).fetchone()
+            conn.execute(f"DELETE FROM entries WHERE {where}", (arg,))
+            conn.execute("UPDATE counters SET value = value - ? WHERE name = 'bytes'", (size,))
+        return removed
+
+    def purge_expired(self) -> int:
+        """Delete expired entries now rather than on their next read."""
+        now = time.time()
+        with self._conn() as conn:
+            removed, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE expires_at <= ?", (now,)
+            ).fetchone()
+            conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+            conn.execute("UPDATE counters SET value = value - ? WHERE name = 'bytes'", (size,))
+            conn.execute("UPDATE counters SET value = value + ? WHERE name = 'expired'", (removed,))
+        return removed
+
+    def clear(self) -> None:
+        with self._conn() as conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("UPDATE counters SET value = 0")
+
+    def stats(self) -> Dict[str, Any]:
+        """hits, misses, hit_rate, expired, entries and bytes (counters are shared by all processes)."""
+        with self._conn() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "hits": counters["hits"],
+            "misses": counters["misses"],
+            "hit_rate": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+            "expired": counters["expired"],
+            "entries": entries,
+            "bytes": counters["bytes"],
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+        }
@@ -0,0 +1,97 @@
+# backend/services/job_index.py
+"""
+Inverted skill -> jobs index for matching one resume against every open job.
+
+For job j and found skills F, the rule score (see ScoringAgent._rule_score) is
+
+    base + sum(w_j(s) for s in F & taxonomy_j) - PENALTY * (must_j - |F & must_j|)
+
+Every job shares the base taxonomy with DEFAULT_SKILL_WEIGHT for skills it does
+not weight explicitly, so that part is the same for all jobs. Only skills a job
+weights differently, or requires, get a posting. A resume therefore touches just
+the postings of its found skills. Jobs it touches nothing in score
+`common - PENALTY * must_j`, so the best of those come from a list pre-sorted
+by must-have count.
+"""
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from backend.config.skills_config import DEFAULT_SKILL_WEIGHT, MUST_HAVE_PENALTY
+from backend.services.batch_scoring import BASE_SCORE
+from backend.services.skill_matcher import get_skill_matcher
+
+
+class JobIndex:
+    """Immutable index over a set of job profiles; rebuild it when jobs change."""
+
+    def __init__(self, profiles: Iterable[Any], base_taxonomy: Dict[str, List[str]], base: int = BASE_SCORE) -> None:
+        self.base = base
+        self.base_skills: Set[str] = set(base_taxonomy)
+        self.jobs: Dict[str, Any] = {}
+        # skill -> [(job_id, skill_score delta, must-have count)]
+        self.postings: Dict[str, List[Tuple[str, int, int]]] = {}
+        taxonomy = {k: list(v) for k, v in base_taxonomy.items()}
+        for p in profiles:
+            self.jobs[p.job_id] = p
+            must = {}
+            for s in p.must_have:
+                must[s] = must.get(s, 0) + 1
+            for s in set(p.weights) | set(must):
+                w = p.weights.get(s, DEFAULT_SKILL_WEIGHT)
+                # shared skills already earn DEFAULT_SKILL_WEIGHT in the common part
+                delta = w - DEFAULT_SKILL_WEIGHT if s in self.base_skills else w
+                if delta or must.get(s):
+                    self.postings.setdefault(s, []).append((p.job_id, delta, must.get(s, 0)))
+            for s, phrases in p.taxonomy.items():
+                if s not in taxonomy:
+                    taxonomy[s] = list(phrases)
+        self.matcher = get_skill_matcher(taxonomy)
+        # untouched jobs rank by fewest must-haves (ties by job_id)
+        self.by_must = sorted(self.jobs, key=lambda j: (len(self.jobs[j].must_have), j))
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def match_text(self, text: str, k: int = 10) -> List[Dict[str, Any]]:
+        return self.match_skills(self.matcher.find(text), k)
+
+    def match_skills(self, found: Iterable[str], k: int = 10) -> List[Dict[str, Any]]:
+        """Top-k jobs for a resume's found skills, highest total_score first (ties by job_id)."""
+        found = set(found)
+        common = DEFAULT_SKILL_WEIGHT * len(found & self.base_skills)
+        skill: Dict[str, int] = {}
+        must_found: Dict[str, int] = {}
+        for s in found:
+            for job_id, delta, must in self.postings.get(s, ()):
+                skill[job_id] = skill.get(job_id, 0) + delta
+                must_found[job_id] = must_found.get(job_id, 0) + must
+
+        scored = [(self._total(j, common, skill[j], must_found[j]), j) for j in skill]
+        # best untouched jobs: the first k (in must-have order) not already scored
+        untouched = []
+        for j in self.by_must:
+            if len(untouched) >= k:
+                break
+            if j not in skill:
+                untouched.append((self._total(j, common, 0, 0), j))
+        ranked = sorted(scored + untouched, key=lambda t: (-t[0], t[1]))[:k]
+
+        out = []
+        for total, j in ranked:
+            p = self.jobs[j]
+            penalty = MUST_HAVE_PENALTY * (len(p.must_have) - must_found.get(j, 0))
+            out.append(
+                {
+                    "job_id": j,
+                    "title": p.title,
+                    "total_score": total,
+                    "base_score": self.base,
+                    "skill_score": common + skill.get(j, 0),
+                    "penalty": penalty,
+                    "missing_must_have": sorted(set(p.must_have) - found),
+                }
+            )
+        return out
+
+    def _total(self, job_id: str, common: int, skill: int, must_found: int) -> int:
+        n_must = len(self.jobs[job_id].must_have)
+        return self.base + common + skill - MUST_HAVE_PENALTY * (n_must - must_found)
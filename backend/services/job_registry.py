@@ -0,0 +1,198 @@
+# backend/services/job_registry.py
+"""
+Registry of jobs (the `jobs` table) with a precompiled scoring profile per job_id.
+
+Profiles are built once when the registry loads and rebuilt only for the job
+that changes on upsert/delete, so scoring a resume is a dict lookup with no
+file or database I/O. Unknown job_ids get the default profile built from
+assets/job_description.txt and skills_config.
+
+Active profiles also feed a JobIndex (skill -> jobs) used by POST /match.
+
+Profiles are sent to worker processes with each task; the compiled matcher is
+not pickled but re-fetched from the per-process matcher cache on arrival.
+"""
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.engine import Engine
+
+from backend.agents.scoring_agent import ScoringAgent
+from backend.config.skills_config import SKILL_WEIGHTS, MUST_HAVE_SKILLS, load_skill_taxonomy
+from backend.db import get_engine, jobs
+from backend.models.job import Job
+from backend.services.job_index import JobIndex
+from backend.services.skill_matcher import SkillMatcher, get_skill_matcher
+
+DEFAULT_JOB_DESC_PATH = Path(__file__).resolve().parent.parent / "assets" / "job_description.txt"
+DEFAULT_JOB_TITLE = "Backend Engineer"
+
+
+def _digest(obj: Any) -> str:
+    return hashlib.sha1(json.dumps(obj, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+class JobProfile:
+    """Lowercased description, weights, must-haves and compiled matcher for one job."""
+
+    def __init__(
+        self,
+        job_id: str,
+        title: str,
+        description: str,
+        weights: Dict[str, int],
+        must_have: List[str],
+        taxonomy: Dict[str, List[str]],
+        version: int = 0,
+        status: str = "active",
+    ) -> None:
+        self.job_id = job_id
+        self.title = title
+        self.status = status
+        self.description = description.lower()
+        self.weights = {k.lower(): int(v) for k, v in weights.items()}
+        self.must_have = [s.lower() for s in must_have]
+        self.version = version
+        # job-specific skills outside the shared taxonomy match on their own name
+        self.taxonomy = dict(taxonomy)
+        for skill in list(self.weights) + self.must_have:
+            self.taxonomy.setdefault(skill, [skill])
+        self.matcher: SkillMatcher = get_skill_matcher(self.taxonomy)
+        # "<taxonomy>:<weights+must-haves>" digest stored with each scored candidate;
+        # a mismatch means the candidate's score (or its found skills) is stale
+        self.taxonomy_version = _digest(self.taxonomy)
+        self.fingerprint = f"{self.taxonomy_version}:{_digest([self.weights, sorted(self.must_have)])}"
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state.pop("matcher")
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.matcher = get_skill_matcher(self.taxonomy)
+
+    def scoring_agent(self) -> ScoringAgent:
+        return ScoringAgent(self.description, matcher=self.matcher, weights=self.weights, must_have=self.must_have)
+
+
+class JobRegistry:
+    """Job CRUD on the `jobs` table plus an in-memory job_id -> JobProfile map."""
+
+    def __init__(self, engine: Optional[Engine] = None, default_desc_path: Path = DEFAULT_JOB_DESC_PATH) -> None:
+        self.engine = engine or get_engine()
+        jobs.create(self.engine, checkfirst=True)
+        self._lock = threading.Lock()
+        self._taxonomy = load_skill_taxonomy()
+        try:
+            default_desc = default_desc_path.read_text(encoding="utf-8")
+        except OSError:
+            print(f"[WARN] Job description not found at {default_desc_path}; default profile has no description")
+            default_desc = ""
+        self.default = JobProfile("", DEFAULT_JOB_TITLE, default_desc, SKILL_WEIGHTS, MUST_HAVE_SKILLS, self._taxonomy)
+        self._profiles: Dict[str, JobProfile] = {}
+        self.reload()
+
+    def _profile(self, row: Dict[str, Any]) -> JobProfile:
+        weights = row["skill_weights"] if row["skill_weights"] is not None else SKILL_WEIGHTS
+        must_have = row["must_have_skills"] if row["must_have_skills"] is not None else MUST_HAVE_SKILLS
+        return JobProfile(
+            row["job_id"],
+            row["title"],
+            row["description"] or "",
+            weights,
+            must_have,
+            self._taxonomy,
+            row["version"] or 0,
+            row["status"] or "active",
+        )
+
+    def _swap(self, profiles: Dict[str, JobProfile]) -> None:
+        # callers hold self._lock; readers see either the old or the new map + index
+        self._profiles = profiles
+        self.index = JobIndex((p for p in profiles.values() if p.status == "active"), self._taxonomy)
+
+    def reload(self) -> None:
+        """Rebuild every profile from the database (e.g. after edits made by another process)."""
+        with self.engine.connect() as conn:
+            rows = [dict(r._mapping) for r in conn.execute(select(jobs))]
+        profiles = {r["job_id"]: self._profile(r) for r in rows}
+        with self._lock:
+            self._swap(profiles)
+
+    # -------------------------
+    # Lookup (no I/O)
+    # -------------------------
+    def get(self, job_id: str) -> JobProfile:
+        """Profile for job_id, or the default profile for unregistered jobs."""
+        return self._profiles.get(job_id, self.default)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._profiles
+
+    def match(self, text: str, k: int = 10) -> List[Dict[str, Any]]:
+        """Top-k active jobs for a resume text (see JobIndex)."""
+        return self.index.match_text(text, k)
+
+    # -------------------------
+    # CRUD
+    # -------------------------
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        with self.engine.connect() as conn:
+            return [dict(r._mapping) for r in conn.execute(select(jobs).order_by(jobs.c.id))]
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self.engine.connect() as conn:
+            row = conn.execute(select(jobs).where(jobs.c.job_id == job_id)).first()
+        return dict(row._mapping) if row is not None else None
+
+    def upsert(self, job: Job) -> Dict[str, Any]:
+        """Create or replace a job and hot-swap its compiled profile. Returns the stored row."""
+        if not job.job_id:
+            raise ValueError("job_id is required")
+        values = job.model_dump()
+        if values["skill_weights"] is not None:
+            values["skill_weights"] = {k.lower(): v for k, v in values["skill_weights"].items()}
+        if values["must_have_skills"] is not None:
+            values["must_have_skills"] = [s.lower() for s in values["must_have_skills"]]
+        values["updated_at"] = time.time()
+
+        with self._lock:
+            with self.engine.begin() as conn:
+                old = conn.execute(select(jobs.c.version).where(jobs.c.job_id == job.job_id)).first()
+                if old is None:
+                    conn.execute(insert(jobs).values(version=1, **values))
+                else:
+                    conn.execute(
+                        update(jobs).where(jobs.c.job_id == job.job_id).values(version=(old[0] or 0) + 1, **values)
+                    )
+                row = dict(conn.execute(select(jobs).where(jobs.c.job_id == job.job_id)).first()._mapping)
+            # copy-on-write so lock-free readers always see a complete map
+            self._swap({**self._profiles, job.job_id: self._profile(row)})
+        return row
+
+    def delete(self, job_id: str) -> bool:
+        with self._lock:
+            with self.engine.begin() as conn:
+                removed = conn.execute(delete(jobs).where(jobs.c.job_id == job_id)).rowcount
+            if job_id in self._profiles:
+                self._swap({k: v for k, v in self._profiles.items() if k != job_id})
+        return bool(removed)
+
+
+_registry: Optional[JobRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_job_registry() -> JobRegistry:
+    """Process-wide job registry (loaded on first use)."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = JobRegistry()
+        return _registry
@@ -0,0 +1,282 @@
+# backend/services/llm_client.py
+"""
+Async client for LLM resume scoring against an OpenAI-compatible chat API.
+
+One client per process owns a private event loop on a daemon thread, a pooled
+httpx.AsyncClient and a semaphore capping in-flight requests. ScoringAgent
+calls from any thread of the process submit work to that loop, so they share
+the connection pool and concurrency limit. The limit is per process, so the API
+keeps LLM calls out of its worker processes: workers rule-score, and the API
+process re-scores their texts through its own client (see
+recruitgenie_app.ai_score_results). Requests are retried with exponential backoff
+on timeouts, 429 and 5xx. Several resumes can share one prompt (batch_size).
+Point OPENAI_BASE_URL at a local stub server to test without the real API
+(see backend/tests/test_llm_client.py).
+
+Successful scores are memoized on disk, keyed by the normalized resume text,
+job description, model and PROMPT_VERSION, so re-uploads and re-screens skip
+the model round trip.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from backend.services.disk_cache import DiskCache
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+LLM_MODEL = os.getenv("RECRUITGENIE_LLM_MODEL", "gpt-4o-mini")
+# In-flight requests per process (the API's workers do not call the LLM, see above)
+LLM_CONCURRENCY = int(os.getenv("RECRUITGENIE_LLM_CONCURRENCY", "8"))
+LLM_TIMEOUT = float(os.getenv("RECRUITGENIE_LLM_TIMEOUT", "30"))
+LLM_RETRIES = int(os.getenv("RECRUITGENIE_LLM_RETRIES", "3"))
+LLM_BATCH_SIZE = int(os.getenv("RECRUITGENIE_LLM_BATCH_SIZE", "1"))
+
+LLM_CACHE_PATH = Path(__file__).resolve().parent.parent / "assets" / "cache" / "llm_scores.sqlite"
+LLM_CACHE_MB = int(os.getenv("RECRUITGENIE_LLM_CACHE_MB", "64"))
+LLM_CACHE_TTL = float(os.getenv("RECRUITGENIE_LLM_CACHE_TTL", str(30 * 24 * 3600)))
+
+# Bump when the prompt or the expected response shape changes.
+PROMPT_VERSION = "1"
+
+SCORE_KEYS = ("base_score", "skill_score", "penalty", "total_score", "missing_skills", "found_skills")
+
+SYSTEM_PROMPT = "You are an expert recruiter scorer."
+
+PROMPT_TEMPLATE = """
+You are an assistant that reads resume texts and a job description and returns a JSON array with
+one object per resume, in the same order:
+[{{"index":int,"base_score":int,"skill_score":int,"penalty":int,"total_score":int,"missing_skills":[...],"found_skills":[...]}}]
+
+Job description:
+{job_desc}
+
+{resumes}
+"""
+
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """Raised when a completion still fails after all retries."""
+
+
+_llm_cache: Optional[DiskCache] = None
+
+
+def get_llm_cache() -> Optional[DiskCache]:
+    """Shared scoring-result cache for this process, or None when disabled (budget 0)."""
+    global _llm_cache
+    if _llm_cache is None and LLM_CACHE_MB > 0:
+        _llm_cache = DiskCache(LLM_CACHE_PATH, max_bytes=LLM_CACHE_MB * 1024 * 1024, ttl=LLM_CACHE_TTL or None)
+    return _llm_cache
+
+
+def prompt_tag(model: str, prompt_version: str = PROMPT_VERSION) -> str:
+    """Cache tag shared by every score produced by one model + prompt version."""
+    return f"{model}:{prompt_version}"
+
+
+def score_cache_key(text: str, job_desc: str, model: str, prompt_version: str = PROMPT_VERSION) -> str:
+    """SHA-256 over whitespace-normalized resume text, job description, model and prompt version."""
+    parts = (" ".join(text.split()), " ".join(job_desc.split()), model, prompt_version)
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def build_prompt(job_desc: str, texts: List[str]) -> str:
+    resumes = "\n\n".join(f"Resume {i}:\n{t}" for i, t in enumerate(texts))
+    return PROMPT_TEMPLATE.format(job_desc=job_desc, resumes=resumes)
+
+
+def _valid_score(obj: Any) -> Optional[Dict[str, Any]]:
+    """Coerce one model answer into a score dict, or None if it is unusable."""
+    if not isinstance(obj, dict) or any(k not in obj for k in SCORE_KEYS):
+        return None
+    try:
+        score = {k: int(obj[k]) for k in ("base_score", "skill_score", "penalty", "total_score")}
+    except (TypeError, ValueError):
+        return None
+    score["missing_skills"] = [str(s) for s in obj.get("missing_skills") or []]
+    score["found_skills"] = [str(s) for s in obj.get("found_skills") or []]
+    return score
+
+
+def parse_scores(content: str, n: int) -> List[Optional[Dict[str, Any]]]:
+    """Parse a completion into n score dicts (None where the model's answer is missing or malformed)."""
+    out: List[Optional[Dict[str, Any]]] = [None] * n
+    m = re.search(r"\[.*\]", content, re.S)
+    try:
+        items = json.loads(m.group(0)) if m else [json.loads(re.search(r"\{.*\}", content, re.S).group(0))]
+    except Exception:
+        return out
+    for pos, item in enumerate(items if isinstance(items, list) else []):
+        idx = item.get("index", pos) if isinstance(item, dict) else pos
+        if isinstance(idx, int) and 0 <= idx < n:
+            out[idx] = _valid_score(item)
+    return out
+
+
+class LLMScoringClient:
+    """Pooled, concurrency-limited async scoring client running on its own event loop."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = OPENAI_API_KEY,
+        base_url: str = OPENAI_BASE_URL,
+        model: str = LLM_MODEL,
+        concurrency: int = LLM_CONCURRENCY,
+        timeout: float = LLM_TIMEOUT,
+        retries: int = LLM_RETRIES,
+        batch_size: int = LLM_BATCH_SIZE,
+        backoff: float = 0.5,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[DiskCache] = None,
+        use_cache: bool = True,
+    ) -> None:
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.retries = retries
+        self.batch_size = max(1, batch_size)
+        self.backoff = backoff
+        self._transport = transport
+        self.cache = (cache or get_llm_cache()) if use_cache else None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._start_lock = threading.Lock()
+
+    # -------------------------
+    # Event loop / pool
+    # -------------------------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-client-loop", daemon=True).start()
+                asyncio.run_coroutine_threadsafe(self._setup(), loop).result()
+                self._loop = loop
+        return self._loop
+
+    async def _setup(self) -> None:
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            transport=self._transport,
+        )
+        self._sem = asyncio.Semaphore(self.concurrency)
+
+    def close(self) -> None:
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+    # -------------------------
+    # Requests
+    # -------------------------
+    async def _complete(self, prompt: str, max_tokens: int) -> str:
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+        }
+        last: Optional[Exception] = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff * (2 ** (attempt - 1)) * (1 + random.random()))
+            try:
+                async with self._sem:
+                    resp = await self._client.post("/chat/completions", json=payload)
+                if resp.status_code in RETRY_STATUS:
+                    last = LLMError(f"HTTP {resp.status_code}")
+                    continue
+                resp.raise_for_status()
+                return resp.json()["choices"][0]["message"]["content"]
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                last = e
+            except (httpx.HTTPStatusError, KeyError, IndexError, ValueError) as e:
+                raise LLMError(str(e)) from e
+        raise LLMError(f"completion failed after {self.retries + 1} attempts: {last}")
+
+    async def _score_chunk(self, job_desc: str, texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+        try:
+            content = await self._complete(build_prompt(job_desc, texts), max_tokens=300 * len(texts))
+        except LLMError as e:
+            print(f"[WARN] LLM scoring failed, falling back to rule scoring: {e}")
+            return [None] * len(texts)
+        return parse_scores(content, len(texts))
+
+    async def _score_many(self, job_desc: str, texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+        keys = [score_cache_key(t, job_desc, self.model) for t in texts]
+        out: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        if self.cache is not None:
+            out = await asyncio.to_thread(self._cache_get, keys)
+
+        # one model call per distinct uncached text
+        todo: Dict[str, int] = {}
+        for i, key in enumerate(keys):
+            if out[i] is None:
+                todo.setdefault(key, i)
+        pending = [texts[i] for i in todo.values()]
+        chunks = [pending[i: i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        results = await asyncio.gather(*(self._score_chunk(job_desc, c) for c in chunks))
+        fresh = dict(zip(todo, (s for chunk in results for s in chunk)))
+
+        if self.cache is not None and fresh:
+            await asyncio.to_thread(self._cache_set, {k: v for k, v in fresh.items() if v is not None})
+        return [out[i] if out[i] is not None else fresh.get(key) for i, key in enumerate(keys)]
+
+    # -------------------------
+    # Result cache
+    # -------------------------
+    def _cache_get(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        return [self.cache.get(k) for k in keys]
+
+    def _cache_set(self, scores: Dict[str, Dict[str, Any]]) -> None:
+        tag = prompt_tag(self.model)
+        for key, score in scores.items():
+            self.cache.set(key, score, tag=tag)
+
+    def invalidate_cache(self, prompt_version: Optional[str] = None) -> int:
+        """
+        Drop cached scores for this model at prompt_version, or -- when None -- every
+        score not produced by the current model + PROMPT_VERSION. Returns entries removed.
+        """
+        if self.cache is None:
+            return 0
+        if prompt_version is None:
+            return self.cache.invalidate(keep_tag=prompt_tag(self.model))
+        return self.cache.invalidate(tag=prompt_tag(self.model, prompt_version))
+
+    def score_many(self, job_desc: str, texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Blocking: score texts concurrently. None marks resumes the model could not score."""
+        if not texts:
+            return []
+        return asyncio.run_coroutine_threadsafe(self._score_many(job_desc, texts), self._ensure_loop()).result()
+
+
+_client: Optional[LLMScoringClient] = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMScoringClient:
+    """Process-wide scoring client (created on first use)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = LLMScoringClient()
+        return _client
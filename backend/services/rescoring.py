@@ -0,0 +1,185 @@
+# backend/services/rescoring.py
+"""
+Incremental re-scoring of stored candidates after a job's weights, must-haves
+or skill taxonomy change.
+
+Each scored record keeps its found_skills, resume sha256 and the profile
+fingerprint it was scored with ("<taxonomy>:<weights>"). Re-scoring only
+touches records whose fingerprint differs from the job's current profile:
+
+- same taxonomy: scores are recomputed from the stored found_skills alone;
+- new taxonomy (or no stored features): skills are re-matched from the
+  extracted text in the extraction cache, or the saved resume as a last resort.
+
+Work is split into chunks that run in parallel on the worker pool, and each
+finished chunk is written back with one CandidateStore.update_many call.
+Re-scoring is rule-based, like ScoringAgent without OPENAI_API_KEY.
+
+Command line (stop the API first: the store has a single writer):
+
+    python -m backend.services.rescoring --job-id JOB-001 [--force] [--backend jsonl|sqlite]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.agents.resume_agent import ResumeAgent, extraction_cache_key_for, get_extraction_cache
+from backend.services.batch_scoring import BatchScorer
+from backend.services.job_registry import JobProfile
+from backend.services.worker_pool import UploadWorkerPool
+from backend.storage.candidate_store import CandidateStore
+from backend.storage.fields import split_skills
+
+RESCORE_CHUNK = 500
+
+RESUMES_DIR = Path(__file__).resolve().parent.parent / "assets" / "resumes"
+
+# stored fields a chunk needs to recompute one candidate
+_INPUT_FIELDS = ("found_skills", "profile_version", "sha256", "saved_filename")
+
+
+def _stored_text(row: Dict[str, str], resumes_dir: Path) -> Optional[Tuple[str, str]]:
+    """(text, sha256) from the extraction cache, else by re-extracting the saved resume."""
+    filename = row.get("saved_filename", "")
+    cache = get_extraction_cache()
+    if cache is not None and row.get("sha256") and filename:
+        cached = cache.get(extraction_cache_key_for(row["sha256"], Path(filename).suffix))
+        if cached is not None:
+            return cached.get("text", ""), row["sha256"]
+    path = resumes_dir / Path(filename).name if filename else None
+    if path is None or not path.is_file():
+        return None
+    data = ResumeAgent(path).run()
+    return data.get("text", ""), data.get("sha256", "")
+
+
+def rescore_chunk(
+    profile: JobProfile, items: List[Tuple[int, Dict[str, str]]], resumes_dir: str = str(RESUMES_DIR)
+) -> Tuple[Dict[int, Dict[str, Any]], List[int]]:
+    """
+    Recompute scores for (id, stored inputs) pairs. Safe to run in a worker process.
+    Returns (id -> changed fields, ids skipped because no text or features were available).
+    """
+    scorer = BatchScorer(profile.matcher, profile.weights, profile.must_have)
+    ids: List[int] = []
+    features: List[List[int]] = []
+    extra: Dict[int, Dict[str, str]] = {}
+    skipped: List[int] = []
+    for cid, row in items:
+        version = row.get("profile_version", "")
+        if version and version.split(":", 1)[0] == profile.taxonomy_version:
+            found = scorer.skills_to_indices(split_skills(row.get("found_skills", "")))
+        else:
+            stored = _stored_text(row, Path(resumes_dir))
+            if stored is None:
+                skipped.append(cid)
+                continue
+            found = sorted(profile.matcher.find_indices(stored[0]))
+            if stored[1]:
+                extra[cid] = {"sha256": stored[1]}
+        ids.append(cid)
+        features.append(found)
+
+    updates: Dict[int, Dict[str, Any]] = {}
+    if not ids:
+        return updates, skipped
+    indptr, indices = scorer.features_to_csr(features)
+    arrays = scorer.score_csr(indptr, indices)
+    for i, cid in enumerate(ids):
+        updates[cid] = {
+            "total_score": int(arrays["total_score"][i]),
+            "base_score": int(arrays["base_score"][i]),
+            "skill_score": int(arrays["skill_score"][i]),
+            "penalty": int(arrays["penalty"][i]),
+            "found_skills": " | ".join(scorer.skills[j] for j in features[i]),
+            "missing_skills": " | ".join(scorer.missing_skills(features[i])),
+            "profile_version": profile.fingerprint,
+            **extra.get(cid, {}),
+        }
+    return updates, skipped
+
+
+def stale_candidates(
+    store: CandidateStore, profile: JobProfile, job_id: str, force: bool = False
+) -> Tuple[int, List[Tuple[int, Dict[str, str]]]]:
+    """(candidates checked, [(id, inputs)] for those not scored with profile's fingerprint)."""
+    ids = store.ids(job_id=job_id)
+    todo = []
+    for cid, row in store.scan(ids):
+        if force or row.get("profile_version") != profile.fingerprint:
+            todo.append((cid, {f: row.get(f, "") for f in _INPUT_FIELDS}))
+    return len(ids), todo
+
+
+def rescore_job(
+    store: CandidateStore,
+    profile: JobProfile,
+    job_id: str,
+    pool: Optional[UploadWorkerPool] = None,
+    force: bool = False,
+    chunk_size: int = RESCORE_CHUNK,
+    resumes_dir: Path = RESUMES_DIR,
+) -> Dict[str, Any]:
+    """
+    Re-score every stale candidate of job_id with profile, in parallel chunks on pool
+    (inline when pool is None). Blocks until all chunks are written back.
+    """
+    started = time.perf_counter()
+    checked, todo = stale_candidates(store, profile, job_id, force)
+    chunks = [todo[i: i + chunk_size] for i in range(0, len(todo), chunk_size)]
+    rescored = 0
+    skipped: List[int] = []
+
+    def write_back(outcome: Tuple[Dict[int, Dict[str, Any]], List[int]]) -> None:
+        nonlocal rescored
+        updates, missing = outcome
+        if updates:
+            store.update_many(updates)
+        rescored += len(updates)
+        skipped.extend(missing)
+
+    if pool is None:
+        for c in chunks:
+            write_back(rescore_chunk(profile, c, str(resumes_dir)))
+    else:
+        futures = pool.submit_many(rescore_chunk, [(profile, c, str(resumes_dir)) for c in chunks])
+        for f in as_completed(futures):
+            write_back(f.result())
+
+    return {
+        "job_id": job_id,
+        "profile_version": profile.fingerprint,
+        "checked": checked,
+        "rescored": rescored,
+        "skipped": len(skipped),
+        "skipped_ids": sorted(skipped)[:100],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def main() -> None:
+    from backend.services.csv_transfer import _open_store
+    from backend.services.job_registry import get_job_registry
+
+    parser = argparse.ArgumentParser(description="Re-score stored candidates of a job with its current profile.")
+    parser.add_argument("--job-id", required=True)
+    parser.add_argument("--backend", choices=("jsonl", "sqlite"), default=os.getenv("RECRUITGENIE_STORE", "jsonl").lower())
+    parser.add_argument("--store", default=str(Path(__file__).resolve().parent.parent / "assets" / "candidate_store"))
+    parser.add_argument("--force", action="store_true", help="re-score every candidate, not only stale ones")
+    parser.add_argument("--chunk-size", type=int, default=RESCORE_CHUNK)
+    args = parser.parse_args()
+
+    store = _open_store(args.backend, Path(args.store))
+    pool = UploadWorkerPool()
+    try:
+        print(rescore_job(store, get_job_registry().get(args.job_id), args.job_id, pool, args.force, args.chunk_size))
+    finally:
+        pool.shutdown()
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
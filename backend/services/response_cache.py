@@ -0,0 +1,59 @@
+# backend/services/response_cache.py
+"""
+In-process LRU cache of rendered read responses.
+
+Keys include the candidate store version the response was built from, so an
+entry can never be served after a write; the API also clears the cache on
+every store write so superseded entries do not sit in memory.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+class ResponseCache:
+    """Key -> response body bytes, evicting least recently used entries past either budget."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Hashable, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = body
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,112 @@
+# backend/services/skill_matcher.py
+"""
+Aho-Corasick matcher that finds every taxonomy skill in a resume in one pass.
+
+Phrases only match on token boundaries ("api" does not match inside "rapid"),
+case-insensitively, and runs of whitespace in the text match a single space in
+a phrase ("rest\n api" matches "rest api"). Build once per taxonomy with
+get_skill_matcher(); the compiled automaton is shared by every ScoringAgent.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.config.skills_config import load_skill_taxonomy
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class SkillMatcher:
+    """Compiled multi-pattern matcher over {canonical skill: [phrases]}."""
+
+    def __init__(self, taxonomy: Dict[str, Iterable[str]]) -> None:
+        self.skills: List[str] = list(taxonomy)
+        # goto[state] = {char: next state}
+        # out[state] = [(skill index, phrase length, boundary needed before, boundary needed after)]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int, bool, bool]]] = [[]]
+        for idx, skill in enumerate(self.skills):
+            for phrase in set(taxonomy[skill] or [skill]):
+                self._add(idx, " ".join(phrase.lower().split()))
+        self._build()
+
+    def _add(self, idx: int, phrase: str) -> None:
+        if not phrase:
+            return
+        state = 0
+        for ch in phrase:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((idx, len(phrase), _is_word(phrase[0]), _is_word(phrase[-1])))
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Set[str]:
+        """Return the canonical skills that occur in text."""
+        return {self.skills[i] for i in self.find_indices(text)}
+
+    def find_indices(self, text: str) -> Set[int]:
+        """Return taxonomy indices (positions in self.skills) of skills that occur in text."""
+        # normalized text: lowercase with whitespace runs collapsed to one space
+        norm: List[str] = []
+        prev_space = True
+        for ch in text.lower():
+            if ch.isspace():
+                if not prev_space:
+                    norm.append(" ")
+                prev_space = True
+            else:
+                norm.append(ch)
+                prev_space = False
+
+        goto, fail, out = self._goto, self._fail, self._out
+        n = len(norm)
+        found: Set[int] = set()
+        state = 0
+        for pos, ch in enumerate(norm):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for idx, length, word_start, word_end in out[state]:
+                if idx in found:
+                    continue
+                start = pos - length + 1
+                if word_start and start > 0 and _is_word(norm[start - 1]):
+                    continue
+                if word_end and pos + 1 < n and _is_word(norm[pos + 1]):
+                    continue
+                found.add(idx)
+        return found
+
+
+_matchers: Dict[Tuple, SkillMatcher] = {}
+
+
+def get_skill_matcher(taxonomy: Optional[Dict[str, Iterable[str]]] = None) -> SkillMatcher:
+    """Return the shared matcher for taxonomy (default: skills_config), compiling it on first use."""
+    taxonomy = taxonomy if taxonomy is not None else load_skill_taxonomy()
+    key = tuple((skill, tuple(sorted(set(phrases)))) for skill, phrases in taxonomy.items())
+    matcher = _matchers.get(key)
+    if matcher is None:
+        matcher = _matchers[key] = SkillMatcher(taxonomy)
+    return matcher
@@ -0,0 +1,209 @@
+# backend/services/worker_pool.py
+"""
+Bounded process pool for resume processing, with task status tracking.
+
+Uploads only persist the file and submit a task here; parsing and scoring run
+in worker processes so they never block the API event loop. Tasks are kept in
+memory (most recent MAX_TASKS) so GET /jobs/{task_id} can report their state.
+Completion hooks (storing the result) run on a few pool-owned callback threads,
+never on the thread that submitted the task.
+"""
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_WORKERS = int(os.getenv("RECRUITGENIE_WORKERS", "0")) or (os.cpu_count() or 1)
+DEFAULT_MAX_PENDING = int(os.getenv("RECRUITGENIE_MAX_PENDING", "1000"))
+MAX_TASKS = 10000
+# threads running on_done hooks (store writes, LLM re-scoring of single uploads)
+CALLBACK_THREADS = 4
+
+
+class QueueFull(Exception):
+    """Raised when the pool already has max_pending tasks waiting or running."""
+
+
+class UploadWorkerPool:
+    """Runs functions on a process pool and tracks each submission as a task."""
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_MAX_PENDING) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._callbacks: Optional[ThreadPoolExecutor] = None
+        self._tasks: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: the API process runs threads (store compactor), which fork does not copy safely
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _get_callbacks(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._callbacks is None:
+                self._callbacks = ThreadPoolExecutor(max_workers=CALLBACK_THREADS, thread_name_prefix="upload-done")
+            return self._callbacks
+
+    def _replace_broken(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Drop executor after a worker died (e.g. OOM on a huge PDF); the next submit
+        starts a fresh pool. A no-op if it was already replaced.
+        """
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        # not inline: done callbacks run on the broken pool's own management thread
+        threading.Thread(target=executor.shutdown, kwargs={"wait": False, "cancel_futures": True}, daemon=True).start()
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_done: Optional[Callable[[Any], Any]] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Queue fn(*args) on a worker process and return its task id.
+        on_done runs in the parent, on a callback thread, with the worker's return
+        value; whatever it returns becomes the task result (e.g. the result annotated
+        with a stored id).
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFull(f"{self._pending} tasks already pending")
+            self._pending += 1
+            task_id = uuid.uuid4().hex
+            task = {"task_id": task_id, "status": "queued", "submitted_at": time.time(), "finished_at": None}
+            if meta:
+                task.update(meta)
+            self._tasks[task_id] = task
+            self._evict()
+        try:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                self._replace_broken(executor)
+                executor = self._get_executor()
+                future = executor.submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+                self._tasks.pop(task_id, None)
+            raise
+        task["_future"] = future
+        # a future that is already done runs its callback right here (e.g. on the event
+        # loop), so completion is always handed to the callback threads
+        callbacks = self._get_callbacks()
+        future.add_done_callback(lambda f: callbacks.submit(self._finish, task, f, on_done, executor))
+        return task_id
+
+    def submit_many(self, fn: Callable[..., Any], arg_list: List[Tuple[Any, ...]]) -> List[Future]:
+        """
+        Queue fn(*args) for every args tuple and return the raw futures (no task tracking).
+        Used by batch uploads, which wait for all results in the request itself.
+        """
+        with self._lock:
+            if self._pending + len(arg_list) > self.max_pending:
+                raise QueueFull(f"{self._pending} tasks already pending, batch of {len(arg_list)} does not fit")
+            self._pending += len(arg_list)
+        futures: List[Future] = []
+        executor = self._get_executor()
+        try:
+            try:
+                for args in arg_list:
+                    futures.append(executor.submit(fn, *args))
+            except BrokenProcessPool:
+                self._replace_broken(executor)
+                executor = self._get_executor()
+                for args in arg_list[len(futures):]:
+                    futures.append(executor.submit(fn, *args))
+        finally:
+            with self._lock:
+                self._pending -= len(arg_list) - len(futures)
+        for f in futures:
+            f.add_done_callback(lambda f, ex=executor: self._release(f, ex))
+        return futures
+
+    def _release(self, future: Future, executor: ProcessPoolExecutor) -> None:
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self._replace_broken(executor)
+        with self._lock:
+            self._pending -= 1
+
+    def _finish(
+        self,
+        task: Dict[str, Any],
+        future: Future,
+        on_done: Optional[Callable[[Any], Any]],
+        executor: ProcessPoolExecutor,
+    ) -> None:
+        try:
+            result = future.result()
+            if on_done is not None:
+                result = on_done(result)
+            task["result"] = result
+            task["status"] = "done"
+        except (Exception, CancelledError) as e:
+            if isinstance(e, BrokenProcessPool):
+                self._replace_broken(executor)
+            print(f"[ERROR] task {task['task_id']} failed: {e}")
+            traceback.print_exc()
+            task["error"] = str(e)
+            task["status"] = "error"
+        finally:
+            task["finished_at"] = time.time()
+            task.pop("_future", None)
+            with self._lock:
+                self._pending -= 1
+
+    def _evict(self) -> None:
+        """Drop the oldest finished tasks once more than MAX_TASKS are tracked."""
+        if len(self._tasks) <= MAX_TASKS:
+            return
+        for task_id in list(self._tasks):
+            if len(self._tasks) <= MAX_TASKS:
+                break
+            if self._tasks[task_id]["finished_at"] is not None:
+                del self._tasks[task_id]
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Return a JSON-safe snapshot of a task, or None if unknown."""
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return None
+            snap = {k: v for k, v in task.items() if not k.startswith("_")}
+            future = task.get("_future")
+        if snap["status"] == "queued" and future is not None and future.running():
+            snap["status"] = "running"
+        return snap
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"workers": self.max_workers, "pending": self._pending, "tracked": len(self._tasks)}
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        # after the workers: their last results still get stored
+        with self._lock:
+            callbacks, self._callbacks = self._callbacks, None
+        if callbacks is not None:
+            callbacks.shutdown(wait=wait)
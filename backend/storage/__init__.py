@@ -0,0 +1,20 @@
+# backend/storage/__init__.py
+
+from .candidate_store import CandidateStore, CANDIDATE_FIELDS
+from .candidate_columns import CandidateColumns
+from .candidate_aggregates import CandidateAggregates
+from .bitmaps import RoaringBitmap
+from .skill_index import SkillIndex, parse_skill_filter
+from .sorted_index import SortedIndex, SORT_FIELDS
+
+__all__ = [
+    "CandidateStore",
+    "CANDIDATE_FIELDS",
+    "CandidateColumns",
+    "CandidateAggregates",
+    "RoaringBitmap",
+    "SkillIndex",
+    "parse_skill_filter",
+    "SortedIndex",
+    "SORT_FIELDS",
+]
@@ -0,0 +1,191 @@
+# backend/storage/bitmaps.py
+"""
+Roaring-style compressed bitmap of candidate ids (uint32).
+
+Ids are split by their high 16 bits into chunks. A chunk with few members is a
+sorted uint16 array, a dense one (ARRAY_MAX members or more) a 65536-bit
+bitmap of 1024 uint64 words, so set operations touch only the chunks both
+sides share and run vectorized inside each chunk.
+"""
+from typing import Dict, Iterable, Iterator, Optional
+
+import numpy as np
+
+ARRAY_MAX = 4096
+WORDS = 1024  # 65536 bits per chunk
+
+_BIT = np.uint64(1)
+
+
+def _to_bitmap(c: np.ndarray) -> np.ndarray:
+    if c.dtype == np.uint64:
+        return c
+    words = np.zeros(WORDS, dtype=np.uint64)
+    low = c.astype(np.uint64)
+    np.bitwise_or.at(words, (low >> np.uint64(6)).astype(np.int64), _BIT << (low & np.uint64(63)))
+    return words
+
+
+def _to_array(words: np.ndarray) -> np.ndarray:
+    bits = np.unpackbits(words.view(np.uint8), bitorder="little")
+    return np.flatnonzero(bits).astype(np.uint16)
+
+
+def _cardinality(c: np.ndarray) -> int:
+    if c.dtype != np.uint64:
+        return len(c)
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return int(np.bitwise_count(c).sum())
+    return int(np.unpackbits(c.view(np.uint8)).sum())
+
+
+def _normalized(c: np.ndarray) -> Optional[np.ndarray]:
+    """Best representation of a chunk, or None if it is empty."""
+    n = _cardinality(c)
+    if n == 0:
+        return None
+    if c.dtype == np.uint64 and n < ARRAY_MAX:
+        return _to_array(c)
+    if c.dtype == np.uint16 and n >= ARRAY_MAX:
+        return _to_bitmap(c)
+    return c
+
+
+class RoaringBitmap:
+    """Set of uint32 ids with fast AND / OR / AND NOT."""
+
+    def __init__(self, chunks: Optional[Dict[int, np.ndarray]] = None) -> None:
+        self._chunks: Dict[int, np.ndarray] = chunks or {}
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> "RoaringBitmap":
+        arr = np.unique(np.asarray(ids if isinstance(ids, np.ndarray) else list(ids), dtype=np.uint32))
+        bm = cls()
+        if not len(arr):
+            return bm
+        high = arr >> 16
+        starts = np.flatnonzero(np.r_[True, high[1:] != high[:-1]])
+        for lo, hi in zip(starts, np.r_[starts[1:], len(arr)]):
+            c = _normalized((arr[lo:hi] & 0xFFFF).astype(np.uint16))
+            if c is not None:
+                bm._chunks[int(high[lo])] = c
+        return bm
+
+    @classmethod
+    def range(cls, start: int, stop: int) -> "RoaringBitmap":
+        """Every id in [start, stop)."""
+        return cls.from_ids(np.arange(start, stop, dtype=np.uint32))
+
+    # -------------------------
+    # Mutation
+    # -------------------------
+    def add_many(self, ids: Iterable[int]) -> None:
+        other = RoaringBitmap.from_ids(ids)
+        for key, c in other._chunks.items():
+            mine = self._chunks.get(key)
+            self._chunks[key] = c if mine is None else _normalized(self._or(mine, c))
+
+    def discard_many(self, ids: Iterable[int]) -> None:
+        other = RoaringBitmap.from_ids(ids)
+        for key, c in other._chunks.items():
+            mine = self._chunks.get(key)
+            if mine is None:
+                continue
+            left = _normalized(self._andnot(mine, c))
+            if left is None:
+                del self._chunks[key]
+            else:
+                self._chunks[key] = left
+
+    def add(self, cid: int) -> None:
+        self.add_many([cid])
+
+    def discard(self, cid: int) -> None:
+        self.discard_many([cid])
+
+    # -------------------------
+    # Chunk operations
+    # -------------------------
+    @staticmethod
+    def _and(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        if a.dtype == np.uint16 and b.dtype == np.uint16:
+            return np.intersect1d(a, b, assume_unique=True)
+        if a.dtype == np.uint16 or b.dtype == np.uint16:
+            arr, words = (a, b) if a.dtype == np.uint16 else (b, a)
+            low = arr.astype(np.uint64)
+            hit = (words[(low >> np.uint64(6)).astype(np.int64)] >> (low & np.uint64(63))) & _BIT
+            return arr[hit.astype(bool)]
+        return a & b
+
+    @staticmethod
+    def _or(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        if a.dtype == np.uint16 and b.dtype == np.uint16 and len(a) + len(b) < ARRAY_MAX:
+            return np.union1d(a, b)
+        return _to_bitmap(a) | _to_bitmap(b)
+
+    @staticmethod
+    def _andnot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        if a.dtype == np.uint16:
+            return np.setdiff1d(a, RoaringBitmap._and(a, b), assume_unique=True)
+        return a & ~_to_bitmap(b)
+
+    # -------------------------
+    # Set algebra
+    # -------------------------
+    def __and__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        out = {}
+        small, big = (self, other) if len(self._chunks) <= len(other._chunks) else (other, self)
+        for key, c in small._chunks.items():
+            d = big._chunks.get(key)
+            if d is not None:
+                r = _normalized(self._and(c, d))
+                if r is not None:
+                    out[key] = r
+        return RoaringBitmap(out)
+
+    def __or__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        out = dict(self._chunks)
+        for key, c in other._chunks.items():
+            mine = out.get(key)
+            out[key] = c if mine is None else _normalized(self._or(mine, c))
+        return RoaringBitmap(out)
+
+    def __sub__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        out = {}
+        for key, c in self._chunks.items():
+            d = other._chunks.get(key)
+            r = c if d is None else _normalized(self._andnot(c, d))
+            if r is not None:
+                out[key] = r
+        return RoaringBitmap(out)
+
+    # -------------------------
+    # Inspection
+    # -------------------------
+    def __len__(self) -> int:
+        return sum(_cardinality(c) for c in self._chunks.values())
+
+    def __contains__(self, cid: int) -> bool:
+        c = self._chunks.get(cid >> 16)
+        if c is None:
+            return False
+        low = cid & 0xFFFF
+        if c.dtype == np.uint16:
+            i = int(np.searchsorted(c, low))
+            return i < len(c) and int(c[i]) == low
+        return bool((int(c[low >> 6]) >> (low & 63)) & 1)
+
+    def to_array(self) -> np.ndarray:
+        """Members in ascending order (uint32)."""
+        parts = []
+        for key in sorted(self._chunks):
+            c = self._chunks[key]
+            low = c if c.dtype == np.uint16 else _to_array(c)
+            parts.append(low.astype(np.uint32) | np.uint32(key << 16))
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint32)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.to_array().tolist())
+
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in self._chunks.values())
@@ -0,0 +1,226 @@
+# backend/storage/candidate_aggregates.py
+"""
+Running analytics aggregates over the candidate store, per job and overall.
+
+Each aggregate keeps the candidate count, the total_score sum, counts per
+status, total_score t-digests and heavy-hitter sketches of found and missing
+skills. A store listener updates them on every append and update using the
+old and new record, so a summary is a read of one aggregate whatever the
+number of candidates.
+
+t-digests cannot forget a value, so a score that changes (re-scoring) or
+leaves a job is added to a second "removed" digest and percentiles are taken
+from the difference of the two.
+
+State is snapshotted to ``aggregates.json`` at every store checkpoint,
+stamped with the store position it covers. On open, the writes made after
+that position are replayed (CandidateStore.changes_since); if they cannot be
+(a missing snapshot, or one from an older store generation) the aggregates
+are rebuilt once from a full scan.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.storage.candidate_store import CandidateStore
+from backend.storage.fields import split_skills, to_int
+from backend.storage.sketches import SpaceSaving, TDigest, quantile_of_difference
+
+REBUILD_CHUNK = 4096
+SKILL_FIELDS = ("found_skills", "missing_skills")
+
+
+# (total_score, status, (found skills, missing skills)) -- what an aggregate needs of a record
+_Facts = Tuple[int, str, Tuple[List[str], ...]]
+
+
+def _facts(row: Dict[str, str]) -> _Facts:
+    status = row.get("status", "").lower() or "unknown"
+    return to_int(row.get("total_score", "")), status, tuple(split_skills(row.get(f, "")) for f in SKILL_FIELDS)
+
+
+class _Aggregate:
+    """Counters and sketches for one group of candidates."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.score_sum = 0
+        self.status: Dict[str, int] = {}
+        self.scores = TDigest()
+        self.removed = TDigest()
+        self.skills = {f: SpaceSaving() for f in SKILL_FIELDS}
+
+    def add(self, facts: "_Facts", sign: int = 1) -> None:
+        """Count a record in (sign=1) or out (sign=-1) of the group."""
+        score, status, skills = facts
+        self.count += sign
+        self.score_sum += sign * score
+        left = self.status.get(status, 0) + sign
+        if left > 0:
+            self.status[status] = left
+        else:
+            self.status.pop(status, None)
+        (self.scores if sign > 0 else self.removed).add(score)
+        for f, names in zip(SKILL_FIELDS, skills):
+            sketch = self.skills[f]
+            for name in names:
+                if sign > 0:
+                    sketch.add(name)
+                else:
+                    sketch.remove(name)
+
+    def update(self, old: "_Facts", new: "_Facts") -> None:
+        """Apply a change to a record that stays in the group."""
+        if old[0] != new[0]:
+            self.score_sum += new[0] - old[0]
+            self.removed.add(old[0])
+            self.scores.add(new[0])
+        if old[1] != new[1]:
+            self.status[new[1]] = self.status.get(new[1], 0) + 1
+            if self.status.get(old[1], 0) > 1:
+                self.status[old[1]] -= 1
+            else:
+                self.status.pop(old[1], None)
+        for f, gone, came in zip(SKILL_FIELDS, old[2], new[2]):
+            if gone == came:
+                continue
+            for name in set(gone) - set(came):
+                self.skills[f].remove(name)
+            for name in set(came) - set(gone):
+                self.skills[f].add(name)
+
+    def summary(self, top: int) -> Dict[str, Any]:
+        if self.count <= 0:
+            return {
+                "total": 0,
+                "avg_score": 0.0,
+                "p50_score": None,
+                "p90_score": None,
+                "status_counts": {},
+                "top_missing_skills": [],
+                "top_found_skills": [],
+            }
+        p50 = quantile_of_difference(self.scores, self.removed, 0.5)
+        p90 = quantile_of_difference(self.scores, self.removed, 0.9)
+        return {
+            "total": self.count,
+            "avg_score": round(self.score_sum / self.count, 2),
+            "p50_score": round(p50, 2) if p50 is not None else None,
+            "p90_score": round(p90, 2) if p90 is not None else None,
+            "status_counts": dict(self.status),
+            "top_missing_skills": [{"skill": k, "count": v} for k, v in self.skills["missing_skills"].top(top)],
+            "top_found_skills": [{"skill": k, "count": v} for k, v in self.skills["found_skills"].top(top)],
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "score_sum": self.score_sum,
+            "status": self.status,
+            "scores": self.scores.to_dict(),
+            "removed": self.removed.to_dict(),
+            "skills": {f: s.to_dict() for f, s in self.skills.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "_Aggregate":
+        agg = cls()
+        agg.count = data["count"]
+        agg.score_sum = data["score_sum"]
+        agg.status = dict(data["status"])
+        agg.scores = TDigest.from_dict(data["scores"])
+        agg.removed = TDigest.from_dict(data["removed"])
+        agg.skills = {f: SpaceSaving.from_dict(data["skills"].get(f, {})) for f in SKILL_FIELDS}
+        return agg
+
+
+class CandidateAggregates:
+    """Per-job and overall running aggregates, kept current by a CandidateStore listener."""
+
+    def __init__(self, store: CandidateStore, root: Path) -> None:
+        self.store = store
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.path = self.root / "aggregates.json"
+        self._lock = threading.Lock()
+        self._all = _Aggregate()
+        self._jobs: Dict[str, _Aggregate] = {}
+        self._open()
+
+    def _open(self) -> None:
+        with self.store.locked():
+            snap = self._load_snapshot()
+            changes = self.store.changes_since(snap["position"]) if snap is not None else None
+            if changes is not None:
+                self._restore(snap)
+                self._apply(changes)
+            else:
+                ids = self.store.ids()
+                for start in range(0, len(ids), REBUILD_CHUNK):
+                    chunk = ids[start: start + REBUILD_CHUNK]
+                    self._apply([(cid, None, row) for cid, row in self.store.scan(chunk)])
+            self.store.subscribe(self._apply)
+            self.store.on_checkpoint(self.save)
+            if changes is None or changes:
+                self.save()
+
+    def _load_snapshot(self) -> Optional[Dict[str, Any]]:
+        if not self.path.exists():
+            return None
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"[WARN] ignoring unreadable analytics snapshot {self.path}: {e}")
+            return None
+
+    def _restore(self, snap: Dict[str, Any]) -> None:
+        self._all = _Aggregate.from_dict(snap["all"])
+        self._jobs = {j: _Aggregate.from_dict(d) for j, d in snap["jobs"].items()}
+
+    def _job(self, job_id: str) -> _Aggregate:
+        agg = self._jobs.get(job_id)
+        if agg is None:
+            agg = self._jobs[job_id] = _Aggregate()
+        return agg
+
+    def _apply(self, items: List[Tuple[int, Optional[Dict[str, str]], Dict[str, str]]]) -> None:
+        """Store listener: move each record's contribution from its old to its new version."""
+        with self._lock:
+            for _, old, new in items:
+                job = new.get("job_id", "")
+                facts = _facts(new)
+                if old is None:
+                    self._all.add(facts)
+                    self._job(job).add(facts)
+                    continue
+                before = _facts(old)
+                self._all.update(before, facts)
+                if old.get("job_id", "") == job:
+                    self._job(job).update(before, facts)
+                else:
+                    self._job(old.get("job_id", "")).add(before, -1)
+                    self._job(job).add(facts)
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def summary(self, job_id: Optional[str] = None, top: int = 20) -> Dict[str, Any]:
+        """Totals, average and p50/p90 total_score, status counts and top skills -- O(1) in candidates."""
+        with self._lock:
+            agg = self._all if job_id is None else self._jobs.get(job_id)
+            return (agg or _Aggregate()).summary(top)
+
+    def save(self) -> None:
+        """Snapshot the aggregates with the store position they cover."""
+        with self.store.locked():
+            with self._lock:
+                snap = {
+                    "position": self.store.position(),
+                    "all": self._all.to_dict(),
+                    "jobs": {j: a.to_dict() for j, a in self._jobs.items() if a.count > 0},
+                }
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(snap), encoding="utf-8")
+            os.replace(tmp, self.path)
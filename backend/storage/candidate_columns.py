@@ -0,0 +1,295 @@
+# backend/storage/candidate_columns.py
+"""
+Columnar in-memory view of the candidate store for analytics.
+
+Row ``id - 1`` of every column describes candidate ``id``:
+ - total_score / base_score / skill_score / penalty   int32 arrays
+ - job_id / status    int32 codes into a per-column dictionary (status lowercased)
+ - found_skills / missing_skills   CSR-style: one shared int32 array of skill codes
+   plus per-row (start, length). An update appends the row's new list and
+   repoints it; the dead entries are dropped once they outnumber the live ones.
+ - present   bool: the store has this id. Ids can have gaps (SQLiteCandidateStore),
+   and rows of missing ids are left out of every query.
+
+The view is built on first use by replaying the store, then kept current by a
+store listener on every append and update, so queries never touch the records
+and run as NumPy reductions over the columns.
+"""
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from backend.storage.candidate_store import CandidateStore
+from backend.storage.fields import split_skills, to_int
+
+SCORE_FIELDS = ("total_score", "base_score", "skill_score", "penalty")
+CATEGORY_FIELDS = ("job_id", "status")
+SKILL_FIELDS = ("found_skills", "missing_skills")
+
+
+def _resized(a: np.ndarray, n: int) -> np.ndarray:
+    """Copy of a with length n, zero-padded."""
+    out = np.zeros(n, dtype=a.dtype)
+    out[: min(n, len(a))] = a[:n]
+    return out
+
+
+class _Dictionary:
+    """Value <-> int code for one categorical column."""
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class _SkillLists:
+    """Per-row lists of skill codes in one shared array (CSR with per-row start/length)."""
+
+    def __init__(self) -> None:
+        self.codes = np.zeros(0, dtype=np.int32)
+        self.owner = np.zeros(0, dtype=np.int32)  # row owning each entry of codes
+        self.size = 0
+        self.start = np.zeros(0, dtype=np.int64)
+        self.length = np.zeros(0, dtype=np.int32)
+        self.live = 0
+        self._live_mask: Optional[np.ndarray] = None
+
+    def grow(self, capacity: int) -> None:
+        self.start = _resized(self.start, capacity)
+        self.length = _resized(self.length, capacity)
+
+    def set_many(self, rows: np.ndarray, lists: List[List[int]]) -> None:
+        """Replace the lists of the given (distinct) rows."""
+        lengths = np.fromiter((len(c) for c in lists), dtype=np.int32, count=len(lists))
+        added = int(lengths.sum())
+        self.live += added - int(self.length[rows].sum())
+        end = self.size + added
+        if end > len(self.codes):
+            capacity = max(4096, 2 * len(self.codes), end)
+            self.codes = _resized(self.codes, capacity)
+            self.owner = _resized(self.owner, capacity)
+        self.codes[self.size: end] = np.fromiter((x for c in lists for x in c), dtype=np.int32, count=added)
+        self.owner[self.size: end] = np.repeat(rows, lengths)
+        self.start[rows] = self.size + np.cumsum(lengths) - lengths
+        self.length[rows] = lengths
+        self.size = end
+        self._live_mask = None
+        if self.size > 2 * self.live + 4096:
+            self.compact()
+
+    def compact(self) -> None:
+        """Drop entries of superseded lists, keeping rows in order."""
+        keep = self.live_mask()
+        codes, owner = self.codes[: self.size][keep], self.owner[: self.size][keep]
+        order = np.argsort(owner, kind="stable")
+        codes, owner = codes[order], owner[order]
+        self.start[:] = np.where(self.length > 0, np.searchsorted(owner, np.arange(len(self.start))), 0)
+        self.codes, self.owner, self.size = codes, owner, len(codes)
+        self._live_mask = None
+
+    def live_mask(self) -> np.ndarray:
+        if self._live_mask is None:
+            owner = self.owner[: self.size]
+            start = self.start[owner]
+            pos = np.arange(self.size)
+            self._live_mask = (pos >= start) & (pos < start + self.length[owner])
+        return self._live_mask
+
+class CandidateColumns:
+    """Columnar analytics view of a CandidateStore, loaded lazily and updated on writes."""
+
+    def __init__(self, store: CandidateStore) -> None:
+        self.store = store
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._n = 0
+        self._count = 0
+        self._capacity = 0
+        self._present = np.zeros(0, dtype=bool)
+        self._scores: Dict[str, np.ndarray] = {f: np.zeros(0, dtype=np.int32) for f in SCORE_FIELDS}
+        self._cats: Dict[str, np.ndarray] = {f: np.zeros(0, dtype=np.int32) for f in CATEGORY_FIELDS}
+        self._dicts: Dict[str, _Dictionary] = {f: _Dictionary() for f in CATEGORY_FIELDS}
+        self._skill_dict = _Dictionary()
+        self._skills: Dict[str, _SkillLists] = {f: _SkillLists() for f in SKILL_FIELDS}
+
+    # -------------------------
+    # Loading / maintenance
+    # -------------------------
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self.store.subscribe(self._apply, replay=True)
+                self._loaded = True
+
+    def _grow(self, n: int) -> None:
+        capacity = max(1024, self._capacity * 2, n)
+        for f in SCORE_FIELDS:
+            self._scores[f] = _resized(self._scores[f], capacity)
+        for f in CATEGORY_FIELDS:
+            self._cats[f] = _resized(self._cats[f], capacity)
+        for lists in self._skills.values():
+            lists.grow(capacity)
+        self._present = _resized(self._present, capacity)
+        self._capacity = capacity
+
+    def _apply(self, items: List[Tuple[int, Optional[Dict[str, str]], Dict[str, str]]]) -> None:
+        """Store listener: (re)write the rows of the given records."""
+        if not items:
+            return
+        with self._lock:
+            top = max(cid for cid, _, _ in items)
+            if top > self._capacity:
+                self._grow(top)
+            rows = np.fromiter((cid - 1 for cid, _, _ in items), dtype=np.int64, count=len(items))
+            records = [row for _, _, row in items]
+            for f in SCORE_FIELDS:
+                self._scores[f][rows] = [to_int(r.get(f, "")) for r in records]
+            self._cats["job_id"][rows] = [self._dicts["job_id"].encode(r.get("job_id", "")) for r in records]
+            self._cats["status"][rows] = [self._dicts["status"].encode(r.get("status", "").lower()) for r in records]
+            encode = self._skill_dict.encode
+            for f in SKILL_FIELDS:
+                self._skills[f].set_many(rows, [[encode(x) for x in split_skills(r.get(f, ""))] for r in records])
+            self._count += len(rows) - int(self._present[rows].sum())
+            self._present[rows] = True
+            self._n = max(self._n, top)
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return self._count
+
+    def scores(self, field: str, ids: np.ndarray) -> np.ndarray:
+        """Values of a score column for the given candidate ids (0 for unknown ids)."""
+        if field not in SCORE_FIELDS:
+            raise ValueError(f"not a score field: {field}")
+        self._ensure_loaded()
+        with self._lock:
+            rows = np.asarray(ids, dtype=np.int64) - 1
+            out = np.zeros(len(rows), dtype=np.int32)
+            ok = (rows >= 0) & (rows < self._n)
+            ok[ok] = self._present[rows[ok]]
+            out[ok] = self._scores[field][rows[ok]]
+            return out
+
+    def skill_csr(self, field: str, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        (indptr, codes, vocabulary): the found_skills / missing_skills lists of ids as a
+        CSR matrix of skill codes, vocabulary[code] being the skill name. Unknown ids get
+        an empty row.
+        """
+        if field not in SKILL_FIELDS:
+            raise ValueError(f"not a skill field: {field}")
+        self._ensure_loaded()
+        with self._lock:
+            lists = self._skills[field]
+            rows = np.asarray(ids, dtype=np.int64) - 1
+            ok = (rows >= 0) & (rows < self._n)
+            ok[ok] = self._present[rows[ok]]
+            lengths = np.zeros(len(rows), dtype=np.int64)
+            starts = np.zeros(len(rows), dtype=np.int64)
+            lengths[ok] = lists.length[rows[ok]]
+            starts[ok] = lists.start[rows[ok]]
+            indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=indptr[1:])
+            pos = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+            return indptr, lists.codes[pos].astype(np.int64), list(self._skill_dict.values)
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def mask(self, job_id: Optional[str] = None, status: Optional[str] = None) -> Optional[np.ndarray]:
+        """Boolean row mask for the filters and ids the store has (None = every row). Caller holds the lock."""
+        rows = self._present[: self._n] if self._count < self._n else None
+        for field, value in (("job_id", job_id), ("status", status.lower() if status else status)):
+            if not value:
+                continue
+            code = self._dicts[field].codes.get(value)
+            hit = self._cats[field][: self._n] == code if code is not None else np.zeros(self._n, dtype=bool)
+            rows = hit if rows is None else rows & hit
+        return rows
+
+    def group_by(
+        self,
+        by: Iterable[str],
+        field: str = "total_score",
+        job_id: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """count / sum / avg / min / max of a score field per combination of job_id and/or status."""
+        by = list(by)
+        self._ensure_loaded()
+        with self._lock:
+            rows = self.mask(job_id, status)
+            values = self._scores[field][: self._n].astype(np.int64)
+            codes = [self._cats[f][: self._n] for f in by]
+            if rows is not None:
+                values = values[rows]
+                codes = [c[rows] for c in codes]
+            if not len(values):
+                return []
+            sizes = [len(self._dicts[f].values) for f in by]
+            key = np.zeros(len(values), dtype=np.int64)
+            for c, size in zip(codes, sizes):
+                key = key * size + c
+            # the key space (jobs x statuses) is small: aggregate with bincount, no sort
+            n_keys = int(np.prod(sizes))
+            count = np.bincount(key, minlength=n_keys)
+            total = np.bincount(key, weights=values, minlength=n_keys)
+            lo = np.full(n_keys, np.iinfo(np.int64).max)
+            hi = np.full(n_keys, np.iinfo(np.int64).min)
+            np.minimum.at(lo, key, values)
+            np.maximum.at(hi, key, values)
+            groups = np.flatnonzero(count)
+            out = []
+            for g in groups.tolist():
+                k = g
+                labels = []
+                for f, size in reversed(list(zip(by, sizes))):
+                    labels.append((f, self._dicts[f].values[k % size] or ("unknown" if f == "status" else "")))
+                    k //= size
+                entry: Dict[str, Any] = dict(reversed(labels))
+                entry.update(
+                    count=int(count[g]),
+                    sum=int(total[g]),
+                    avg=round(float(total[g]) / int(count[g]), 2),
+                    min=int(lo[g]),
+                    max=int(hi[g]),
+                )
+                out.append(entry)
+            out.sort(key=lambda e: -e["count"])
+            return out
+
+    def histogram(
+        self,
+        field: str = "total_score",
+        bins: int = 20,
+        job_id: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Histogram of a score field over the filtered candidates (equal-width integer-edged bins)."""
+        self._ensure_loaded()
+        with self._lock:
+            rows = self.mask(job_id, status)
+            values = self._scores[field][: self._n]
+            if rows is not None:
+                values = values[rows]
+            if not len(values):
+                return {"field": field, "total": 0, "edges": [], "counts": []}
+            lo, hi = int(values.min()), int(values.max())
+            width = max(1, -(-(hi - lo + 1) // bins))
+            counts = np.bincount((values - lo) // width)
+            return {
+                "field": field,
+                "total": int(len(values)),
+                "edges": [lo + i * width for i in range(len(counts) + 1)],
+                "counts": counts.tolist(),
+            }
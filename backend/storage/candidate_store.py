@@ -0,0 +1,661 @@
+# backend/storage/candidate_store.py
+"""
+Append-only candidate store with a persistent offset index and an update log.
+
+A store directory holds one generation of:
+ - records.jsonl  one JSON object per candidate (tagged with its ``_id``), append-only
+ - offsets.idx    native-endian uint64 pairs (offset, length), slot ``id - 1``
+ - updates.log    field deltas ({"id": ..., "fields": {...}}) overlaid on the records
+plus CURRENT (the live generation number) and secondary.json, a snapshot of the
+job_id/status indexes and the file sizes it covers.
+
+Field updates are one small append to updates.log. compact() folds the deltas
+into a fresh generation of records/offsets in the background and switches to it
+by rewriting CURRENT, so readers never see a half-compacted store.
+
+Candidate ids are the 1-based row numbers the CSV endpoints always used, so the
+store can be seeded from ``candidate_data.csv`` without changing any ``_id``.
+"""
+import json
+import os
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from bisect import bisect_left, insort
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Every record carries these keys (DataAgent's CSV columns).
+CANDIDATE_FIELDS = [
+    "job_id",
+    "name",
+    "email",
+    "phone",
+    "total_score",
+    "base_score",
+    "skill_score",
+    "penalty",
+    "questions",
+    "status",
+    "notes",
+    "saved_filename",
+    # scoring inputs, kept so candidates can be re-scored without re-parsing
+    "sha256",
+    "found_skills",
+    "missing_skills",
+    "profile_version",
+    # later uploads linked to this record by ingest dedup
+    "duplicates",
+]
+
+# Fields with a secondary index. Status is matched case-insensitively.
+INDEXED_FIELDS = ("job_id", "status")
+
+# Persist the secondary index snapshot after this many unsaved changes.
+SNAPSHOT_EVERY = 1000
+
+# Background compaction kicks in once this many deltas are pending.
+COMPACT_AFTER = 1000
+
+
+def _to_str(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " | ".join(str(v) for v in value)
+    return str(value)
+
+
+def normalize_row(row: Dict[str, Any]) -> Dict[str, str]:
+    """Return a copy of row with string values and every CANDIDATE_FIELDS key present."""
+    out = {str(k): _to_str(v) for k, v in row.items() if k is not None and not str(k).startswith("_")}
+    for f in CANDIDATE_FIELDS:
+        out.setdefault(f, "")
+    return out
+
+
+def index_key(field: str, value: Any) -> str:
+    value = _to_str(value)
+    return value.lower() if field == "status" else value
+
+
+def intersect_sorted(a: List[int], b: List[int]) -> List[int]:
+    """Intersect two ascending id lists, probing the longer one with bisect."""
+    if len(a) > len(b):
+        a, b = b, a
+    out = []
+    n = len(b)
+    for x in a:
+        i = bisect_left(b, x)
+        if i < n and b[i] == x:
+            out.append(x)
+    return out
+
+
+class CandidateStore:
+    """Candidate records addressed by id, with job_id/status postings for filtering."""
+
+    def __init__(self, root: Path, fsync: bool = True) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.current_path = self.root / "CURRENT"
+        self.secondary_path = self.root / "secondary.json"
+        self.fsync = fsync
+
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._slots = array("Q")  # offset, length pairs
+        self._overlay: Dict[int, Dict[str, str]] = {}
+        self._log_entries = 0
+        self._indexes: Dict[str, Dict[str, List[int]]] = {f: {} for f in INDEXED_FIELDS}
+        self._unsaved = 0
+        self._listeners: List[Callable[[List[Tuple[int, Optional[Dict[str, str]], Dict[str, str]]]], None]] = []
+        self._checkpoint_hooks: List[Callable[[], None]] = []
+        self._version = 0
+        self._open()
+        self._modified = max(os.path.getmtime(p) for p in (self.records_path, self.log_path))
+
+    # -------------------------
+    # Open / recovery
+    # -------------------------
+    def _paths(self, gen: int) -> Tuple[Path, Path, Path]:
+        """records, offsets and update-log paths for a generation (0 keeps the plain names)."""
+        tag = f".{gen}" if gen else ""
+        return (
+            self.root / f"records{tag}.jsonl",
+            self.root / f"offsets{tag}.idx",
+            self.root / f"updates{tag}.log",
+        )
+
+    def _open(self) -> None:
+        self._gen = int(self.current_path.read_text().strip()) if self.current_path.exists() else 0
+        self.records_path, self.offsets_path, self.log_path = self._paths(self._gen)
+        self._data = open(self.records_path, "a+b", buffering=0)
+        self._load_offsets()
+        # not O_APPEND: slots are written at explicit positions with pwrite
+        self._offsets = os.open(self.offsets_path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._recover_tail()
+        self._log = open(self.log_path, "a+b", buffering=0)
+        self._load_log()
+        self._load_secondary()
+
+    def _load_offsets(self) -> None:
+        if not self.offsets_path.exists():
+            return
+        raw = self.offsets_path.read_bytes()
+        usable = len(raw) - len(raw) % (2 * self._slots.itemsize)
+        self._slots.frombytes(raw[:usable])
+        data_size = os.fstat(self._data.fileno()).st_size
+        # drop trailing slots that point past the end of the data file
+        while self._slots and self._slots[-2] + self._slots[-1] > data_size:
+            del self._slots[-2:]
+        if len(self._slots) * self._slots.itemsize != len(raw):
+            with self.offsets_path.open("wb") as f:
+                self._slots.tofile(f)
+
+    def _recover_tail(self) -> None:
+        """Index complete records written after the last offset slot; cut a torn last line."""
+        fd = self._data.fileno()
+        size = os.fstat(fd).st_size
+        end = self._slots[-2] + self._slots[-1] if self._slots else 0
+        if end >= size:
+            return
+        tail = os.pread(fd, size - end, end)
+        pos = 0
+        new = array("Q")
+        while True:
+            nl = tail.find(b"\n", pos)
+            if nl < 0:
+                break
+            try:
+                cid = int(json.loads(tail[pos:nl + 1])["_id"])
+            except (ValueError, KeyError, TypeError):
+                break
+            if cid != len(self) + len(new) // 2 + 1:
+                break
+            new.extend((end + pos, nl + 1 - pos))
+            pos = nl + 1
+        if end + pos < size:
+            os.ftruncate(fd, end + pos)
+        if new:
+            os.pwrite(self._offsets, new.tobytes(), len(self._slots) * self._slots.itemsize)
+            self._slots.extend(new)
+
+    def _load_log(self) -> None:
+        """Rebuild the in-memory overlay from updates.log; cut a torn last line."""
+        fd = self._log.fileno()
+        raw = os.pread(fd, os.fstat(fd).st_size, 0)
+        good = self._apply_log(raw)
+        if good < len(raw):
+            os.ftruncate(fd, good)
+
+    def _apply_log(self, raw: bytes) -> int:
+        """Merge complete delta lines from raw into the overlay. Returns bytes consumed."""
+        pos = 0
+        while True:
+            nl = raw.find(b"\n", pos)
+            if nl < 0:
+                break
+            try:
+                entry = json.loads(raw[pos:nl + 1])
+                cid = int(entry["id"])
+                fields = entry["fields"]
+            except (ValueError, KeyError, TypeError):
+                break
+            self._overlay.setdefault(cid, {}).update(fields)
+            self._log_entries += 1
+            pos = nl + 1
+        return pos
+
+    def _load_secondary(self) -> None:
+        """Load the index snapshot and replay records and deltas written after it."""
+        data_size = os.fstat(self._data.fileno()).st_size
+        log_size = os.fstat(self._log.fileno()).st_size
+        covered_data = covered_log = 0
+        if self.secondary_path.exists():
+            try:
+                snap = json.loads(self.secondary_path.read_text(encoding="utf-8"))
+                if snap.get("generation", 0) == self._gen:
+                    covered_data = int(snap.get("data_size", 0))
+                    covered_log = int(snap.get("log_size", 0))
+                    self._indexes = {f: snap.get(f, {}) for f in INDEXED_FIELDS}
+            except Exception:
+                covered_data = covered_log = 0
+        if covered_data == 0 or covered_data > data_size or covered_log > log_size:
+            covered_data = covered_log = 0
+            self._indexes = {f: {} for f in INDEXED_FIELDS}
+            touched = range(1, len(self) + 1)
+        elif covered_data == data_size and covered_log == log_size:
+            return
+        else:
+            touched = set()
+            for line in os.pread(self._data.fileno(), data_size - covered_data, covered_data).splitlines():
+                touched.add(int(json.loads(line)["_id"]))
+            for line in os.pread(self._log.fileno(), log_size - covered_log, covered_log).splitlines():
+                touched.add(int(json.loads(line)["id"]))
+            touched = sorted(touched)
+        for cid in touched:
+            if covered_data:
+                self._index_discard(cid)
+            self._index_add(cid, self._read(cid))
+        self.checkpoint()
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+    def _read(self, candidate_id: int) -> Dict[str, str]:
+        i = 2 * (candidate_id - 1)
+        row = json.loads(os.pread(self._data.fileno(), self._slots[i + 1], self._slots[i]))
+        row.pop("_id", None)
+        delta = self._overlay.get(candidate_id)
+        if delta:
+            row.update(delta)
+        return row
+
+    def _index_add(self, candidate_id: int, row: Dict[str, str]) -> None:
+        for f in INDEXED_FIELDS:
+            ids = self._indexes[f].setdefault(index_key(f, row.get(f)), [])
+            if not ids or ids[-1] < candidate_id:
+                ids.append(candidate_id)
+            else:
+                insort(ids, candidate_id)
+
+    def _index_remove(self, candidate_id: int, row: Dict[str, str]) -> None:
+        for f in INDEXED_FIELDS:
+            key = index_key(f, row.get(f))
+            ids = self._indexes[f].get(key)
+            if not ids:
+                continue
+            i = bisect_left(ids, candidate_id)
+            if i < len(ids) and ids[i] == candidate_id:
+                del ids[i]
+            if not ids:
+                del self._indexes[f][key]
+
+    def _index_discard(self, candidate_id: int) -> None:
+        """Remove candidate_id from every posting list (used when its old values are unknown)."""
+        for f in INDEXED_FIELDS:
+            for key, ids in list(self._indexes[f].items()):
+                i = bisect_left(ids, candidate_id)
+                if i < len(ids) and ids[i] == candidate_id:
+                    del ids[i]
+                    if not ids:
+                        del self._indexes[f][key]
+
+    @staticmethod
+    def _encode(candidate_id: int, row: Dict[str, str]) -> bytes:
+        return (json.dumps(dict(row, _id=candidate_id), ensure_ascii=False) + "\n").encode("utf-8")
+
+    def _sync(self, *fds: int) -> None:
+        if self.fsync:
+            for fd in fds:
+                os.fsync(fd)
+
+    def _bump(self) -> None:
+        self._version += 1
+        self._modified = time.time()
+
+    def _touch(self, n: int = 1) -> None:
+        self._unsaved += n
+        if self._unsaved >= SNAPSHOT_EVERY:
+            self.checkpoint()
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def __len__(self) -> int:
+        return len(self._slots) // 2
+
+    @property
+    def version(self) -> int:
+        """Number of writes (appends or updates) since the store was opened; grows on every write."""
+        return self._version
+
+    @property
+    def last_modified(self) -> float:
+        """Unix time of the last write (file modification time until the first write after opening)."""
+        return self._modified
+
+    def append(self, row: Dict[str, Any]) -> int:
+        """Append one candidate and return its id."""
+        return self.append_many([row])[0]
+
+    def append_many(self, rows: Iterable[Dict[str, Any]]) -> List[int]:
+        """Append candidates with a single write + fsync and return their ids."""
+        rows = [normalize_row(r) for r in rows]
+        if not rows:
+            return []
+        with self._lock:
+            first = len(self) + 1
+            ids = list(range(first, first + len(rows)))
+            chunks = [self._encode(cid, row) for cid, row in zip(ids, rows)]
+            pos = os.fstat(self._data.fileno()).st_size
+            new = array("Q")
+            for c in chunks:
+                new.extend((pos, len(c)))
+                pos += len(c)
+            self._data.write(b"".join(chunks))
+            os.pwrite(self._offsets, new.tobytes(), len(self._slots) * self._slots.itemsize)
+            self._sync(self._data.fileno(), self._offsets)
+            self._slots.extend(new)
+            for cid, row in zip(ids, rows):
+                self._index_add(cid, row)
+            self._bump()
+            self._touch(len(rows))
+            self._notify([(cid, None, row) for cid, row in zip(ids, rows)])
+        return ids
+
+    def update(self, candidate_id: int, fields: Dict[str, Any]) -> Dict[str, str]:
+        """Log a field delta for one record and return the updated row. Raises KeyError if missing."""
+        row = self.update_many({candidate_id: fields})[candidate_id]
+        if row is None:
+            raise KeyError(candidate_id)
+        return row
+
+    def update_many(self, changes: Dict[int, Dict[str, Any]]) -> Dict[int, Optional[Dict[str, str]]]:
+        """
+        Log deltas for many records with one write + fsync.
+        Returns id -> updated row, or None for ids that do not exist.
+        """
+        results: Dict[int, Optional[Dict[str, str]]] = dict.fromkeys(changes)
+        with self._lock:
+            lines = []
+            applied = []
+            for cid, fields in changes.items():
+                if not self.exists(cid):
+                    continue
+                fields = {k: _to_str(v) for k, v in fields.items()}
+                lines.append(json.dumps({"id": cid, "fields": fields}, ensure_ascii=False) + "\n")
+                applied.append((cid, fields))
+            if lines:
+                self._log.write("".join(lines).encode("utf-8"))
+                self._sync(self._log.fileno())
+            changed = []
+            for cid, fields in applied:
+                old = self._read(cid)
+                self._overlay.setdefault(cid, {}).update(fields)
+                self._log_entries += 1
+                row = dict(old, **fields)
+                if any(old.get(f) != row.get(f) for f in INDEXED_FIELDS):
+                    self._index_remove(cid, old)
+                    self._index_add(cid, row)
+                results[cid] = row
+                changed.append((cid, old, row))
+            if changed:
+                self._bump()
+            self._touch(len(applied))
+            self._notify(changed)
+        return results
+
+    def subscribe(
+        self,
+        listener: Callable[[List[Tuple[int, Optional[Dict[str, str]], Dict[str, str]]]], None],
+        replay: bool = False,
+    ) -> None:
+        """
+        Call listener([(id, old record or None if appended, new record), ...]) after every
+        append and update, in commit order and under the store lock (so keep it cheap).
+        With replay, every existing record is fed to it first as appended, atomically
+        with the registration.
+        """
+        with self._lock:
+            if replay:
+                for start in range(1, len(self) + 1, 4096):
+                    stop = min(len(self), start + 4095)
+                    listener([(cid, None, self._read(cid)) for cid in range(start, stop + 1)])
+            self._listeners.append(listener)
+
+    def _notify(self, items: List[Tuple[int, Optional[Dict[str, str]], Dict[str, str]]]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(items)
+            except Exception as e:
+                print(f"[WARN] candidate store listener failed: {e}")
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold the store lock: no writes happen (and no listener runs) inside the block."""
+        with self._lock:
+            yield
+
+    def position(self) -> Dict[str, int]:
+        """Where the store is: generation, record count and update log size."""
+        with self._lock:
+            return {"generation": self._gen, "count": len(self), "log_size": os.fstat(self._log.fileno()).st_size}
+
+    def changes_since(
+        self, position: Dict[str, int]
+    ) -> Optional[List[Tuple[int, Optional[Dict[str, str]], Dict[str, str]]]]:
+        """
+        The writes made after position() returned `position`, as listener items
+        (records appended since come once, as appended, with their current values).
+        None if they cannot be reconstructed, e.g. after a compaction.
+        """
+        with self._lock:
+            log_fd = self._log.fileno()
+            log_size = os.fstat(log_fd).st_size
+            count = position.get("count", 0)
+            covered = position.get("log_size", 0)
+            if position.get("generation") != self._gen or count > len(self) or covered > log_size:
+                return None
+            items: List[Tuple[int, Optional[Dict[str, str]], Dict[str, str]]] = []
+            # replay the whole log (it is bounded by compaction) to know each delta's old row
+            state: Dict[int, Dict[str, str]] = {}
+            pos = 0
+            for line in os.pread(log_fd, log_size, 0).splitlines(keepends=True):
+                entry = json.loads(line)
+                cid = int(entry["id"])
+                if cid <= count:
+                    if cid not in state:
+                        i = 2 * (cid - 1)
+                        state[cid] = json.loads(os.pread(self._data.fileno(), self._slots[i + 1], self._slots[i]))
+                        state[cid].pop("_id", None)
+                    old = state[cid]
+                    state[cid] = dict(old, **entry["fields"])
+                    if pos >= covered:
+                        items.append((cid, old, state[cid]))
+                pos += len(line)
+            items.extend((cid, None, self._read(cid)) for cid in range(count + 1, len(self) + 1))
+            return items
+
+    def on_checkpoint(self, hook: Callable[[], None]) -> None:
+        """Call hook() under the store lock after every checkpoint (a position changes_since can replay from)."""
+        with self._lock:
+            self._checkpoint_hooks.append(hook)
+
+    def exists(self, candidate_id: int) -> bool:
+        return 1 <= candidate_id <= len(self)
+
+    def get(self, candidate_id: int) -> Optional[Dict[str, str]]:
+        """Return the record for candidate_id, or None if it does not exist."""
+        with self._lock:
+            if not self.exists(candidate_id):
+                return None
+            return self._read(candidate_id)
+
+    def get_many(self, ids: Iterable[int]) -> List[Dict[str, str]]:
+        """Return records for existing ids, each annotated with ``_id``."""
+        out = []
+        with self._lock:
+            for cid in ids:
+                if self.exists(cid):
+                    row = self._read(cid)
+                    row["_id"] = cid
+                    out.append(row)
+        return out
+
+    def ids(self, job_id: Optional[str] = None, status: Optional[str] = None) -> List[int]:
+        """Ascending ids matching the filters, served from the secondary indexes."""
+        with self._lock:
+            lists = []
+            if job_id:
+                lists.append(self._indexes["job_id"].get(index_key("job_id", job_id), []))
+            if status:
+                lists.append(self._indexes["status"].get(index_key("status", status), []))
+            if not lists:
+                return list(range(1, len(self) + 1))
+            if len(lists) == 1:
+                return list(lists[0])
+            return intersect_sorted(lists[0], lists[1])
+
+    def query(
+        self,
+        job_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Tuple[int, List[Dict[str, str]]]:
+        """Return (total matches, one page of records) without touching non-matching rows."""
+        with self._lock:
+            if not job_id and not status:
+                total = len(self)
+                page = range(offset + 1, min(total, offset + limit) + 1)
+            else:
+                matched = self.ids(job_id=job_id, status=status)
+                total = len(matched)
+                page = matched[offset: offset + limit]
+            return total, self.get_many(page)
+
+    def values(self, field: str) -> Dict[str, int]:
+        """Counts per indexed value of field (e.g. status -> number of candidates)."""
+        with self._lock:
+            return {k: len(v) for k, v in self._indexes[field].items()}
+
+    def scan(self, ids: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """Yield (id, record) pairs in id order, or for the given ids."""
+        for cid in (ids if ids is not None else range(1, len(self) + 1)):
+            row = self.get(cid)
+            if row is not None:
+                yield cid, row
+
+    def checkpoint(self) -> None:
+        """Persist the secondary indexes so the next open only replays newer writes."""
+        with self._lock:
+            snap = {
+                "generation": self._gen,
+                "count": len(self),
+                "data_size": os.fstat(self._data.fileno()).st_size,
+                "log_size": os.fstat(self._log.fileno()).st_size,
+            }
+            snap.update(self._indexes)
+            tmp = self.secondary_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(snap), encoding="utf-8")
+            os.replace(tmp, self.secondary_path)
+            self._unsaved = 0
+            for hook in self._checkpoint_hooks:
+                try:
+                    hook()
+                except Exception as e:
+                    print(f"[WARN] candidate store checkpoint hook failed: {e}")
+
+    def close(self) -> None:
+        self._stop.set()
+        with self._lock:
+            self.checkpoint()
+            self._data.close()
+            self._log.close()
+            os.close(self._offsets)
+
+    # -------------------------
+    # Compaction
+    # -------------------------
+    @property
+    def pending_updates(self) -> int:
+        """Number of deltas in the update log that have not been compacted yet."""
+        return self._log_entries
+
+    def compact(self) -> int:
+        """
+        Fold logged deltas into a new generation of records/offsets. Returns deltas folded.
+        The bulk copy runs without the store lock; only records and deltas written
+        meanwhile are copied under it, right before CURRENT is switched.
+        """
+        with self._compact_lock:
+            with self._lock:
+                if not self._log_entries:
+                    return 0
+                n = len(self)
+                slots = self._slots[: 2 * n]
+                overlay = {cid: dict(d) for cid, d in self._overlay.items()}
+                log_size = os.fstat(self._log.fileno()).st_size
+                folded = self._log_entries
+                data_fd = self._data.fileno()
+                gen = self._gen + 1
+            records_path, offsets_path, log_path = self._paths(gen)
+
+            new_slots = array("Q")
+            with records_path.open("wb") as out:
+                pos = 0
+                buf: List[bytes] = []
+                for cid in range(1, n + 1):
+                    raw = os.pread(data_fd, slots[2 * cid - 1], slots[2 * cid - 2])
+                    if cid in overlay:
+                        row = json.loads(raw)
+                        row.update(overlay[cid])
+                        raw = self._encode(cid, {k: v for k, v in row.items() if k != "_id"})
+                    new_slots.extend((pos, len(raw)))
+                    pos += len(raw)
+                    buf.append(raw)
+                    if len(buf) >= 1024:
+                        out.write(b"".join(buf))
+                        buf = []
+                out.write(b"".join(buf))
+
+                with self._lock:
+                    # records appended and deltas logged while the copy ran
+                    for cid in range(n + 1, len(self) + 1):
+                        i = 2 * (cid - 1)
+                        raw = os.pread(data_fd, self._slots[i + 1], self._slots[i])
+                        new_slots.extend((pos, len(raw)))
+                        pos += len(raw)
+                        out.write(raw)
+                    out.flush()
+                    self._sync(out.fileno())
+                    log_fd = self._log.fileno()
+                    log_tail = os.pread(log_fd, os.fstat(log_fd).st_size - log_size, log_size)
+                    with log_path.open("wb") as f:
+                        f.write(log_tail)
+                        f.flush()
+                        self._sync(f.fileno())
+                    with offsets_path.open("wb") as f:
+                        new_slots.tofile(f)
+                        f.flush()
+                        self._sync(f.fileno())
+                    tmp = self.current_path.with_suffix(".tmp")
+                    tmp.write_text(str(gen))
+                    os.replace(tmp, self.current_path)
+
+                    old_paths = (self.records_path, self.offsets_path, self.log_path)
+                    self._data.close()
+                    self._log.close()
+                    os.close(self._offsets)
+                    self._gen = gen
+                    self.records_path, self.offsets_path, self.log_path = records_path, offsets_path, log_path
+                    self._data = open(records_path, "a+b", buffering=0)
+                    self._offsets = os.open(offsets_path, os.O_RDWR | os.O_CREAT, 0o644)
+                    self._log = open(log_path, "a+b", buffering=0)
+                    self._slots = new_slots
+                    self._overlay = {}
+                    self._log_entries = 0
+                    self._apply_log(log_tail)
+                    self.checkpoint()
+                    for p in old_paths:
+                        p.unlink(missing_ok=True)
+        return folded
+
+    def start_compactor(self, interval: float = 5.0, min_updates: int = COMPACT_AFTER) -> threading.Thread:
+        """Run compact() on a daemon thread whenever at least min_updates deltas are pending."""
+
+        def loop() -> None:
+            while not self._stop.wait(interval):
+                if self._log_entries >= min_updates:
+                    try:
+                        self.compact()
+                    except Exception as e:
+                        print(f"[WARN] candidate store compaction failed: {e}")
+
+        t = threading.Thread(target=loop, name="candidate-store-compactor", daemon=True)
+        t.start()
+        return t
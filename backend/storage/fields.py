@@ -0,0 +1,30 @@
+# backend/storage/fields.py
+"""
+Parsing of stored candidate field values.
+
+Records keep every field as a string. The in-memory views (columns,
+aggregates, skill and sort indexes) and the API all read scores and skill
+lists through these helpers, so filters, sorts and analytics agree on what a
+record contains.
+"""
+import re
+from typing import Any, List
+
+# DataAgent joins skill lists with " | "; comma/semicolon lists come from imported CSVs
+SKILL_SPLIT = re.compile(r"[|;,]")
+
+
+def to_int(value: Any, default: int = 0) -> int:
+    """Integer value of a stored field ("12", "12.0", 12), or default when it has none."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError, OverflowError):
+            return default
+
+
+def split_skills(value: str) -> List[str]:
+    """Lowercased, non-empty skill names of a stored skill list."""
+    return [s for s in (p.strip().lower() for p in SKILL_SPLIT.split(value or "")) if s]
@@ -0,0 +1,289 @@
+# backend/storage/search_index.py
+"""
+On-disk inverted index over resume text with BM25 ranking.
+
+A directory holds one generation of:
+ - docs.log         one JSON line per indexed document ({"id": ..., "tf": {term: count}}),
+                    appended (and fsynced) as candidates are stored
+ - seg.terms.json   term -> row in the merged segment
+ - seg.offsets.npy  int64, postings of row r are [offsets[r], offsets[r + 1])
+ - seg.ids.npy      uint32 document ids, ascending within a term
+ - seg.tfs.npy      uint16 term frequencies, parallel to ids
+ - seg.lens.npy     uint32 document length by id (0 = not indexed)
+plus CURRENT (the live generation number). Generation k > 0 uses ``.k`` in the
+file names, like CandidateStore.
+
+Segment arrays are memory-mapped; documents logged since the last merge are
+kept as in-memory postings. Once merge_after documents have accumulated,
+merge() writes the next generation (segment + empty log) and switches CURRENT.
+Queries score only the postings of the query terms, vectorized with NumPy, and
+pick the requested page with argpartition.
+"""
+import json
+import math
+import os
+import re
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+MERGE_AFTER = 5000
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; keeps '+' and '#' so c++ / c# stay searchable."""
+    return TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """BM25 full-text index keyed by candidate id; documents are add-only."""
+
+    def __init__(self, root: Path, fsync: bool = True, merge_after: int = MERGE_AFTER) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.current_path = self.root / "CURRENT"
+        self.fsync = fsync
+        self.merge_after = merge_after
+        self._lock = threading.RLock()
+        self._open()
+
+    # -------------------------
+    # Open / recovery
+    # -------------------------
+    def _paths(self, gen: int) -> Dict[str, Path]:
+        tag = f".{gen}" if gen else ""
+        paths = {name: self.root / f"seg{tag}.{name}.npy" for name in ("offsets", "ids", "tfs", "lens")}
+        paths["terms"] = self.root / f"seg{tag}.terms.json"
+        paths["log"] = self.root / f"docs{tag}.log"
+        return paths
+
+    def _open(self) -> None:
+        self._gen = int(self.current_path.read_text().strip()) if self.current_path.exists() else 0
+        paths = self._paths(self._gen)
+        self._terms: Dict[str, int] = {}
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._ids = np.zeros(0, dtype=np.uint32)
+        self._tfs = np.zeros(0, dtype=np.uint16)
+        self._lens = array("I")
+        if paths["terms"].exists():
+            self._terms = json.loads(paths["terms"].read_text(encoding="utf-8"))
+            self._offsets = np.load(paths["offsets"], mmap_mode="r")
+            self._ids = np.load(paths["ids"], mmap_mode="r")
+            self._tfs = np.load(paths["tfs"], mmap_mode="r")
+            self._lens.frombytes(np.load(paths["lens"]).astype(np.uint32).tobytes())
+        self._n_docs = sum(1 for n in self._lens if n)
+        self._total_len = sum(self._lens)
+        self._delta: Dict[str, Tuple[array, array]] = {}
+        self._delta_docs = 0
+        self._lens_np: Optional[np.ndarray] = None
+
+        self._log = open(paths["log"], "a+b", buffering=0)
+        self._load_log()
+
+    def _load_log(self) -> None:
+        self._log.seek(0)
+        raw = self._log.read()
+        good = 0
+        for line in raw.split(b"\n"):
+            if not line:
+                break
+            try:
+                doc = json.loads(line)
+            except ValueError:
+                break
+            self._apply(doc["id"], doc["tf"])
+            good += len(line) + 1
+        if good < len(raw):
+            # torn tail from a crash mid-append
+            self._log.truncate(good)
+
+    def _apply(self, doc_id: int, tf: Dict[str, int]) -> None:
+        for term, n in tf.items():
+            ids, tfs = self._delta.get(term) or self._delta.setdefault(term, (array("I"), array("H")))
+            ids.append(doc_id)
+            tfs.append(min(n, 65535))
+        length = max(1, sum(tf.values()))
+        if len(self._lens) <= doc_id:
+            self._lens.extend([0] * (doc_id + 1 - len(self._lens)))
+        self._lens[doc_id] = length
+        self._n_docs += 1
+        self._total_len += length
+        self._delta_docs += 1
+        self._lens_np = None
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def __len__(self) -> int:
+        return self._n_docs
+
+    def __contains__(self, doc_id: int) -> bool:
+        return 0 <= doc_id < len(self._lens) and self._lens[doc_id] > 0
+
+    def add(self, doc_id: int, text: str) -> bool:
+        return self.add_many([(doc_id, text)]) == 1
+
+    def add_many(self, docs: Iterable[Tuple[int, str]]) -> int:
+        """Index (id, text) pairs with a single log write + fsync. Already indexed ids are skipped."""
+        with self._lock:
+            lines = []
+            new = []
+            seen = set()
+            for doc_id, text in docs:
+                if doc_id in self or doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                tf: Dict[str, int] = {}
+                for tok in tokenize(text or ""):
+                    tf[tok] = tf.get(tok, 0) + 1
+                lines.append(json.dumps({"id": doc_id, "tf": tf}, separators=(",", ":")) + "\n")
+                new.append((doc_id, tf))
+            if not new:
+                return 0
+            self._log.write("".join(lines).encode("utf-8"))
+            if self.fsync:
+                os.fsync(self._log.fileno())
+            for doc_id, tf in new:
+                self._apply(doc_id, tf)
+            if self._delta_docs >= self.merge_after:
+                self.merge()
+        return len(new)
+
+    def search(
+        self,
+        query: str,
+        ids: Optional[Iterable[int]] = None,
+        mode: str = "all",
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Tuple[int, List[Tuple[int, float]]]:
+        """
+        BM25-rank documents matching all (mode="all") or any (mode="any") query terms,
+        optionally restricted to the given ids. Returns (total matches, [(id, score)] page).
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._n_docs:
+            return 0, []
+        with self._lock:
+            if self._lens_np is None:
+                self._lens_np = np.frombuffer(self._lens.tobytes(), dtype=np.uint32).astype(np.float32)
+            lens = self._lens_np
+            postings = [self._postings(t) for t in terms]
+            n_docs, avgdl = self._n_docs, self._total_len / self._n_docs
+
+        size = len(lens)
+        scores = np.zeros(size, dtype=np.float32)
+        hits = np.zeros(size, dtype=np.uint8)
+        for doc_ids, tfs in postings:
+            df = len(doc_ids)
+            if not df:
+                continue
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            tf = tfs.astype(np.float32)
+            scores[doc_ids] += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * lens[doc_ids] / avgdl))
+            hits[doc_ids] += 1
+
+        matched = hits == len(terms) if mode == "all" else hits > 0
+        if ids is not None:
+            allowed = np.asarray(ids if isinstance(ids, (list, np.ndarray)) else list(ids), dtype=np.int64)
+            allowed = allowed[(allowed >= 0) & (allowed < size)]
+            mask = np.zeros(size, dtype=bool)
+            mask[allowed] = True
+            matched &= mask
+        found = np.flatnonzero(matched)
+        total = len(found)
+        need = offset + limit
+        if need <= 0 or offset >= total:
+            return total, []
+        if need < total:
+            found = found[np.argpartition(-scores[found], need - 1)[:need]]
+        found = found[np.lexsort((found, -scores[found]))][offset:need]
+        return total, [(int(i), round(float(scores[i]), 4)) for i in found]
+
+    def _postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """All (ids, tfs) for term: the merged segment plus documents logged since."""
+        parts_ids = []
+        parts_tfs = []
+        row = self._terms.get(term)
+        if row is not None:
+            lo, hi = int(self._offsets[row]), int(self._offsets[row + 1])
+            parts_ids.append(np.asarray(self._ids[lo:hi], dtype=np.int64))
+            parts_tfs.append(np.asarray(self._tfs[lo:hi]))
+        delta = self._delta.get(term)
+        if delta is not None:
+            # copies: the arrays keep growing while this query runs
+            parts_ids.append(np.frombuffer(delta[0].tobytes(), dtype=np.uint32).astype(np.int64))
+            parts_tfs.append(np.frombuffer(delta[1].tobytes(), dtype=np.uint16))
+        if not parts_ids:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint16)
+        return np.concatenate(parts_ids), np.concatenate(parts_tfs)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "documents": self._n_docs,
+                "terms": len(set(self._terms) | set(self._delta)),
+                "unmerged_documents": self._delta_docs,
+                "generation": self._gen,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._log.close()
+
+    # -------------------------
+    # Merge
+    # -------------------------
+    def merge(self) -> int:
+        """Fold logged documents into a new segment generation. Returns documents folded."""
+        with self._lock:
+            if not self._delta_docs:
+                return 0
+            folded = self._delta_docs
+            gen = self._gen + 1
+            paths = self._paths(gen)
+            vocab = sorted(set(self._terms) | set(self._delta))
+            offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+            ids_parts = []
+            tfs_parts = []
+            for r, term in enumerate(vocab):
+                doc_ids, tfs = self._postings(term)
+                ids_parts.append(doc_ids.astype(np.uint32))
+                tfs_parts.append(tfs)
+                offsets[r + 1] = offsets[r] + len(doc_ids)
+
+            def save(path: Path, arr: np.ndarray) -> None:
+                tmp = path.with_name(path.name + ".tmp")
+                with open(tmp, "wb") as f:
+                    np.save(f, arr)
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+                os.replace(tmp, path)
+
+            save(paths["offsets"], offsets)
+            save(paths["ids"], np.concatenate(ids_parts) if ids_parts else np.zeros(0, dtype=np.uint32))
+            save(paths["tfs"], np.concatenate(tfs_parts) if tfs_parts else np.zeros(0, dtype=np.uint16))
+            save(paths["lens"], np.frombuffer(self._lens.tobytes(), dtype=np.uint32))
+            paths["terms"].write_text(json.dumps({t: r for r, t in enumerate(vocab)}), encoding="utf-8")
+            paths["log"].write_bytes(b"")
+
+            tmp = self.current_path.with_suffix(".tmp")
+            tmp.write_text(str(gen))
+            os.replace(tmp, self.current_path)
+
+            old = self._paths(self._gen)
+            self._log.close()
+            self._open()
+            for p in old.values():
+                p.unlink(missing_ok=True)
+        return folded
@@ -0,0 +1,183 @@
+# backend/storage/sketches.py
+"""
+Small mergeable summaries used by the running analytics aggregates.
+
+- TDigest: score quantiles in bounded memory (merging t-digest, k1 scale).
+- SpaceSaving: approximate top-k counts (heavy hitters) over a stream of items.
+
+Both serialize to plain JSON-friendly dicts.
+"""
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+COMPRESSION = 100
+TOP_CAPACITY = 200
+
+
+class TDigest:
+    """Merging t-digest: centroids (mean, weight) sorted by mean, plus an unsorted buffer."""
+
+    def __init__(self, compression: int = COMPRESSION) -> None:
+        self.compression = compression
+        self.means: List[float] = []
+        self.weights: List[float] = []
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: List[Tuple[float, float]] = []
+
+    def add(self, x: float, w: float = 1.0) -> None:
+        self._buffer.append((float(x), float(w)))
+        self.count += w
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        points = sorted(list(zip(self.means, self.weights)) + self._buffer)
+        self._buffer = []
+        total = sum(w for _, w in points)
+        means: List[float] = []
+        weights: List[float] = []
+        done = 0.0
+        mean, weight = points[0]
+        k_lo = self._k(0.0)
+        for x, w in points[1:]:
+            # merge while the centroid stays within one unit of the scale function
+            if self._k((done + weight + w) / total) - k_lo <= 1.0:
+                mean += (x - mean) * w / (weight + w)
+                weight += w
+            else:
+                means.append(mean)
+                weights.append(weight)
+                done += weight
+                k_lo = self._k(done / total)
+                mean, weight = x, w
+        means.append(mean)
+        weights.append(weight)
+        self.means, self.weights = means, weights
+
+    def cdf(self, x: float) -> float:
+        """Estimated fraction of values <= x."""
+        self._compress()
+        if not self.count or x < self.min:
+            return 0.0
+        if x >= self.max:
+            return 1.0
+        below = 0.0
+        prev_mean, prev_weight = self.min, 0.0
+        for mean, weight in zip(self.means, self.weights):
+            if x < mean:
+                # interpolate between the previous centroid's centre and this one's
+                span = mean - prev_mean
+                frac = (x - prev_mean) / span if span > 0 else 1.0
+                return (below - prev_weight / 2 + (prev_weight / 2 + weight / 2) * frac) / self.count
+            below += weight
+            prev_mean, prev_weight = mean, weight
+        span = self.max - prev_mean
+        frac = (x - prev_mean) / span if span > 0 else 1.0
+        return (below - prev_weight / 2 + prev_weight / 2 * frac) / self.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        self._compress()
+        if not self.count:
+            return None
+        target = q * self.count
+        below = 0.0
+        prev_mean, prev_center = self.min, 0.0
+        for mean, weight in zip(self.means, self.weights):
+            center = below + weight / 2
+            if target < center:
+                span = center - prev_center
+                frac = (target - prev_center) / span if span > 0 else 0.0
+                return prev_mean + (mean - prev_mean) * frac
+            below += weight
+            prev_mean, prev_center = mean, center
+        span = self.count - prev_center
+        frac = (target - prev_center) / span if span > 0 else 1.0
+        return prev_mean + (self.max - prev_mean) * frac
+
+    def to_dict(self) -> Dict[str, Any]:
+        self._compress()
+        return {
+            "compression": self.compression,
+            "means": self.means,
+            "weights": self.weights,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TDigest":
+        digest = cls(data.get("compression", COMPRESSION))
+        digest.means = list(data.get("means", []))
+        digest.weights = list(data.get("weights", []))
+        digest.count = float(sum(digest.weights))
+        if digest.count:
+            digest.min, digest.max = data["min"], data["max"]
+        return digest
+
+
+def quantile_of_difference(added: TDigest, removed: TDigest, q: float) -> Optional[float]:
+    """
+    q-quantile of the multiset added - removed (removed being a subset of added),
+    by bisection on the difference of the two estimated CDFs.
+    """
+    live = added.count - removed.count
+    if live <= 0:
+        return None
+    if not removed.count:
+        return added.quantile(q)
+    lo, hi = added.min, added.max
+    target = q * live
+    for _ in range(40):
+        mid = (lo + hi) / 2
+        if added.cdf(mid) * added.count - removed.cdf(mid) * removed.count < target:
+            lo = mid
+        else:
+            hi = mid
+    return hi
+
+
+class SpaceSaving:
+    """Space-Saving heavy hitters: at most `capacity` counters; exact while fewer items were seen."""
+
+    def __init__(self, capacity: int = TOP_CAPACITY) -> None:
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+
+    def add(self, item: str, n: int = 1) -> None:
+        if item in self.counts or len(self.counts) < self.capacity:
+            self.counts[item] = self.counts.get(item, 0) + n
+            return
+        # evict the smallest counter; the newcomer inherits its count as overestimate
+        victim = min(self.counts, key=self.counts.__getitem__)
+        floor = self.counts.pop(victim)
+        self.counts[item] = floor + n
+
+    def remove(self, item: str, n: int = 1) -> None:
+        """Undo an add (items no longer tracked are ignored)."""
+        if item in self.counts:
+            left = self.counts[item] - n
+            if left > 0:
+                self.counts[item] = left
+            else:
+                del self.counts[item]
+
+    def top(self, k: int) -> List[Tuple[str, int]]:
+        return sorted(self.counts.items(), key=lambda t: (-t[1], t[0]))[:k]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"capacity": self.capacity, "counts": self.counts}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpaceSaving":
+        sketch = cls(data.get("capacity", TOP_CAPACITY))
+        sketch.counts = dict(data.get("counts", {}))
+        return sketch
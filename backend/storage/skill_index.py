@@ -0,0 +1,205 @@
+# backend/storage/skill_index.py
+"""
+Skill bitmaps for boolean skill filters over candidates.
+
+Every skill seen in a found_skills field gets a code, and the index keeps one
+compressed RoaringBitmap per skill of the candidates that have it, plus one of
+every candidate id. Nothing is stored per candidate, so memory follows the
+number of (candidate, skill) pairs rather than candidates x taxonomy size.
+
+Like CandidateColumns, it is built on first use by replaying the store and
+kept current by a store listener: an update only touches the bitmaps of the
+skills that differ between the old and new record's found_skills.
+
+Filter expressions combine skills with AND / OR / NOT and parentheses;
+adjacent terms are ANDed and multi-word skills are quoted:
+
+    python AND docker AND NOT kubernetes
+    (django OR flask) "machine learning"
+"""
+import re
+import threading
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from backend.storage.bitmaps import RoaringBitmap
+from backend.storage.candidate_store import CandidateStore
+from backend.storage.fields import split_skills
+
+_TOKEN = re.compile(r'\s*(\(|\)|"[^"]*"|[^\s()"]+)\s*')
+
+# ("skill", name) | ("not", node) | ("and", left, right) | ("or", left, right)
+Node = Tuple[Union[str, "Node"], ...]
+
+
+def parse_skill_filter(expr: str) -> Node:
+    """Parse a skill filter expression. Raises ValueError on bad syntax."""
+    tokens = []
+    pos = 0
+    expr = expr.strip()
+    while pos < len(expr):
+        m = _TOKEN.match(expr, pos)
+        if m is None:
+            raise ValueError(f"unexpected character at {pos}: {expr[pos:pos + 10]!r}")
+        tokens.append(m.group(1))
+        pos = m.end()
+    if not tokens:
+        raise ValueError("empty skill filter")
+    i = 0
+
+    def peek() -> Optional[str]:
+        return tokens[i] if i < len(tokens) else None
+
+    def take() -> str:
+        nonlocal i
+        i += 1
+        return tokens[i - 1]
+
+    def take_if(tok: str) -> Optional[str]:
+        return take() if peek() == tok else None
+
+    def keyword(tok: Optional[str], word: str) -> bool:
+        return tok is not None and tok.upper() == word
+
+    def parse_or() -> Node:
+        node = parse_and()
+        while keyword(peek(), "OR"):
+            take()
+            node = ("or", node, parse_and())
+        return node
+
+    def parse_and() -> Node:
+        node = parse_not()
+        while peek() is not None and peek() != ")" and not keyword(peek(), "OR"):
+            if keyword(peek(), "AND"):
+                take()
+            node = ("and", node, parse_not())
+        return node
+
+    def parse_not() -> Node:
+        tok = peek()
+        if tok is None:
+            raise ValueError("skill filter ends unexpectedly")
+        if keyword(tok, "NOT"):
+            take()
+            return ("not", parse_not())
+        if tok == "(":
+            take()
+            node = parse_or()
+            if take_if(")") is None:
+                raise ValueError("missing ')' in skill filter")
+            return node
+        if tok == ")" or keyword(tok, "AND") or keyword(tok, "OR"):
+            raise ValueError(f"unexpected {tok!r} in skill filter")
+        take()
+        name = tok[1:-1] if tok.startswith('"') else tok
+        return ("skill", name.strip().lower())
+
+    node = parse_or()
+    if i != len(tokens):
+        raise ValueError(f"unexpected {tokens[i]!r} in skill filter")
+    return node
+
+
+class SkillIndex:
+    """Per-skill candidate bitmaps over a CandidateStore."""
+
+    def __init__(self, store: CandidateStore) -> None:
+        self.store = store
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._ids = RoaringBitmap()
+        self.skills: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._bitmaps: Dict[int, RoaringBitmap] = {}
+
+    # -------------------------
+    # Loading / maintenance
+    # -------------------------
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self.store.subscribe(self._apply, replay=True)
+                self._loaded = True
+
+    def _code(self, skill: str) -> int:
+        code = self._codes.get(skill)
+        if code is None:
+            code = self._codes[skill] = len(self.skills)
+            self.skills.append(skill)
+            self._bitmaps[code] = RoaringBitmap()
+        return code
+
+    def _codes_of(self, row: Optional[Dict[str, str]]) -> Set[int]:
+        return {self._code(x) for x in split_skills(row.get("found_skills", ""))} if row is not None else set()
+
+    def _apply(self, items: List[Tuple[int, Optional[Dict[str, str]], Dict[str, str]]]) -> None:
+        """Store listener: move changed candidates between skill bitmaps."""
+        if not items:
+            return
+        with self._lock:
+            added: Dict[int, List[int]] = {}
+            removed: Dict[int, List[int]] = {}
+            for cid, old, row in items:
+                before, after = self._codes_of(old), self._codes_of(row)
+                for code in after - before:
+                    added.setdefault(code, []).append(cid)
+                for code in before - after:
+                    removed.setdefault(code, []).append(cid)
+            for code, ids in removed.items():
+                self._bitmaps[code].discard_many(ids)
+            for code, ids in added.items():
+                self._bitmaps[code].add_many(ids)
+            self._ids.add_many([cid for cid, old, _ in items if old is None])
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def bitmap(self, skill: str) -> RoaringBitmap:
+        self._ensure_loaded()
+        with self._lock:
+            return self._skill(skill.strip().lower())
+
+    def universe(self) -> RoaringBitmap:
+        """Every candidate id."""
+        self._ensure_loaded()
+        with self._lock:
+            return RoaringBitmap(dict(self._ids._chunks))
+
+    def evaluate(self, expr: Union[str, Node]) -> RoaringBitmap:
+        """Candidates matching a filter expression (see parse_skill_filter)."""
+        node = parse_skill_filter(expr) if isinstance(expr, str) else expr
+        self._ensure_loaded()
+        with self._lock:
+            return self._eval(node)
+
+    def _skill(self, name: str) -> RoaringBitmap:
+        # a copy: the listener replaces chunks of the live bitmap in place
+        code = self._codes.get(name)
+        return RoaringBitmap(dict(self._bitmaps[code]._chunks)) if code is not None else RoaringBitmap()
+
+    def _eval(self, node: Node) -> RoaringBitmap:
+        op = node[0]
+        if op == "skill":
+            return self._skill(node[1])
+        if op == "not":
+            return self.universe() - self._eval(node[1])
+        left, right = node[1], node[2]
+        if op == "or":
+            return self._eval(left) | self._eval(right)
+        # "a AND NOT b" is a difference: no need to materialize NOT b
+        if right[0] == "not":
+            return self._eval(left) - self._eval(right[1])
+        if left[0] == "not":
+            return self._eval(right) - self._eval(left[1])
+        return self._eval(left) & self._eval(right)
+
+    def stats(self) -> Dict[str, int]:
+        self._ensure_loaded()
+        with self._lock:
+            return {
+                "candidates": len(self._ids),
+                "skills": len(self.skills),
+                "bitmap_bytes": sum(b.nbytes() for b in self._bitmaps.values()),
+            }
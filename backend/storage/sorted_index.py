@@ -0,0 +1,249 @@
+# backend/storage/sorted_index.py
+"""
+Sort orders over the candidate store for ranked listings.
+
+For every sortable field the index keeps all candidates as (value, id) keys in
+a blocked sorted list: a list of sorted blocks of at most 2 * LOAD keys plus
+the largest key of each block, so inserting, removing and seeking to a key
+are a bisect over the block maxima and one inside a small block. Ties on the
+value are broken by id, which makes every key unique and every order total.
+
+Pages are addressed by the last key returned (keyset pagination) instead of an
+offset: the next page starts right after that key, however deep it is. With a
+filter, the index is walked in order skipping non-matching ids; when the
+filter is so selective that walking would visit too many keys, the page is
+taken from the matching ids with a bounded heap instead.
+
+Like the other in-memory views, it is built on first use from the store and
+kept current by a store listener.
+"""
+import base64
+import heapq
+import json
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from backend.storage.candidate_store import CandidateStore
+from backend.storage.fields import to_int
+
+SORT_FIELDS = ("total_score", "base_score", "skill_score", "penalty", "name")
+TEXT_FIELDS = ("name",)
+LOAD = 1000
+
+Key = Tuple[Any, int]
+
+
+def _value(field: str, row: Dict[str, str]) -> Any:
+    raw = row.get(field, "")
+    return (raw or "").strip().lower() if field in TEXT_FIELDS else to_int(raw)
+
+
+class _SortedKeys:
+    """Blocked sorted list of unique keys."""
+
+    def __init__(self) -> None:
+        self.blocks: List[List[Key]] = []
+        self.maxes: List[Key] = []
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def build(self, keys: List[Key]) -> None:
+        """Replace the contents with already sorted keys."""
+        self.blocks = [keys[i : i + LOAD] for i in range(0, len(keys), LOAD)]
+        self.maxes = [b[-1] for b in self.blocks]
+        self.size = len(keys)
+
+    def add(self, key: Key) -> None:
+        if not self.blocks:
+            self.blocks, self.maxes = [[key]], [key]
+            self.size = 1
+            return
+        i = min(bisect_left(self.maxes, key), len(self.blocks) - 1)
+        block = self.blocks[i]
+        insort(block, key)
+        self.maxes[i] = block[-1]
+        if len(block) > 2 * LOAD:
+            self.blocks[i : i + 1] = [block[:LOAD], block[LOAD:]]
+            self.maxes[i : i + 1] = [block[LOAD - 1], block[-1]]
+        self.size += 1
+
+    def remove(self, key: Key) -> None:
+        i = bisect_left(self.maxes, key)
+        if i == len(self.blocks):
+            return
+        block = self.blocks[i]
+        j = bisect_left(block, key)
+        if j == len(block) or block[j] != key:
+            return
+        del block[j]
+        self.size -= 1
+        if block:
+            self.maxes[i] = block[-1]
+        else:
+            del self.blocks[i]
+            del self.maxes[i]
+
+    def walk(self, after: Optional[Key] = None, reverse: bool = False) -> Iterator[Key]:
+        """Keys strictly after `after` (before it when reverse), in order."""
+        if not self.blocks:
+            return
+        if not reverse:
+            i, j = 0, 0
+            if after is not None:
+                i = bisect_right(self.maxes, after)
+                if i == len(self.blocks):
+                    return
+                j = bisect_right(self.blocks[i], after)
+            for block in self.blocks[i:]:
+                yield from block[j:]
+                j = 0
+        else:
+            i = len(self.blocks) - 1
+            j = len(self.blocks[i])
+            if after is not None:
+                i = min(bisect_left(self.maxes, after), i)
+                j = bisect_left(self.blocks[i], after)
+            while i >= 0:
+                block = self.blocks[i]
+                for k in range(j - 1, -1, -1):
+                    yield block[k]
+                i -= 1
+                j = len(self.blocks[i]) if i >= 0 else 0
+
+
+def encode_cursor(field: str, descending: bool, key: Key) -> str:
+    """Opaque keyset cursor for the page after `key`."""
+    raw = json.dumps({"f": field, "d": descending, "k": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, bool, Key]:
+    """(field, descending, last key) of a cursor. Raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        field, descending, (value, cid) = data["f"], bool(data["d"]), data["k"]
+    except Exception:
+        raise ValueError("malformed cursor")
+    if field not in SORT_FIELDS or not isinstance(cid, int):
+        raise ValueError("malformed cursor")
+    if not isinstance(value, str if field in TEXT_FIELDS else int):
+        raise ValueError("malformed cursor")
+    return field, descending, (value, cid)
+
+
+class SortedIndex:
+    """Per-field sort orders of a CandidateStore with keyset pages."""
+
+    def __init__(self, store: CandidateStore, fields: Tuple[str, ...] = SORT_FIELDS) -> None:
+        self.store = store
+        self.fields = fields
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._values: Dict[str, List[Any]] = {f: [] for f in fields}
+        self._keys: Dict[str, _SortedKeys] = {f: _SortedKeys() for f in fields}
+
+    # -------------------------
+    # Loading / maintenance
+    # -------------------------
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self.store.locked():
+            with self._lock:
+                if self._loaded:
+                    return
+                ids: List[int] = []
+                loaded: Dict[str, List[Any]] = {f: [] for f in self.fields}
+                for cid, row in self.store.scan():
+                    ids.append(cid)
+                    for f in self.fields:
+                        loaded[f].append(_value(f, row))
+                # values by id - 1 (None for ids the store does not have), one sort per field
+                id_arr = np.asarray(ids, dtype=np.int64)
+                for f in self.fields:
+                    values = self._values[f] = [None] * (ids[-1] if ids else 0)
+                    for cid, v in zip(ids, loaded[f]):
+                        values[cid - 1] = v
+                    if f in TEXT_FIELDS:
+                        self._keys[f].build(sorted(zip(loaded[f], ids)))
+                    else:
+                        arr = np.asarray(loaded[f], dtype=np.int64)
+                        order = np.lexsort((id_arr, arr))
+                        self._keys[f].build(list(zip(arr[order].tolist(), id_arr[order].tolist())))
+                self.store.subscribe(self._apply)
+                self._loaded = True
+
+    def _apply(self, items: List[Tuple[int, Optional[Dict[str, str]], Dict[str, str]]]) -> None:
+        """Store listener: move changed candidates to their new place in each order."""
+        with self._lock:
+            for cid, _, row in items:
+                for f in self.fields:
+                    values = self._values[f]
+                    new = _value(f, row)
+                    if cid <= len(values):
+                        old = values[cid - 1]
+                        if old == new:
+                            continue
+                        self._keys[f].remove((old, cid))
+                        values[cid - 1] = new
+                    else:
+                        values.extend([None] * (cid - len(values) - 1))
+                        values.append(new)
+                    self._keys[f].add((new, cid))
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def page(
+        self,
+        field: str,
+        descending: bool = True,
+        ids: Optional[np.ndarray] = None,
+        after: Optional[Key] = None,
+        limit: int = 50,
+    ) -> Tuple[List[Key], bool]:
+        """
+        Up to `limit` keys after `after` in the field's order, restricted to `ids`
+        (None = every candidate). Returns (keys, whether more follow).
+        """
+        if field not in self.fields:
+            raise ValueError(f"not a sortable field: {field}")
+        self._ensure_loaded()
+        with self._lock:
+            keys = self._keys[field]
+            n = len(keys)
+            if ids is not None and len(ids) * len(ids) < (limit + 1) * n:
+                # walking would skip ~n/len(ids) keys per hit: heap over the matches instead
+                return self._heap_page(field, descending, ids, after, limit)
+            member = None
+            if ids is not None:
+                member = np.zeros(len(self._values[field]) + 1, dtype=bool)
+                member[ids[ids <= len(self._values[field])]] = True
+            out: List[Key] = []
+            for key in keys.walk(after, reverse=descending):
+                if member is None or member[key[1]]:
+                    if len(out) == limit:
+                        return out, True
+                    out.append(key)
+            return out, False
+
+    def _heap_page(
+        self, field: str, descending: bool, ids: np.ndarray, after: Optional[Key], limit: int
+    ) -> Tuple[List[Key], bool]:
+        values = self._values[field]
+        cands = ((values[cid - 1], cid) for cid in ids.tolist() if 1 <= cid <= len(values))
+        if after is not None:
+            cands = (k for k in cands if (k < after if descending else k > after))
+        pick = heapq.nlargest if descending else heapq.nsmallest
+        best = pick(limit + 1, cands)
+        return best[:limit], len(best) > limit
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._keys[self.fields[0]])
@@ -0,0 +1,419 @@
+# backend/storage/sqlite_store.py
+"""
+CandidateStore on the SQLite `candidates` table (backend/db.py).
+
+Same API and record shape as the JSONL CandidateStore (flat string fields,
+1-based ids, listeners, positions), so main.py and every in-memory view run
+unchanged on either backend. Records map onto the table as:
+ - saved_filename -> file
+ - total/base/skill score, penalty, found/missing skills -> the `score` JSON
+ - everything else -> the column of the same name
+
+The engine runs in WAL mode with a shared connection pool (see db.py). Appends
+and updates are one transaction each, written with executemany; job_id,
+status and the generated total_score column are indexed.
+
+Every update also writes the before/after values of the fields it changed to
+the `candidate_changes` log, in the same transaction, so changes_since can
+replay the updates made after a position with their old rows, like the JSONL
+update log. The log keeps the last CHANGE_LOG_KEEP entries; positions older
+than that get None (the caller rebuilds).
+
+Ids are normally 1..len(store). A table written by other tools may have gaps:
+those ids are remembered on open and skipped by exists(), ids() and scan(),
+and new records are numbered after the highest id.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+
+from backend.db import DB_PATH, candidate_changes, candidates, get_engine, init_db, store_meta
+from backend.storage.candidate_store import CANDIDATE_FIELDS, SNAPSHOT_EVERY, _to_str, index_key, normalize_row
+
+# Record fields kept inside the `score` JSON column
+SCORE_KEYS = ("total_score", "base_score", "skill_score", "penalty", "found_skills", "missing_skills")
+# Record field -> column, for the fields stored in their own column
+COLUMNS = {
+    "job_id": "job_id",
+    "name": "name",
+    "email": "email",
+    "phone": "phone",
+    "questions": "questions",
+    "status": "status",
+    "notes": "notes",
+    "saved_filename": "file",
+    "sha256": "sha256",
+    "profile_version": "profile_version",
+    "duplicates": "duplicates",
+}
+SELECT_BATCH = 500
+SCAN_CHUNK = 4096
+GENERATION = -1  # positions from this backend never match a JSONL store generation
+CHANGE_LOG_KEEP = 100_000  # update log entries kept after a checkpoint
+
+_Item = Tuple[int, Optional[Dict[str, str]], Dict[str, str]]
+
+
+def _params(row: Dict[str, str]) -> Dict[str, Any]:
+    params: Dict[str, Any] = {col: row.get(f, "") for f, col in COLUMNS.items()}
+    params["duplicates"] = int(row["duplicates"]) if row.get("duplicates", "").isdigit() else None
+    params["score"] = {k: row.get(k, "") for k in SCORE_KEYS}
+    return params
+
+
+def _record(db_row: Any) -> Dict[str, str]:
+    m = db_row._mapping
+    row = {f: _to_str(m[col]) for f, col in COLUMNS.items()}
+    score = m["score"] or {}
+    for k in SCORE_KEYS:
+        row[k] = _to_str(score.get(k, ""))
+    for f in CANDIDATE_FIELDS:
+        row.setdefault(f, "")
+    return row
+
+
+class SQLiteCandidateStore:
+    """Candidate records in SQLite, with the CandidateStore interface."""
+
+    def __init__(self, engine: Optional[Engine] = None) -> None:
+        self.engine = engine or get_engine()
+        init_db()
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._unsaved = 0
+        self._dirty = False
+        self._listeners: List[Callable[[List[_Item]], None]] = []
+        self._checkpoint_hooks: List[Callable[[], None]] = []
+        self._version = 0
+        self._modified = max(
+            (os.path.getmtime(p) for p in (DB_PATH, Path(f"{DB_PATH}-wal")) if p.exists()), default=time.time()
+        )
+        with self.engine.connect() as conn:
+            self._count = conn.execute(select(func.count()).select_from(candidates)).scalar_one()
+            self._last_id = conn.execute(select(func.coalesce(func.max(candidates.c.id), 0))).scalar_one()
+            self._gaps: Set[int] = set()
+            if self._count != self._last_id:
+                present = set(conn.execute(select(candidates.c.id)).scalars())
+                self._gaps = set(range(1, self._last_id + 1)) - present
+                print(f"[WARN] candidates table has {len(self._gaps)} missing ids below {self._last_id}")
+            self._floor = conn.execute(select(store_meta.c.value).where(store_meta.c.key == "change_floor")).scalar() or 0
+            last_seq = conn.execute(select(func.max(candidate_changes.c.seq))).scalar() or 0
+            self._seq = max(last_seq, self._floor)
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+    def _select(self, conn, ids: List[int]) -> Dict[int, Dict[str, str]]:
+        out = {}
+        for start in range(0, len(ids), SELECT_BATCH):
+            chunk = ids[start: start + SELECT_BATCH]
+            for r in conn.execute(select(candidates).where(candidates.c.id.in_(chunk))):
+                out[r.id] = _record(r)
+        return out
+
+    def _set_meta(self, conn, key: str, value: int) -> None:
+        stmt = sqlite_insert(store_meta).values(key=key, value=value)
+        conn.execute(stmt.on_conflict_do_update(index_elements=["key"], set_={"value": value}))
+
+    def _bump(self) -> None:
+        self._version += 1
+        self._modified = time.time()
+
+    def _touch(self, n: int = 1) -> None:
+        self._dirty = True
+        self._unsaved += n
+        if self._unsaved >= SNAPSHOT_EVERY:
+            self.checkpoint()
+
+    def _notify(self, items: List[_Item]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(items)
+            except Exception as e:
+                print(f"[WARN] candidate store listener failed: {e}")
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def version(self) -> int:
+        """Number of writes (appends or updates) since the store was opened; grows on every write."""
+        return self._version
+
+    @property
+    def last_modified(self) -> float:
+        """Unix time of the last write (database file modification time until the first write)."""
+        return self._modified
+
+    def append(self, row: Dict[str, Any]) -> int:
+        """Append one candidate and return its id."""
+        return self.append_many([row])[0]
+
+    def append_many(self, rows: Iterable[Dict[str, Any]]) -> List[int]:
+        """Insert candidates in one transaction (executemany) and return their ids."""
+        rows = [normalize_row(r) for r in rows]
+        if not rows:
+            return []
+        with self._lock:
+            first = self._last_id + 1
+            ids = list(range(first, first + len(rows)))
+            with self.engine.begin() as conn:
+                conn.execute(insert(candidates), [dict(_params(r), id=cid) for cid, r in zip(ids, rows)])
+            self._count += len(rows)
+            self._last_id = ids[-1]
+            self._bump()
+            self._touch(len(rows))
+            self._notify([(cid, None, row) for cid, row in zip(ids, rows)])
+        return ids
+
+    def update(self, candidate_id: int, fields: Dict[str, Any]) -> Dict[str, str]:
+        """Update fields of one record and return the updated row. Raises KeyError if missing."""
+        row = self.update_many({candidate_id: fields})[candidate_id]
+        if row is None:
+            raise KeyError(candidate_id)
+        return row
+
+    def update_many(self, changes: Dict[int, Dict[str, Any]]) -> Dict[int, Optional[Dict[str, str]]]:
+        """
+        Update many records in one transaction (whole rows rewritten with executemany).
+        Returns id -> updated row, or None for ids that do not exist.
+        """
+        results: Dict[int, Optional[Dict[str, str]]] = dict.fromkeys(changes)
+        with self._lock:
+            wanted = [cid for cid in changes if self.exists(cid)]
+            if not wanted:
+                return results
+            changed: List[_Item] = []
+            with self.engine.begin() as conn:
+                old_rows = self._select(conn, wanted)
+                params = []
+                log = []
+                for cid in wanted:
+                    old = old_rows.get(cid)
+                    if old is None:
+                        continue
+                    fields = {k: _to_str(v) for k, v in changes[cid].items()}
+                    row = dict(old, **fields)
+                    params.append(dict(_params(row), _cid=cid))
+                    log.append({"candidate_id": cid, "before": {k: old.get(k, "") for k in fields}, "after": fields})
+                    results[cid] = row
+                    changed.append((cid, old, row))
+                if params:
+                    values = {col: bindparam(col) for col in list(COLUMNS.values()) + ["score"]}
+                    conn.execute(update(candidates).where(candidates.c.id == bindparam("_cid")).values(values), params)
+                    conn.execute(insert(candidate_changes), log)
+                    self._seq = conn.execute(select(func.max(candidate_changes.c.seq))).scalar_one()
+            if changed:
+                self._bump()
+            self._touch(len(changed))
+            self._notify(changed)
+        return results
+
+    def subscribe(self, listener: Callable[[List[_Item]], None], replay: bool = False) -> None:
+        """See CandidateStore.subscribe."""
+        with self._lock:
+            if replay:
+                ids = self.ids()
+                for start in range(0, len(ids), SCAN_CHUNK):
+                    listener([(cid, None, row) for cid, row in self.scan(ids[start: start + SCAN_CHUNK])])
+            self._listeners.append(listener)
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold the store lock: no writes happen (and no listener runs) inside the block."""
+        with self._lock:
+            yield
+
+    def position(self) -> Dict[str, int]:
+        """Where the store is: highest id and last update log entry."""
+        with self._lock:
+            return {"generation": GENERATION, "last_id": self._last_id, "log_seq": self._seq}
+
+    def changes_since(self, position: Dict[str, int]) -> Optional[List[_Item]]:
+        """
+        The writes made after position() returned `position`, as listener items
+        (records appended since come once, with their current values). None if
+        the update log no longer reaches back that far or the position is from
+        another store.
+        """
+        with self._lock:
+            last_id, seq = position.get("last_id"), position.get("log_seq")
+            if position.get("generation") != GENERATION or last_id is None or seq is None:
+                return None
+            if last_id > self._last_id or not self._floor <= seq <= self._seq:
+                return None
+            with self.engine.connect() as conn:
+                log = conn.execute(
+                    select(candidate_changes).where(candidate_changes.c.seq > seq).order_by(candidate_changes.c.seq)
+                ).all()
+            log = [e for e in log if e.candidate_id <= last_id]
+            # walk the current rows back to `position`, then forward through each update
+            state = dict(self.scan(sorted({e.candidate_id for e in log})))
+            for e in reversed(log):
+                state[e.candidate_id] = dict(state[e.candidate_id], **e.before)
+            items: List[_Item] = []
+            for e in log:
+                old = state[e.candidate_id]
+                state[e.candidate_id] = dict(old, **e.after)
+                items.append((e.candidate_id, old, state[e.candidate_id]))
+            items.extend((cid, None, row) for cid, row in self.scan(range(last_id + 1, self._last_id + 1)))
+            return items
+
+    def on_checkpoint(self, hook: Callable[[], None]) -> None:
+        """Call hook() under the store lock after every checkpoint."""
+        with self._lock:
+            self._checkpoint_hooks.append(hook)
+
+    def exists(self, candidate_id: int) -> bool:
+        return 1 <= candidate_id <= self._last_id and candidate_id not in self._gaps
+
+    def get(self, candidate_id: int) -> Optional[Dict[str, str]]:
+        """Return the record for candidate_id, or None if it does not exist."""
+        if not self.exists(candidate_id):
+            return None
+        with self.engine.connect() as conn:
+            return self._select(conn, [candidate_id]).get(candidate_id)
+
+    def get_many(self, ids: Iterable[int]) -> List[Dict[str, str]]:
+        """Return records for existing ids (in the given order), each annotated with ``_id``."""
+        ids = [cid for cid in ids if self.exists(cid)]
+        if not ids:
+            return []
+        with self.engine.connect() as conn:
+            found = self._select(conn, ids)
+        out = []
+        for cid in ids:
+            row = found.get(cid)
+            if row is not None:
+                row = dict(row, _id=cid)
+                out.append(row)
+        return out
+
+    def _where(self, job_id: Optional[str], status: Optional[str]) -> List[Any]:
+        conds = []
+        if job_id:
+            conds.append(candidates.c.job_id == job_id)
+        if status:
+            conds.append(candidates.c.status.collate("NOCASE") == status)
+        return conds
+
+    def ids(self, job_id: Optional[str] = None, status: Optional[str] = None) -> List[int]:
+        """Ascending ids matching the filters, served from the job_id/status indexes."""
+        if not job_id and not status:
+            if self._gaps:
+                return [cid for cid in range(1, self._last_id + 1) if cid not in self._gaps]
+            return list(range(1, self._last_id + 1))
+        with self.engine.connect() as conn:
+            stmt = select(candidates.c.id).where(*self._where(job_id, status)).order_by(candidates.c.id)
+            return list(conn.execute(stmt).scalars())
+
+    def query(
+        self,
+        job_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Tuple[int, List[Dict[str, str]]]:
+        """Return (total matches, one page of records)."""
+        if not job_id and not status:
+            if self._gaps:
+                return self._count, self.get_many(self.ids()[offset: offset + limit])
+            return self._count, self.get_many(range(offset + 1, min(self._count, offset + limit) + 1))
+        conds = self._where(job_id, status)
+        with self.engine.connect() as conn:
+            total = conn.execute(select(func.count()).select_from(candidates).where(*conds)).scalar_one()
+            page = list(conn.execute(
+                select(candidates.c.id).where(*conds).order_by(candidates.c.id).limit(limit).offset(offset)
+            ).scalars())
+        return total, self.get_many(page)
+
+    def values(self, field: str) -> Dict[str, int]:
+        """Counts per value of job_id or status (status lowercased, as in CandidateStore)."""
+        col = candidates.c[COLUMNS[field]]
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(col, func.count()).group_by(col)).all()
+        out: Dict[str, int] = {}
+        for value, n in rows:
+            key = index_key(field, value)
+            out[key] = out.get(key, 0) + n
+        return out
+
+    def scan(self, ids: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """Yield (id, record) pairs in id order, or for the given ids."""
+        if ids is None:
+            ids = self.ids()
+        batch: List[int] = []
+        for cid in ids:
+            batch.append(cid)
+            if len(batch) >= SCAN_CHUNK:
+                for row in self.get_many(batch):
+                    yield row.pop("_id"), row
+                batch = []
+        for row in self.get_many(batch):
+            yield row.pop("_id"), row
+
+    def checkpoint(self) -> None:
+        """
+        Run the checkpoint hooks (which save snapshots at the current position), then
+        trim the update log to CHANGE_LOG_KEEP entries and fold the WAL into the database file.
+        """
+        with self._lock:
+            self._unsaved = 0
+            for hook in self._checkpoint_hooks:
+                try:
+                    hook()
+                except Exception as e:
+                    print(f"[WARN] candidate store checkpoint hook failed: {e}")
+            if self._seq - self._floor > CHANGE_LOG_KEEP:
+                floor = self._seq - CHANGE_LOG_KEEP
+                with self.engine.begin() as conn:
+                    conn.execute(delete(candidate_changes).where(candidate_changes.c.seq <= floor))
+                    self._set_meta(conn, "change_floor", floor)
+                self._floor = floor
+            with self.engine.connect() as conn:
+                conn.exec_driver_sql("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self) -> None:
+        self._stop.set()
+        self.checkpoint()
+
+    # -------------------------
+    # Maintenance
+    # -------------------------
+    @property
+    def pending_updates(self) -> int:
+        """Updates are applied in place; nothing waits for compaction."""
+        return 0
+
+    def compact(self) -> int:
+        """Refresh query planner statistics (SQLite has no update log to fold). Returns 0."""
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA optimize")
+        return 0
+
+    def start_compactor(self, interval: float = 5.0, min_updates: int = 0) -> threading.Thread:
+        """Checkpoint the WAL and refresh statistics on a daemon thread after writes."""
+
+        def loop() -> None:
+            while not self._stop.wait(interval):
+                if self._dirty:
+                    self._dirty = False
+                    try:
+                        self.checkpoint()
+                        self.compact()
+                    except Exception as e:
+                        print(f"[WARN] candidate store maintenance failed: {e}")
+
+        t = threading.Thread(target=loop, name="candidate-store-maintenance", daemon=True)
+        t.start()
+        return t
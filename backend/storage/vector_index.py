@@ -0,0 +1,237 @@
+# backend/storage/vector_index.py
+"""
+Hashed resume feature vectors with a random-projection LSH index for
+"more like this candidate" lookups.
+
+featurize() turns resume text + found skills into a fixed-size, L2-normalized
+vector: every token (and, weighted higher, every found skill) is hashed into
+one of `dim` buckets with a hash-derived sign (the hashing trick), using
+log-scaled term counts.
+
+The index directory holds:
+ - meta.json    dim, LSH tables/bits and the seed of the projection planes
+ - vectors.f32  float32 rows, append-only
+ - ids.u32      uint32 candidate id of each row, append-only
+The LSH buckets are rebuilt from the vectors on open (one matrix product).
+
+A query probes its own bucket in every table plus the buckets one flipped
+low-margin bit away, then ranks only those candidates by exact cosine, so the
+cost depends on bucket sizes, not on the number of indexed candidates. Pools
+below EXACT_BELOW vectors are simply ranked exactly.
+"""
+import json
+import os
+import threading
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from backend.storage.search_index import tokenize
+
+DIM = 256
+TABLES = 32
+BITS = 10
+PROBES = 4  # extra buckets per table, each one low-margin bit flipped
+SKILL_WEIGHT = 3.0
+EXACT_BELOW = 2048  # small pools are ranked exactly: a full pass is cheaper than probing
+
+
+def _hash(token: str) -> int:
+    # crc32 is stable across processes (unlike hash()), so vectors can be persisted
+    return zlib.crc32(token.encode("utf-8"))
+
+
+def featurize(text: str, skills: Iterable[str] = (), dim: int = DIM) -> np.ndarray:
+    """Fixed-size signed hashed vector of log term counts plus weighted skills, L2-normalized."""
+    counts: Dict[str, float] = {}
+    for tok in tokenize(text or ""):
+        counts[tok] = counts.get(tok, 0.0) + 1.0
+    feats = {t: np.log1p(c) for t, c in counts.items()}
+    for s in skills:
+        feats[f"skill:{s.lower()}"] = SKILL_WEIGHT
+    vec = np.zeros(dim, dtype=np.float32)
+    if not feats:
+        return vec
+    h = np.fromiter((_hash(t) for t in feats), dtype=np.uint64, count=len(feats))
+    sign = np.where(h & (1 << 31), -1.0, 1.0).astype(np.float32)
+    np.add.at(vec, (h % dim).astype(np.int64), sign * np.fromiter(feats.values(), dtype=np.float32))
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+class VectorIndex:
+    """Candidate vectors (one per id) with multi-probe random-projection LSH."""
+
+    def __init__(
+        self, root: Path, dim: int = DIM, tables: int = TABLES, bits: int = BITS, seed: int = 7, fsync: bool = True
+    ) -> None:
+        self.root = Path(root)
+        self.fsync = fsync
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.meta_path = self.root / "meta.json"
+        self.vectors_path = self.root / "vectors.f32"
+        self.ids_path = self.root / "ids.u32"
+        if self.meta_path.exists():
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+        else:
+            meta = {"dim": dim, "tables": tables, "bits": bits, "seed": seed}
+            self.meta_path.write_text(json.dumps(meta), encoding="utf-8")
+        self.dim, self.tables, self.bits = meta["dim"], meta["tables"], meta["bits"]
+        self.planes = np.random.default_rng(meta["seed"]).standard_normal((self.dim, self.tables * self.bits)).astype(
+            np.float32
+        )
+        self._pow = (1 << np.arange(self.bits, dtype=np.int64))
+        self._lock = threading.RLock()
+        self._open()
+
+    # -------------------------
+    # Open / recovery
+    # -------------------------
+    def _open(self) -> None:
+        row_bytes = self.dim * 4
+        vec_raw = self.vectors_path.read_bytes() if self.vectors_path.exists() else b""
+        id_raw = self.ids_path.read_bytes() if self.ids_path.exists() else b""
+        # a crash between the two appends leaves one file longer: keep complete pairs only
+        n = min(len(vec_raw) // row_bytes, len(id_raw) // 4)
+        if len(vec_raw) != n * row_bytes:
+            with self.vectors_path.open("r+b") as f:
+                f.truncate(n * row_bytes)
+        if len(id_raw) != n * 4:
+            with self.ids_path.open("r+b") as f:
+                f.truncate(n * 4)
+        vecs = np.frombuffer(vec_raw[: n * row_bytes], dtype=np.float32).reshape(n, self.dim)
+        self._vecs = np.zeros((max(1024, n * 2), self.dim), dtype=np.float32)
+        self._vecs[:n] = vecs
+        self._n = n
+        self._ids = np.zeros(len(self._vecs), dtype=np.int64)
+        self._ids[:n] = np.frombuffer(id_raw[: n * 4], dtype=np.uint32)
+        self._row: Dict[int, int] = {cid: r for r, cid in enumerate(self._ids[:n].tolist())}
+        # per table: bucket code -> rows (uint32 array, cheap to append and to view from NumPy)
+        self._buckets: List[Dict[int, array]] = [{} for _ in range(self.tables)]
+        if n:
+            codes, _ = self._codes(vecs)
+            for t in range(self.tables):
+                order = np.argsort(codes[:, t], kind="stable")
+                keys, starts = np.unique(codes[order, t], return_index=True)
+                for key, rows in zip(keys.tolist(), np.split(order, starts[1:])):
+                    self._buckets[t][key] = array("I", rows.astype(np.uint32).tobytes())
+        self._vec_file = open(self.vectors_path, "ab", buffering=0)
+        self._id_file = open(self.ids_path, "ab", buffering=0)
+
+    def _codes(self, vecs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(bucket code per table, projections) for each row of vecs."""
+        proj = (vecs @ self.planes).reshape(len(vecs), self.tables, self.bits)
+        return (proj > 0).astype(np.int64) @ self._pow, proj
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def __len__(self) -> int:
+        return self._n
+
+    def __contains__(self, candidate_id: int) -> bool:
+        return candidate_id in self._row
+
+    def add_many(self, items: Iterable[Tuple[int, str, Iterable[str]]]) -> int:
+        """Featurize and index (id, text, found_skills) triples; ids already indexed are skipped."""
+        with self._lock:
+            new_ids = []
+            vecs = []
+            seen = set()
+            for cid, text, skills in items:
+                if cid in self._row or cid in seen:
+                    continue
+                seen.add(cid)
+                new_ids.append(cid)
+                vecs.append(featurize(text, skills, self.dim))
+            if not new_ids:
+                return 0
+            block = np.vstack(vecs).astype(np.float32)
+            self._vec_file.write(block.tobytes())
+            self._id_file.write(np.asarray(new_ids, dtype=np.uint32).tobytes())
+            if self.fsync:
+                os.fsync(self._vec_file.fileno())
+                os.fsync(self._id_file.fileno())
+
+            start = self._n
+            if start + len(new_ids) > len(self._vecs):
+                capacity = max(len(self._vecs) * 2, start + len(new_ids))
+                grown = np.zeros((capacity, self.dim), dtype=np.float32)
+                grown[:start] = self._vecs[:start]
+                self._vecs = grown
+                grown_ids = np.zeros(capacity, dtype=np.int64)
+                grown_ids[:start] = self._ids[:start]
+                self._ids = grown_ids
+            self._vecs[start: start + len(new_ids)] = block
+            self._ids[start: start + len(new_ids)] = new_ids
+            self._n = start + len(new_ids)
+            codes, _ = self._codes(block)
+            for i, cid in enumerate(new_ids):
+                row = start + i
+                self._row[cid] = row
+                for t in range(self.tables):
+                    bucket = self._buckets[t].get(int(codes[i, t]))
+                    if bucket is None:
+                        bucket = self._buckets[t][int(codes[i, t])] = array("I")
+                    bucket.append(row)
+        return len(new_ids)
+
+    def vector(self, candidate_id: int) -> Optional[np.ndarray]:
+        row = self._row.get(candidate_id)
+        return None if row is None else self._vecs[row].copy()
+
+    def similar(self, candidate_id: int, k: int = 10, probes: int = PROBES) -> Optional[List[Tuple[int, float]]]:
+        """Top-k (id, cosine) neighbours of an indexed candidate, or None if it is not indexed."""
+        vec = self.vector(candidate_id)
+        if vec is None:
+            return None
+        return self.query(vec, k, probes, exclude=candidate_id)
+
+    def query(
+        self, vec: np.ndarray, k: int = 10, probes: int = PROBES, exclude: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """Approximate top-k (id, cosine) for a normalized vector."""
+        codes, proj = self._codes(vec.reshape(1, -1).astype(np.float32))
+        # multi-probe: also visit buckets across the hyperplanes the query is closest to
+        flips = np.argsort(np.abs(proj[0]), axis=1)[:, :probes]
+        with self._lock:
+            if self._n <= EXACT_BELOW:
+                return self._rank(np.arange(self._n), vec, k, exclude)
+            parts = []
+            for t in range(self.tables):
+                code = int(codes[0, t])
+                for c in [code] + [code ^ (1 << int(b)) for b in flips[t]]:
+                    bucket = self._buckets[t].get(c)
+                    if bucket:
+                        parts.append(np.frombuffer(bucket, dtype=np.uint32).astype(np.int64))
+            if not parts:
+                return []
+            # dedupe rows with a bitmap over all rows (cheaper than sorting the probe hits)
+            seen = np.zeros(self._n, dtype=bool)
+            seen[np.concatenate(parts)] = True
+            return self._rank(np.flatnonzero(seen), vec, k, exclude)
+
+    def _rank(self, rows: np.ndarray, vec: np.ndarray, k: int, exclude: Optional[int]) -> List[Tuple[int, float]]:
+        """Exact cosine top-k among the given rows (caller holds the lock)."""
+        if exclude is not None and exclude in self._row:
+            rows = rows[rows != self._row[exclude]]
+        if not len(rows):
+            return []
+        sims = self._vecs[rows] @ vec
+        top = np.argpartition(-sims, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+        top = top[np.argsort(-sims[top], kind="stable")]
+        ids = self._ids[rows[top]].tolist()
+        return [(cid, round(float(sims[i]), 4)) for cid, i in zip(ids, top.tolist())]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            sizes = [len(b) for b in self._buckets]
+            return {"vectors": self._n, "dim": self.dim, "tables": self.tables, "bits": self.bits, "buckets": sum(sizes)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._vec_file.close()
+            self._id_file.close()
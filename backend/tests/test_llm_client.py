@@ -0,0 +1,152 @@
+# backend/tests/test_llm_client.py
+"""
+LLM scoring against a local stub of the chat completions API (no network, no key).
+
+The stub answers every resume with a fixed score, except resumes containing
+SLOW (answered after the client timeout) or FAIL (HTTP 503), which must fall
+back to ScoringAgent._rule_score.
+"""
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Tuple
+
+from backend.agents import scoring_agent
+from backend.agents.scoring_agent import ScoringAgent
+from backend.config.skills_config import MUST_HAVE_SKILLS, SKILL_WEIGHTS, load_skill_taxonomy
+from backend.recruitgenie_app import ai_score_results
+from backend.services import llm_client
+from backend.services.job_registry import JobProfile
+from backend.services.llm_client import LLMScoringClient
+
+STUB_SCORE = {
+    "base_score": 5,
+    "skill_score": 90,
+    "penalty": 0,
+    "total_score": 95,
+    "missing_skills": [],
+    "found_skills": ["stub"],
+}
+CONCURRENCY = 4
+TIMEOUT = 0.5
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.requests = 0
+
+
+def _handler(stats: _Stats):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args) -> None:
+            pass
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            prompt = body["messages"][-1]["content"]
+            with stats.lock:
+                stats.requests += 1
+                stats.in_flight += 1
+                stats.peak = max(stats.peak, stats.in_flight)
+            try:
+                time.sleep(0.05)
+                if "SLOW" in prompt:
+                    time.sleep(TIMEOUT * 3)
+                if "FAIL" in prompt:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                n = len(re.findall(r"^Resume \d+:", prompt, re.M))
+                content = json.dumps([dict(STUB_SCORE, index=i) for i in range(n)])
+                out = json.dumps({"choices": [{"message": {"content": content}}]}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+            finally:
+                with stats.lock:
+                    stats.in_flight -= 1
+
+    return Handler
+
+
+@contextmanager
+def stub_client(batch_size: int = 1) -> Iterator[Tuple[LLMScoringClient, _Stats]]:
+    stats = _Stats()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(stats))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = LLMScoringClient(
+        api_key="test",
+        base_url=f"http://127.0.0.1:{server.server_address[1]}/v1",
+        concurrency=CONCURRENCY,
+        timeout=TIMEOUT,
+        retries=1,
+        batch_size=batch_size,
+        backoff=0.01,
+        use_cache=False,
+    )
+    try:
+        yield client, stats
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_many_concurrent_scorings_respect_the_limit() -> None:
+    texts = [f"resume {i} python docker" for i in range(40)]
+    with stub_client() as (client, stats):
+        scores = client.score_many("backend engineer", texts)
+    assert scores == [STUB_SCORE] * len(texts)
+    assert stats.requests == len(texts)
+    assert 1 < stats.peak <= CONCURRENCY
+
+
+def test_timeouts_and_server_errors_fall_back_to_rule_scoring(monkeypatch) -> None:
+    texts = ["python django sql", "python SLOW docker", "FAIL kubernetes", "fastapi rest"]
+    with stub_client() as (client, stats):
+        monkeypatch.setattr(scoring_agent, "USE_AI", True)
+        monkeypatch.setattr(llm_client, "_client", client)
+        agent = ScoringAgent("backend engineer")
+        results = [agent.run(t) for t in texts[:1]] + agent._ai_score_many(texts[1:])
+    assert results[0] == STUB_SCORE
+    assert results[1] == agent._rule_score(texts[1])
+    assert results[2] == agent._rule_score(texts[2])
+    assert results[3] == STUB_SCORE
+    # each failing resume was tried retries + 1 times
+    assert stats.requests == 2 + 2 * 2
+
+
+def test_scoring_agent_batches_texts_through_the_shared_client(monkeypatch) -> None:
+    texts = [f"resume {i} python docker" for i in range(20)]
+    with stub_client(batch_size=5) as (client, stats):
+        monkeypatch.setattr(scoring_agent, "USE_AI", True)
+        monkeypatch.setattr(llm_client, "_client", client)
+        scores = ScoringAgent("backend engineer").run_many(texts)
+    assert scores == [STUB_SCORE] * len(texts)
+    # one prompt per batch_size resumes, at most CONCURRENCY in flight
+    assert stats.requests == len(texts) // 5
+    assert stats.peak <= CONCURRENCY
+
+
+def test_ai_score_results_rescores_rule_scored_uploads(monkeypatch) -> None:
+    profile = JobProfile("JOB-T", "Tester", "backend engineer", SKILL_WEIGHTS, MUST_HAVE_SKILLS, load_skill_taxonomy())
+    rule = profile.scoring_agent()
+    texts = ["python django sql", "FAIL kubernetes", "fastapi rest"]
+    results = [{"job_id": "JOB-T", "status": "", "text": t, "score": rule.run(t, use_ai=False)} for t in texts]
+    results.append({"job_id": "JOB-T", "status": "error", "score": {"total_score": 0}})
+    with stub_client() as (client, stats):
+        monkeypatch.setattr(scoring_agent, "USE_AI", True)
+        monkeypatch.setattr(llm_client, "_client", client)
+        scored = ai_score_results(results, profile)
+    assert [r["score"] for r in scored] == [STUB_SCORE, rule.run(texts[1], use_ai=False), STUB_SCORE, {"total_score": 0}]
+    assert scored[0]["questions"] and "questions" not in scored[3]
+    assert stats.requests == 2 + 2
@@ -17,8 +17,15 @@ export default function UploadPage() {
     const url = `${API_ORIGIN}/upload_resume/?job_id=${encodeURIComponent(jobId)}`;
     try {
       const res = await fetch(url, { method: "POST", body: fd });
-      const json = await res.json();
+      let json = await res.json();
       setResult(json);
+      // processing runs in the background: poll the task until it finishes
+      const statusUrl = json.status_url;
+      while (statusUrl && !["done", "error"].includes(json.status)) {
+        await new Promise((r) => setTimeout(r, 1000));
+        json = await (await fetch(`${API_ORIGIN}${statusUrl}`)).json();
+        setResult(json);
+      }
     } catch (err) {
       console.error(err);
       alert("Upload failed");
@@ -19,7 +19,12 @@ CREATE TABLE IF NOT EXISTS jobs (
     salary_min INTEGER,
     salary_max INTEGER,
     status VARCHAR(20) DEFAULT 'active',
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    job_id VARCHAR(64) UNIQUE,
+    skill_weights JSONB,
+    must_have_skills TEXT[],
+    version INTEGER DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Candidates Table